@@ -1,44 +1,109 @@
-from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
-from config import Config
-from flask_cors import CORS 
+import click
 import logging
+import os
+from flask import Flask, jsonify
+from config import Config
+from extensions import db, jwt
+from service.security import hashing_executor, HashingUnavailableError, calibrate_hash_method
+from service.user_cache import user_cache
+from service.revocation import token_blocklist, issued_at_claims
+from service.metrics import metrics
+from service.database import init_engines
+
+
+def create_app(config_object=Config):
+    """
+    Cria e configura a aplicação. Nada é montado na importação deste módulo:
+    as extensões são ligadas aqui, os Blueprints só são importados quando a
+    aplicação é criada e o Flask-Migrate só quando a CLI "flask db" é usada.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config_object)
+    os.makedirs(app.config['INSTANCE_FOLDER'], exist_ok=True)
+    logging.basicConfig(level=app.config['LOG_LEVEL'])
+
+    # Configuração do CORS
+    from flask_cors import CORS
+    CORS(app, resources={r"/*": {
+        "origins": "*",  # Permite todos os domínios
+        "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],  # Permite todos os métodos HTTP
+        "allow_headers": "*",  # Permite todos os cabeçalhos
+        "supports_credentials": True  # Permite credenciais
+    }})
+
+    # Inicializa o banco de dados (pools definidos em SQLALCHEMY_ENGINE_OPTIONS e SQLALCHEMY_BINDS)
+    db.init_app(app)
+    init_engines(app, db)
+    jwt.init_app(app)
+    hashing_executor.init_app(app)
+    user_cache.init_app(app)
+    token_blocklist.init_app(app)
+    metrics.init_app(app)
+
+    # Consulta a lista de tokens revogados em memória a cada @jwt_required()
+    jwt.token_in_blocklist_loader(check_if_token_revoked)
+    # Momento de emissão em milissegundos, comparado com o das revogações
+    jwt.additional_claims_loader(issued_at_claims)
+
+    # Registra os Blueprints
+    from routes.auth_routes import auth_bp
+    from routes.user_routes import user_bp
+    app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(user_bp, url_prefix='/api')
 
-# Importa os Blueprints
-from routes.auth_routes import auth_bp
-from routes.user_routes import user_bp
+    app.register_error_handler(HashingUnavailableError, hashing_unavailable)
+    app.add_url_rule('/', 'index', index)
+    register_cli(app)
+    return app
 
-logging.basicConfig(level=logging.DEBUG)
 
-# Inicializa a aplicação e as extensões
-app = Flask(__name__)
-app.config['DEBUG'] = True
-app.config['ENV'] = 'development'
-app.config.from_object(Config)
+def check_if_token_revoked(jwt_header, jwt_payload):
+    return token_blocklist.is_revoked(jwt_payload)
 
-# Configuração do CORS
-CORS(app, resources={r"/*": {
-    "origins": "*",  # Permite todos os domínios
-    "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],  # Permite todos os métodos HTTP
-    "allow_headers": "*",  # Permite todos os cabeçalhos
-    "supports_credentials": True  # Permite credenciais
-}})
 
-# Inicializa o banco de dados com configuração de pool
-db = SQLAlchemy(app, engine_options=Config.SQLALCHEMY_ENGINE_OPTIONS)
-jwt = JWTManager(app)
-migrate = Migrate(app, db)
+# Responde 503 quando o executor de hashing está sobrecarregado
+def hashing_unavailable(error):
+    response = jsonify({'message': 'Service temporarily unavailable, try again later'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
 
-# Registra os Blueprints
-app.register_blueprint(auth_bp, url_prefix='/auth')
-app.register_blueprint(user_bp, url_prefix='/api')
 
-@app.route('/')
 def index():
     return 'Bem-vindo à aplicação!'
 
+
+class LazyMigrateCommand(click.Command):
+    """
+    Entrada "flask db" que só importa o Flask-Migrate (e, com ele, o Alembic)
+    quando um comando de migração é de fato usado; a partir daí, o grupo
+    original do Flask-Migrate assume a linha de comando.
+    """
+
+    def __init__(self, app):
+        super().__init__('db', help='Migrações do banco de dados (Flask-Migrate).')
+        self.app = app
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as migrate_group
+        if 'migrate' not in self.app.extensions:
+            Migrate(self.app, db)
+        return migrate_group.make_context(info_name, args, parent=parent, **extra)
+
+
+def register_cli(app):
+    app.cli.add_command(LazyMigrateCommand(app))
+
+    # Mede o custo do hashing neste host e sugere o PASSWORD_HASH_METHOD
+    @app.cli.command('calibrate-hashing')
+    @click.option('--target-ms', default=250, show_default=True, help='Tempo desejado por hash, em milissegundos.')
+    @click.option('--algorithm', default='scrypt', type=click.Choice(['scrypt', 'pbkdf2']), show_default=True)
+    def calibrate_hashing(target_ms, algorithm):
+        method, seconds = calibrate_hash_method(target_ms / 1000, algorithm)
+        click.echo(f'PASSWORD_HASH_METHOD={method}')
+        click.echo(f'# {seconds * 1000:.0f} ms por hash neste host (alvo: {target_ms} ms)')
+
+
 if __name__ == '__main__':
-    app.run(debug=True, use_reloader=True) 
-    
\ No newline at end of file
+    create_app().run(debug=True, use_reloader=True)
@@ -0,0 +1,384 @@
+"""
+Ponto de entrada assíncrono (ASGI) da API.
+
+Serve as mesmas rotas de /auth e /api do app.py, reaproveitando o modelo User,
+o UserSchema, a configuração de JWT e o executor de hashing, mas com um engine
+assíncrono do SQLAlchemy (aiosqlite), de modo que a concorrência não fica
+limitada ao número de threads do servidor.
+
+Uso:
+    uvicorn asgi_app:app --host 127.0.0.1 --port 8000
+"""
+import json
+from contextlib import asynccontextmanager
+from functools import partial
+from flask_jwt_extended import create_access_token, decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import ExpiredSignatureError, PyJWTError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+from app import create_app
+from models.user import User
+from routes.auth_routes import (
+    bulk_request_errors, bulk_summary, bulk_values, mark_taken_emails, parse_bulk_rows, pending_rows, save_rehash,
+)
+from routes.user_routes import (
+    batch_request_errors, batch_statements, batch_summary, finish_batch, split_batch_ids, user_to_record,
+)
+from schemas.user_schema import UserSchema, dump_user, dump_users
+from service.database import apply_sqlite_pragmas
+from service.revocation import token_blocklist
+from service.security import hashing_executor, HashingUnavailableError
+from service.user_cache import user_cache
+
+flask_app = create_app()
+config = flask_app.config
+engine = create_async_engine(config['ASYNC_DATABASE_URI'])
+apply_sqlite_pragmas(engine.sync_engine, config['SQLITE_PRAGMAS'])
+Session = async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def get_identity(request):
+    """
+    Equivalente ao @jwt_required(): valida o token com a configuração do
+    Flask-JWT-Extended e consulta a lista de tokens revogados.
+    """
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        raise HTTPException(401, 'Missing Authorization Header')
+    try:
+        with flask_app.app_context():
+            claims = decode_token(header[len('Bearer '):])
+    except ExpiredSignatureError:
+        raise HTTPException(401, 'Token has expired')
+    except (PyJWTError, JWTExtendedException) as error:
+        raise HTTPException(422, str(error))
+    if claims.get('type') != 'access':
+        raise HTTPException(422, 'Only non-refresh tokens are allowed')
+    if token_blocklist.is_revoked(claims):
+        raise HTTPException(401, 'Token has been revoked')
+    return claims['sub']
+
+
+def forbidden(user, identity, required_role):
+    if identity['role'] != required_role and identity['id'] != user.id:
+        return JSONResponse({'message': 'Unauthorized'}, 403)
+    return None
+
+
+async def register(request):
+    data = await request.json()
+    errors = UserSchema().validate(data)
+    if errors:
+        return JSONResponse(errors, 400)
+
+    hashed_password = await hashing_executor.hash_password_async(data['password'])
+    async with Session() as session:
+        new_user = User(name=data['name'], email=data['email'], password=hashed_password, role=data.get('role', 'CLIENT'))
+        session.add(new_user)
+        await session.commit()
+    user_cache.invalidate(new_user.id)
+    return JSONResponse(dump_user(new_user), 201)
+
+
+async def insert_users(values):
+    """
+    Equivalente assíncrono do insert_users de routes/auth_routes.py: insere o
+    lote em uma transação e, se alguma linha violar uma restrição, refaz linha
+    a linha com savepoints. Retorna ({índice: id}, {índice: erros}).
+    """
+    async with Session() as session:
+        try:
+            result = await session.execute(
+                insert(User).returning(User.id, sort_by_parameter_order=True), [row for _, row in values]
+            )
+            ids = {index: user_id for (index, _), user_id in zip(values, result.scalars())}
+            await session.commit()
+            return ids, {}
+        except IntegrityError:
+            await session.rollback()
+
+        ids, errors = {}, {}
+        for index, row in values:
+            try:
+                async with session.begin_nested():
+                    ids[index] = (await session.execute(insert(User).returning(User.id), row)).scalar_one()
+            except IntegrityError:
+                errors[index] = {'email': ['Email already registered.']}
+        await session.commit()
+    return ids, errors
+
+
+async def register_bulk(request):
+    identity = await get_identity(request)
+    if identity['role'] != 'ADMIN':
+        return JSONResponse({'message': 'Unauthorized'}, 403)
+    mimetype = request.headers.get('Content-Type', '').split(';')[0].strip()
+    body = await request.body()
+    if mimetype == 'application/x-ndjson':
+        rows, errors = parse_bulk_rows(mimetype, body.splitlines(), None)
+    else:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        rows, errors = parse_bulk_rows(mimetype, (), data)
+    if rows is None:
+        return JSONResponse(errors, 400)
+    error = bulk_request_errors(rows, errors, config['BULK_REGISTER_MAX_ROWS'])
+    if error:
+        return JSONResponse(*error)
+
+    chunk_size = config['BULK_REGISTER_CHUNK_SIZE']
+    emails = [row['email'] for _, row in pending_rows(rows, errors)]
+    existing = set()
+    async with Session() as session:
+        for start in range(0, len(emails), chunk_size):
+            existing.update(await session.scalars(
+                select(User.email).where(User.email.in_(emails[start:start + chunk_size]))
+            ))
+    valid = mark_taken_emails(rows, errors, existing)
+
+    hashes = await hashing_executor.hash_passwords_async([row['password'] for _, row in valid])
+    values = bulk_values(valid, hashes)
+
+    created = {}
+    for start in range(0, len(values), chunk_size):
+        ids, chunk_errors = await insert_users(values[start:start + chunk_size])
+        created.update(ids)
+        errors.update(chunk_errors)
+    return JSONResponse(*bulk_summary(len(rows), created, errors))
+
+
+async def login(request):
+    data = await request.json()
+    async with Session() as session:
+        user = await session.scalar(select(User).where(User.email == data['email']))
+
+    if user and await hashing_executor.check_password_async(user.password, data['password']):
+        if hashing_executor.needs_rehash(user.password):
+            hashing_executor.rehash_async(data['password'], partial(save_rehash, flask_app, user.id, user.password))
+        with flask_app.app_context():
+            access_token = create_access_token(identity={'id': user.id, 'role': user.role})
+        return JSONResponse({'access_token': access_token}, 200)
+
+    return JSONResponse({'message': 'Invalid credentials'}, 401)
+
+
+async def get_current_user(request):
+    identity = await get_identity(request)
+    record = user_cache.get(identity['id'])
+    if record is None:
+        async with Session() as session:
+            user = await session.get(User, identity['id'])
+        if user is None:
+            return JSONResponse({'message': 'User not found'}, 404)
+        record = user_to_record(user)
+        user_cache.set(user.id, record)
+    return JSONResponse(dump_user(User(**record)))
+
+
+async def stream_users(after, batch_size):
+    statement = select(User).where(User.id > after).order_by(User.id).execution_options(yield_per=batch_size)
+    async with Session() as session:
+        yield '['
+        first = True
+        async for user in await session.stream_scalars(statement):
+            if not first:
+                yield ','
+            yield json.dumps(dump_user(user))
+            first = False
+        yield ']'
+
+
+async def get_users(request):
+    identity = await get_identity(request)
+    if identity['role'] != 'ADMIN':
+        return JSONResponse({'message': 'Unauthorized'}, 403)
+
+    try:
+        after = int(request.query_params.get('after', 0))
+        limit = int(request.query_params.get('limit', config['USERS_PAGE_SIZE']))
+    except ValueError:
+        after, limit = 0, config['USERS_PAGE_SIZE']
+    limit = max(1, min(limit, config['USERS_MAX_PAGE_SIZE']))
+
+    if request.query_params.get('stream', '').lower() in ('1', 'true'):
+        body = stream_users(after, config['USERS_STREAM_BATCH_SIZE'])
+        return StreamingResponse(body, media_type='application/json')
+
+    async with Session() as session:
+        users = (await session.scalars(
+            select(User).where(User.id > after).order_by(User.id).limit(limit)
+        )).all()
+    response = JSONResponse(dump_users(users))
+
+    if len(users) == limit:
+        next_after = users[-1].id
+        response.headers['X-Next-After'] = str(next_after)
+        response.headers['Link'] = f'</api/users?after={next_after}&limit={limit}>; rel="next"'
+    return response
+
+
+async def update_user(request):
+    identity = await get_identity(request)
+    user_id = request.path_params['user_id']
+    if identity['role'] != 'ADMIN' and identity['id'] != user_id:
+        return JSONResponse({'message': 'Unauthorized'}, 403)
+    data = await request.json()
+    # Como no app.py: o hash é calculado antes de a sessão abrir uma conexão
+    if 'password' in data:
+        hashed_password = await hashing_executor.hash_password_async(data['password'])
+
+    async with Session() as session:
+        user = await session.get(User, user_id)
+        if user is None:
+            return JSONResponse({'message': 'User not found'}, 404)
+
+        user.name = data.get('name', user.name)
+        user.email = data.get('email', user.email)
+        if 'password' in data:
+            user.password = hashed_password
+        await session.commit()
+
+    user_cache.invalidate(user_id)
+    if 'password' in data:
+        token_blocklist.revoke_user(user_id)
+    return JSONResponse(dump_user(user))
+
+
+async def delete_user(request):
+    identity = await get_identity(request)
+    user_id = request.path_params['user_id']
+
+    async with Session() as session:
+        user = await session.get(User, user_id)
+        if user is None:
+            return JSONResponse({'message': 'User not found'}, 404)
+        permission_error = forbidden(user, identity, 'ADMIN')
+        if permission_error:
+            return permission_error
+        await session.delete(user)
+        await session.commit()
+
+    user_cache.invalidate(user_id)
+    token_blocklist.revoke_user(user_id)
+    return JSONResponse({'message': 'User deleted'}, 200)
+
+
+async def read_batch_request(request, updating=False):
+    """
+    Lê e valida o corpo de PATCH/DELETE /api/users. Retorna (dados, resposta de erro).
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    error = batch_request_errors(data, config['BATCH_MAX_IDS'], updating)
+    if error:
+        return None, JSONResponse(*error)
+    return data, None
+
+
+async def run_batch(data, statement):
+    """
+    Equivalente assíncrono do run_batch de routes/user_routes.py: executa e
+    confirma o lote em uma transação e retorna ((ids afetados, ids não
+    encontrados), None), ou (None, resposta 413) se o filtro afetou usuários demais.
+    """
+    affected = set()
+    async with Session() as session:
+        for chunk in batch_statements(data, statement, config['BATCH_CHUNK_SIZE']):
+            affected.update(await session.scalars(chunk, execution_options={'synchronize_session': False}))
+        if len(affected) > config['BATCH_MAX_IDS']:
+            await session.rollback()
+            return None, JSONResponse({'message': f"Filter matches more than {config['BATCH_MAX_IDS']} users"}, 413)
+        await session.commit()
+    return split_batch_ids(data, affected), None
+
+
+async def update_users(request):
+    identity = await get_identity(request)
+    if identity['role'] != 'ADMIN':
+        return JSONResponse({'message': 'Unauthorized'}, 403)
+    data, error = await read_batch_request(request, updating=True)
+    if error:
+        return error
+
+    values = data['set']
+    result, error = await run_batch(data, update(User).values(**values))
+    if error:
+        return error
+    ids, missing = result
+    finish_batch(ids, revoke='role' in values)
+    return JSONResponse(batch_summary('updated', ids, missing), 200)
+
+
+async def delete_users(request):
+    identity = await get_identity(request)
+    if identity['role'] != 'ADMIN':
+        return JSONResponse({'message': 'Unauthorized'}, 403)
+    data, error = await read_batch_request(request)
+    if error:
+        return error
+
+    result, error = await run_batch(data, delete(User))
+    if error:
+        return error
+    ids, missing = result
+    finish_batch(ids, revoke=True)
+    return JSONResponse(batch_summary('deleted', ids, missing), 200)
+
+
+async def index(request):
+    return JSONResponse('Bem-vindo à aplicação!')
+
+
+async def http_error(request, error):
+    # Mesmo formato de erro do Flask-JWT-Extended
+    return JSONResponse({'msg': error.detail}, error.status_code)
+
+
+async def hashing_unavailable(request, error):
+    return JSONResponse(
+        {'message': 'Service temporarily unavailable, try again later'}, 503,
+        headers={'Retry-After': '1'},
+    )
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await engine.dispose()
+    hashing_executor.shutdown()
+
+
+app = Starlette(
+    routes=[
+        Route('/', index),
+        Mount('/auth', routes=[
+            Route('/register', register, methods=['POST']),
+            Route('/register/bulk', register_bulk, methods=['POST']),
+            Route('/login', login, methods=['POST']),
+        ]),
+        Mount('/api', routes=[
+            Route('/me', get_current_user, methods=['GET']),
+            Route('/users', get_users, methods=['GET']),
+            Route('/users', update_users, methods=['PATCH']),
+            Route('/users', delete_users, methods=['DELETE']),
+            Route('/users/{user_id:int}', update_user, methods=['PUT']),
+            Route('/users/{user_id:int}', delete_user, methods=['DELETE']),
+        ]),
+    ],
+    exception_handlers={
+        HTTPException: http_error,
+        HashingUnavailableError: hashing_unavailable,
+    },
+    lifespan=lifespan,
+)
@@ -0,0 +1,166 @@
+"""
+Teste de carga comparando o servidor síncrono (app.py, servidor com threads
+do werkzeug) com o modo assíncrono (asgi_app.py, uvicorn), com alta
+concorrência em GET /api/me.
+
+Os dois servidores usam o mesmo banco SQLite temporário, criado e populado
+pelo próprio script. O cliente de carga usa apenas asyncio, abrindo uma
+conexão por requisição nos dois casos.
+
+Uso:
+    python benchmarks/bench_asgi.py --concurrency 200 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+SYNC_SERVER = (
+    "from werkzeug.serving import run_simple; from app import create_app; "
+    "run_simple('127.0.0.1', {port}, create_app(), threaded=True)"
+)
+ASYNC_SERVER = "import uvicorn; uvicorn.run('asgi_app:app', host='127.0.0.1', port={port}, log_level='warning')"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Servidor não respondeu na porta {port}')
+
+
+async def http_request(port, method, path, headers=None, body=None):
+    """
+    Faz uma requisição HTTP/1.1 com Connection: close e devolve (status, corpo).
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    lines = [f'{method} {path} HTTP/1.1', 'Host: 127.0.0.1', 'Connection: close',
+             f'Content-Length: {len(payload)}']
+    if body is not None:
+        lines.append('Content-Type: application/json')
+    lines.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    if b'transfer-encoding: chunked' in head.lower():
+        content = b''.join(content.split(b'\r\n')[1::2])
+    return status, content
+
+
+async def load(port, path, headers, concurrency, duration):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status, _ = await http_request(port, 'GET', path, headers)
+            except OSError:
+                status = 0
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def seed(env):
+    os.environ.update(env)
+    from app import create_app
+    from extensions import db
+    from models.user import User
+    from service.security import hash_password
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(
+            name='Admin', email='admin@email.com',
+            password=hash_password('admin123', app.config['PASSWORD_HASH_METHOD']), role='ADMIN',
+        ))
+        db.session.commit()
+
+
+def run_server(label, command, env, args):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-c', command.format(port=port)], cwd=BASE_DIR, env={**os.environ, **env},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        status, body = asyncio.run(http_request(
+            port, 'POST', '/auth/login', body={'email': 'admin@email.com', 'password': 'admin123'}
+        ))
+        if status != 200:
+            raise RuntimeError(f'Login falhou no servidor {label}: {status} {body!r}')
+        headers = {'Authorization': f"Bearer {json.loads(body)['access_token']}"}
+        result = asyncio.run(load(port, '/api/me', headers, args.concurrency, args.duration))
+        return {'server': label, 'concurrency': args.concurrency, **result}
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--concurrency', type=int, default=200, help='Clientes simultâneos')
+    parser.add_argument('--duration', type=float, default=10, help='Duração de cada rodada (segundos)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, 'bench.db')
+        env = {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database_path}',
+            'ASYNC_DATABASE_URI': f'sqlite+aiosqlite:///{database_path}',
+            'JWT_SECRET_KEY': 'chave-do-benchmark-com-32-bytes-ou-mais',
+            'LOG_LEVEL': 'WARNING',
+        }
+        seed(env)
+        for label, command in (('sync (app.py)', SYNC_SERVER), ('async (asgi_app.py)', ASYNC_SERVER)):
+            print(json.dumps(run_server(label, command, env, args)))
+
+
+if __name__ == '__main__':
+    main()
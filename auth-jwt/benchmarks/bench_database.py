@@ -0,0 +1,124 @@
+"""
+Benchmark de concorrência leitura/escrita no SQLite: configuração antiga
+(um único pool, journal padrão) vs. engines separados de leitura e escrita
+com WAL e os PRAGMAs de SQLITE_PRAGMAS.
+
+Threads leitoras fazem a consulta de /api/me (usuário por id) enquanto
+threads escritoras fazem o UPDATE de update_user, cada uma com seu commit.
+
+Uso:
+    python benchmarks/bench_database.py --readers 16 --writers 4 --duration 5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from config import Config  # noqa: E402
+from service.database import apply_sqlite_pragmas  # noqa: E402
+
+LEGACY_POOL = {'pool_size': 5, 'max_overflow': 10, 'pool_timeout': 30, 'pool_recycle': 1800}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def seed(url, users):
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE user (id INTEGER PRIMARY KEY, name VARCHAR(80) NOT NULL, '
+            'email VARCHAR(120) UNIQUE NOT NULL, password VARCHAR(200) NOT NULL, role VARCHAR(10) NOT NULL)'
+        ))
+        conn.execute(
+            text('INSERT INTO user (name, email, password, role) VALUES (:name, :email, :password, :role)'),
+            [{'name': f'User {i}', 'email': f'user{i}@example.com', 'password': 'x', 'role': 'CLIENT'}
+             for i in range(users)],
+        )
+    engine.dispose()
+
+
+def run(label, read_engine, write_engine, args):
+    reads, writes = [], []
+    write_errors = 0
+    deadline = time.perf_counter() + args.duration
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            with read_engine.connect() as conn:
+                conn.execute(text('SELECT id, name, email, role FROM user WHERE id = :id'),
+                             {'id': rng.randint(1, args.users)}).fetchone()
+            reads.append(time.perf_counter() - start)
+
+    def writer(seed):
+        nonlocal write_errors
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with write_engine.begin() as conn:
+                    conn.execute(text('UPDATE user SET name = :name WHERE id = :id'),
+                                 {'name': f'Renamed {rng.random()}', 'id': rng.randint(1, args.users)})
+                writes.append(time.perf_counter() - start)
+            except OperationalError:
+                write_errors += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + i,)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'mode': label,
+        'reads_per_s': round(len(reads) / args.duration, 1),
+        'read_p99_ms': round(percentile(reads, 99) * 1000, 2),
+        'writes_per_s': round(len(writes) / args.duration, 1),
+        'write_p99_ms': round(percentile(writes, 99) * 1000, 2),
+        'write_errors': write_errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=10000, help='Usuários no banco')
+    parser.add_argument('--readers', type=int, default=16, help='Threads de leitura')
+    parser.add_argument('--writers', type=int, default=4, help='Threads de escrita')
+    parser.add_argument('--duration', type=float, default=5, help='Duração de cada rodada (segundos)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_url = f"sqlite:///{os.path.join(tmp, 'legacy.db')}"
+        seed(legacy_url, args.users)
+        engine = create_engine(legacy_url, **LEGACY_POOL)
+        print(run('single pool, rollback journal', engine, engine, args))
+        engine.dispose()
+
+        tuned_url = f"sqlite:///{os.path.join(tmp, 'tuned.db')}"
+        seed(tuned_url, args.users)
+        write_engine = create_engine(tuned_url, **Config.SQLALCHEMY_ENGINE_OPTIONS)
+        read_options = {k: v for k, v in Config.SQLALCHEMY_BINDS['read'].items() if k != 'url'}
+        read_engine = create_engine(tuned_url, **read_options)
+        apply_sqlite_pragmas(write_engine, Config.SQLITE_PRAGMAS)
+        apply_sqlite_pragmas(read_engine, Config.SQLITE_PRAGMAS, read_only=True)
+        print(run('read/write split, WAL', read_engine, write_engine, args))
+        write_engine.dispose()
+        read_engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark do login sob carga concorrente: hashing na thread da requisição
+(antes) vs. hashing no HashingExecutor (depois).
+
+Simula um servidor com um número fixo de threads de requisição atendendo ao
+mesmo tempo rajadas de /auth/login (check_password) e chamadas leves de
+/api/me. Mostra a vazão e o p99 do login e o p99 das chamadas leves, que
+são as que ficam presas atrás do hashing.
+
+Uso:
+    python benchmarks/bench_hashing.py --logins 200 --threads 16
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from service.security import (  # noqa: E402
+    HashingExecutor, HashingUnavailableError, check_password, hash_password,
+)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(label, login_fn, args, stored_hash):
+    login_latencies, me_latencies = [], []
+    rejected = 0
+
+    # As latências contam desde o enfileiramento, como o cliente as percebe
+    def login(start):
+        nonlocal rejected
+        try:
+            login_fn(stored_hash, 'senha-do-benchmark')
+        except HashingUnavailableError:
+            rejected += 1
+            return
+        login_latencies.append(time.perf_counter() - start)
+
+    def me(start):
+        # Requisição leve: só serialização de um dicionário pequeno
+        sum(len(str(i)) for i in range(200))
+        me_latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as server:
+        for i in range(args.logins):
+            server.submit(login, time.perf_counter())
+            for _ in range(args.me_ratio):
+                server.submit(me, time.perf_counter())
+    elapsed = time.perf_counter() - start
+
+    return {
+        'mode': label,
+        'logins_ok': len(login_latencies),
+        'logins_rejected_503': rejected,
+        'login_throughput_rps': round(len(login_latencies) / elapsed, 1),
+        'login_p99_ms': round(percentile(login_latencies, 99) * 1000, 2),
+        'me_p99_ms': round(percentile(me_latencies, 99) * 1000, 2),
+        'elapsed_s': round(elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--logins', type=int, default=200, help='Total de requisições de login')
+    parser.add_argument('--me-ratio', type=int, default=5, help='Chamadas /api/me por login')
+    parser.add_argument('--threads', type=int, default=16, help='Threads de requisição do servidor')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Processos do executor')
+    parser.add_argument('--queue', type=int, default=32, help='Profundidade da fila do executor')
+    parser.add_argument('--timeout', type=float, default=5.0, help='Timeout por hash (segundos)')
+    args = parser.parse_args()
+
+    stored_hash = hash_password('senha-do-benchmark')
+    results = [run('inline', check_password, args, stored_hash)]
+
+    executor = HashingExecutor(max_workers=args.workers, max_queue=args.queue, timeout=args.timeout)
+    executor.check_password(stored_hash, 'aquecimento')  # Inicia os processos antes de medir
+    try:
+        results.append(run('executor', executor.check_password, args, stored_hash))
+    finally:
+        executor.shutdown()
+
+    for result in results:
+        print(result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Teste de carga dos endpoints da API: /auth/login, /auth/register, /api/me e
+/api/users, contra um servidor real (app.py ou asgi_app.py) e um banco SQLite
+temporário, sem acesso à rede.
+
+O banco é populado com --users usuários (como o init_db.py, mas em lote e com
+um único hash de senha reaproveitado). Cada endpoint é exercitado por
+--concurrency clientes durante --duration segundos, e o resultado sai em JSON
+com vazão e latências p50/p95/p99 por endpoint.
+
+Com --compare, o resultado é comparado a uma execução anterior (--output) e o
+script termina com código 1 se algum endpoint piorar além de --tolerance,
+o que permite pegar regressões de hashing, consultas ou serialização.
+
+Uso:
+    python benchmarks/bench_load.py --users 100000 --concurrency 50 --duration 10 --output base.json
+    python benchmarks/bench_load.py --users 100000 --concurrency 50 --duration 10 --compare base.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from bench_asgi import ASYNC_SERVER, SYNC_SERVER, free_port, http_request, wait_for_port  # noqa: E402
+
+SERVERS = {'sync': SYNC_SERVER, 'async': ASYNC_SERVER}
+ENDPOINTS = ('login', 'register', 'me', 'users')
+SEED_PASSWORD = 'senha-do-benchmark'
+SEED_CHUNK_SIZE = 5000
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def seed(env, users):
+    """
+    Cria as tabelas e insere um administrador e `users` clientes.
+    """
+    os.environ.update(env)
+    from sqlalchemy import insert
+    from app import create_app
+    from extensions import db
+    from models.user import User
+    from service.security import hash_password
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        password = hash_password(SEED_PASSWORD, app.config['PASSWORD_HASH_METHOD'])
+        db.session.add(User(name='Admin', email='admin@email.com', password=password, role='ADMIN'))
+        for start in range(0, users, SEED_CHUNK_SIZE):
+            db.session.execute(insert(User), [
+                {'name': f'User {i}', 'email': f'user{i}@example.com', 'password': password, 'role': 'CLIENT'}
+                for i in range(start, min(start + SEED_CHUNK_SIZE, users))
+            ])
+        db.session.commit()
+        return app.config['PASSWORD_HASH_METHOD']
+
+
+async def login(port, email, attempts=10):
+    # Os logins iniciais chegam juntos: com poucos núcleos o executor de
+    # hashing responde 503 (fila cheia ou tempo esgotado) e pede nova tentativa
+    for _ in range(attempts):
+        status, body = await http_request(port, 'POST', '/auth/login', body={'email': email, 'password': SEED_PASSWORD})
+        if status != 503:
+            break
+        await asyncio.sleep(1)
+    if status != 200:
+        raise RuntimeError(f'Login de {email} falhou: {status} {body!r}')
+    return {'Authorization': f"Bearer {json.loads(body)['access_token']}"}
+
+
+def request_factory(endpoint, args, admin_headers, user_headers):
+    """
+    Devolve uma função que gera (método, caminho, cabeçalhos, corpo) para cada
+    requisição do endpoint.
+    """
+    rng = random.Random(args.seed)
+    counter = itertools.count()
+
+    if endpoint == 'login':
+        return lambda: ('POST', '/auth/login', None, {
+            'email': f'user{rng.randrange(args.users)}@example.com', 'password': SEED_PASSWORD,
+        })
+    if endpoint == 'register':
+        return lambda: ('POST', '/auth/register', None, {
+            'name': 'Load Test', 'email': f'load{next(counter)}@example.com', 'password': SEED_PASSWORD,
+        })
+    if endpoint == 'me':
+        return lambda: ('GET', '/api/me', rng.choice(user_headers), None)
+    return lambda: ('GET', f'/api/users?after={rng.randrange(args.users)}&limit={args.page_size}', admin_headers, None)
+
+
+async def load(port, next_request, concurrency, duration):
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + duration
+
+    async def client():
+        while time.perf_counter() < deadline:
+            method, path, headers, body = next_request()
+            start = time.perf_counter()
+            try:
+                status, _ = await http_request(port, method, path, headers, body)
+            except OSError:
+                status = 0
+            statuses[status] = statuses.get(status, 0) + 1
+            if 200 <= status < 300:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'errors': sum(count for status, count in statuses.items() if not 200 <= status < 300),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def drive(port, args):
+    admin_headers = await login(port, 'admin@email.com')
+    user_headers = await asyncio.gather(*(
+        login(port, f'user{i}@example.com') for i in range(min(args.token_users, args.users))
+    )) or [admin_headers]
+
+    results = {}
+    for endpoint in args.endpoints:
+        next_request = request_factory(endpoint, args, admin_headers, list(user_headers))
+        results[endpoint] = await load(port, next_request, args.concurrency, args.duration)
+    return results
+
+
+def run_server(command, env, args):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-c', command.format(port=port)], cwd=BASE_DIR, env={**os.environ, **env},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        return asyncio.run(drive(port, args))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def compare(result, baseline, tolerance):
+    """
+    Lista os endpoints cujo p95 subiu ou cuja vazão caiu mais que `tolerance`.
+    """
+    regressions = []
+    for endpoint, current in result['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(endpoint)
+        if not previous:
+            continue
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if previous['rps'] and current['rps'] < previous['rps'] * (1 - tolerance):
+            regressions.append(f"{endpoint}: rps {previous['rps']} -> {current['rps']}")
+        if current['errors'] > previous['errors']:
+            regressions.append(f"{endpoint}: erros {previous['errors']} -> {current['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--server', choices=sorted(SERVERS), default='sync', help='Servidor testado')
+    parser.add_argument('--users', type=int, default=10000, help='Usuários inseridos antes do teste')
+    parser.add_argument('--concurrency', type=int, default=50, help='Clientes simultâneos')
+    parser.add_argument('--duration', type=float, default=10, help='Duração por endpoint (segundos)')
+    parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument('--page-size', type=int, default=100, help='limit usado em GET /api/users')
+    parser.add_argument('--token-users', type=int, default=20, help='Usuários distintos chamando /api/me')
+    parser.add_argument('--hash-method', help='PASSWORD_HASH_METHOD do servidor (padrão: o do config.py)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente das escolhas aleatórias')
+    parser.add_argument('--output', help='Grava o resultado em JSON neste arquivo')
+    parser.add_argument('--compare', help='Resultado anterior (JSON) usado como referência')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Piora relativa aceita no --compare')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, 'load.db')
+        env = {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database_path}',
+            'ASYNC_DATABASE_URI': f'sqlite+aiosqlite:///{database_path}',
+            'JWT_SECRET_KEY': 'chave-do-benchmark-com-32-bytes-ou-mais',
+            'LOG_LEVEL': 'WARNING',
+        }
+        if args.hash_method:
+            env['PASSWORD_HASH_METHOD'] = args.hash_method
+        hash_method = seed(env, args.users)
+        result = {
+            'server': args.server,
+            'users': args.users,
+            'concurrency': args.concurrency,
+            'duration_s': args.duration,
+            'hash_method': hash_method,
+            'endpoints': run_server(SERVERS[args.server], env, args),
+        }
+
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(result, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(result, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSÃO {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
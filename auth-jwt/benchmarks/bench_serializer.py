@@ -0,0 +1,144 @@
+"""
+Micro-benchmark e verificação de equivalência do serializador compilado de
+UserSchema (schemas.user_schema.dump_users) contra o dump do marshmallow.
+
+Antes de medir, confere que o JSON gerado por jsonify é idêntico byte a byte
+nos dois caminhos, tanto na listagem completa quanto usuário a usuário, com
+a saída compacta e com a indentada do modo DEBUG. Também compara casos
+isolados de compile_dump: campos None, `many=True` e schemas com Nested e
+DateTime (que devem cair no dump do marshmallow). Sai com código 1 se algum
+caso divergir.
+
+Uso:
+    python benchmarks/bench_serializer.py --users 100000
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify  # noqa: E402
+from marshmallow import Schema, fields  # noqa: E402
+from schemas.user_schema import compile_dump, dump_user, dump_users, users_schema, UserSchema  # noqa: E402
+
+
+class FakeUser:
+    """
+    Objeto com os mesmos atributos do modelo User, sem precisar do banco.
+    """
+    __slots__ = ('id', 'name', 'email', 'password', 'role')
+
+    def __init__(self, id, name, email, password, role):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.password = password
+        self.role = role
+
+
+class FakeTeam:
+    __slots__ = ('id', 'owner', 'created_at')
+
+    def __init__(self, id, owner, created_at):
+        self.id = id
+        self.owner = owner
+        self.created_at = created_at
+
+
+class TeamSchema(Schema):
+    id = fields.Int()
+    owner = fields.Nested(UserSchema)
+    created_at = fields.DateTime()
+
+
+def make_users(count, seed=42):
+    rng = random.Random(seed)
+    names = ['Ana', 'João', 'Zoë', 'Łukasz', '李雷', 'O\'Brien', 'Emoji 🎮', 'Tab\tName', 'Quote "x"']
+    users = []
+    for i in range(1, count + 1):
+        role = rng.choice(['ADMIN', 'CLIENT', 'CLIENT', None])
+        users.append(FakeUser(i, f'{rng.choice(names)} {i}', f'user{i}@example.com', 'hash', role))
+    return users
+
+
+def check_equivalence(app, users):
+    """
+    Retorna a lista de divergências entre os dois caminhos (vazia se forem
+    equivalentes). Não usa assert, que o `python -O` removeria.
+    """
+    schema = UserSchema()
+    failures = []
+    for compact in (True, False):
+        app.json.compact = compact
+        with app.app_context():
+            expected = jsonify(users_schema.dump(users)).get_data()
+            actual = jsonify(dump_users(users)).get_data()
+            if expected != actual:
+                failures.append(f'Listagem diferente do marshmallow (compact={compact})')
+            for user in users[:1000]:
+                if jsonify(schema.dump(user)).get_data() != jsonify(dump_user(user)).get_data():
+                    failures.append(f'Usuário {user.id} diferente do marshmallow (compact={compact})')
+            for label, case_schema, obj in equivalence_cases(users):
+                expected = jsonify(case_schema.dump(obj)).get_data()
+                if jsonify(compile_dump(case_schema)(obj)).get_data() != expected:
+                    failures.append(f'{label}: diferente do marshmallow (compact={compact})')
+    app.json.compact = None
+    return failures
+
+
+def equivalence_cases(users):
+    """
+    Casos isolados de compile_dump: (rótulo, schema, objeto ou lista).
+    """
+    created_at = datetime.datetime(2024, 2, 29, 13, 45, 7, 123456, tzinfo=datetime.timezone.utc)
+    return [
+        ('Campos None', UserSchema(), FakeUser(None, None, None, None, None)),
+        # Objeto sem os atributos: o marshmallow omite os campos
+        ('Objeto None', UserSchema(), None),
+        ('many=True', UserSchema(many=True), users[:100]),
+        ('many=True vazio', UserSchema(many=True), []),
+        ('many=True com objeto sem atributos', UserSchema(many=True), [users[0], None]),
+        ('only', UserSchema(only=('id', 'role')), users[0]),
+        ('Nested e DateTime', TeamSchema(), FakeTeam(1, users[0], created_at)),
+        ('Nested None', TeamSchema(), FakeTeam(2, None, None)),
+        ('Nested e DateTime many=True', TeamSchema(many=True),
+         [FakeTeam(i, user, created_at) for i, user in enumerate(users[:10])]),
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=100000, help='Quantidade de usuários')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições (usa a melhor)')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    users = make_users(args.users)
+    failures = check_equivalence(app, users)
+    if failures:
+        print('\n'.join(failures[:20]), file=sys.stderr)
+        sys.exit(1)
+    print(f'Equivalência OK para {args.users} usuários')
+
+    marshmallow = min(timed(lambda: users_schema.dump(users)) for _ in range(args.repeat))
+    compiled = min(timed(lambda: dump_users(users)) for _ in range(args.repeat))
+    print({
+        'users': args.users,
+        'marshmallow_dump_ms': round(marshmallow * 1000, 1),
+        'compiled_dump_ms': round(compiled * 1000, 1),
+        'speedup': round(marshmallow / compiled, 1),
+    })
+
+
+if __name__ == '__main__':
+    main()
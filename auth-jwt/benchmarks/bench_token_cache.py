@@ -0,0 +1,60 @@
+"""
+Benchmark da verificação de tokens com e sem o cache de decodificação
+(JWT_DECODE_CACHE_ENABLED).
+
+Simula clientes que repetem o mesmo bearer token em várias requisições e
+mostra o tempo total de decodificação e as métricas do cache.
+
+Uso:
+    python benchmarks/bench_token_cache.py --tokens 100 --requests 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from flask_jwt_extended import create_access_token, decode_token  # noqa: E402
+from service.token_cache import CachingJWTManager  # noqa: E402
+
+
+def run(enabled, args):
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'chave-do-benchmark-com-32-bytes-ou-mais'
+    app.config['JWT_DECODE_CACHE_ENABLED'] = enabled
+    jwt = CachingJWTManager(app)
+
+    with app.app_context():
+        tokens = [create_access_token(identity=str(i)) for i in range(args.tokens)]
+        rng = random.Random(42)
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            decode_token(rng.choice(tokens))
+        elapsed = time.perf_counter() - start
+
+    result = {
+        'decode_cache': enabled,
+        'requests': args.requests,
+        'total_ms': round(elapsed * 1000, 2),
+        'per_request_us': round(elapsed / args.requests * 1e6, 2),
+    }
+    if jwt.decode_cache is not None:
+        result.update(jwt.decode_cache.stats())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--tokens', type=int, default=100, help='Tokens distintos em uso')
+    parser.add_argument('--requests', type=int, default=10000, help='Requisições simuladas')
+    args = parser.parse_args()
+
+    print(run(False, args))
+    print(run(True, args))
+
+
+if __name__ == '__main__':
+    main()
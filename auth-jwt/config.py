@@ -8,26 +8,88 @@ load_dotenv()
 class Config:
     # Usando o "os" para garantir que a pasta 'instance' exista e o caminho seja construído corretamente
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))  # Diretorio base
-    INSTANCE_FOLDER = os.path.join(BASE_DIR, 'instance')
+    INSTANCE_FOLDER = os.path.join(BASE_DIR, 'instance')  # Criada por create_app() (app.py)
     
-    # Certifica que a pasta 'instance' existe
-    if not os.path.exists(INSTANCE_FOLDER):
-        os.makedirs(INSTANCE_FOLDER)
-    
-    SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(INSTANCE_FOLDER, "users.db")}'
+    SQLALCHEMY_DATABASE_URI = os.getenv('SQLALCHEMY_DATABASE_URI', f'sqlite:///{os.path.join(INSTANCE_FOLDER, "users.db")}')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    # Configuração do Pool de Conexão
+    # Mesmo banco acessado pelo engine assíncrono do modo ASGI (asgi_app.py)
+    ASYNC_DATABASE_URI = os.getenv('ASYNC_DATABASE_URI', f'sqlite+aiosqlite:///{os.path.join(INSTANCE_FOLDER, "users.db")}')
+
+    # Configuração do Pool de Conexão de escrita
+    # O SQLite aceita um único escritor por vez, então as escritas usam uma só
+    # conexão e esperam na fila do pool em vez de falhar com "database is locked"
     SQLALCHEMY_ENGINE_OPTIONS = {
-        "pool_size": 5,              # Número máximo de conexões no pool
-        "max_overflow": 10,          # Número máximo de conexões extras acima do pool_size
+        "pool_size": 1,              # Número máximo de conexões no pool
+        "max_overflow": 0,           # Número máximo de conexões extras acima do pool_size
         "pool_timeout": 30,          # Tempo máximo de espera por uma conexão livre (segundos)
         "pool_recycle": 1800         # Tempo para reciclar conexões (segundos)
     }
 
+    # Pool de leitura (service/database.py): consultas somente leitura vão para
+    # este bind, que pode apontar para uma réplica com READ_DATABASE_URI
+    READ_DATABASE_URI = os.getenv('READ_DATABASE_URI', SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = {
+        'read': {
+            'url': READ_DATABASE_URI,
+            'pool_size': 5,
+            'max_overflow': 10,
+            'pool_timeout': 30,
+            'pool_recycle': 1800,
+        }
+    }
+
+    # PRAGMAs aplicados a cada conexão SQLite (escrita e leitura)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',       # Leitores não bloqueiam o escritor (e vice-versa)
+        'synchronous': 'NORMAL',     # Seguro em WAL e evita um fsync por commit
+        'busy_timeout': 5000,        # Espera (ms) por locks antes de falhar
+        'cache_size': -64000,        # Cache de páginas por conexão (valor negativo = KiB)
+        'mmap_size': 268435456,      # Leituras via memória mapeada (bytes)
+        'temp_store': 'MEMORY',
+    }
+
     # Acesso a chave secreta de forma segura
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'fallback_secret_key')  # Valor de fallback se não encontrar no .env
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    JWT_VERIFY_SUB = False             # A identidade do token é um dicionário {'id', 'role'}, não uma string
+    JWT_DECODE_CACHE_ENABLED = os.getenv('JWT_DECODE_CACHE_ENABLED', 'false').lower() == 'true'  # Reaproveita claims de tokens já verificados
+    JWT_DECODE_CACHE_SIZE = 10000      # Número máximo de tokens verificados em cache
+    TOKEN_BLOCKLIST_CAPACITY = 100000  # Revogações esperadas dentro de JWT_ACCESS_TOKEN_EXPIRES (dimensiona o filtro de Bloom)
+
+    # Configuração do executor de hashing de senhas (service/security.py)
+    # Use "flask calibrate-hashing" para escolher o método adequado a este host.
+    # O padrão é o scrypt do werkzeug. Hashes do mesmo algoritmo gravados com
+    # outros parâmetros são refeitos no próximo login; hashes de outro algoritmo
+    # são mantidos (trocar de algoritmo é uma migração, não um ajuste de custo).
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    HASHING_MAX_WORKERS = int(os.getenv('HASHING_MAX_WORKERS', os.cpu_count() or 1))  # Processos dedicados ao hashing
+    HASHING_MAX_QUEUE = int(os.getenv('HASHING_MAX_QUEUE', 32))        # Chamadas aguardando além das em execução
+    HASHING_TIMEOUT = float(os.getenv('HASHING_TIMEOUT', 5))           # Tempo máximo de espera por um hash (segundos)
+
+    # Cadastro em lote (POST /auth/register/bulk)
+    BULK_REGISTER_MAX_ROWS = 1000      # Usuários aceitos por requisição
+    BULK_REGISTER_CHUNK_SIZE = 500     # Usuários inseridos por transação
+
+    # Paginação de GET /api/users
+    USERS_PAGE_SIZE = 100           # Tamanho padrão da página
+    USERS_MAX_PAGE_SIZE = 1000      # Maior valor aceito em ?limit=
+    USERS_STREAM_BATCH_SIZE = 500   # Linhas buscadas por vez no modo streaming
+
+    # Operações em lote (PATCH/DELETE /api/users)
+    BATCH_MAX_IDS = 10000           # Usuários afetados por requisição
+    BATCH_CHUNK_SIZE = 500          # Ids por comando IN (...) dentro da transação
+
+    # Cache de usuários das rotas protegidas (service/user_cache.py)
+    USER_CACHE_BACKEND = os.getenv('USER_CACHE_BACKEND', 'memory')  # 'memory' (por processo) ou 'sqlite' (compartilhado)
+    USER_CACHE_PATH = os.path.join(INSTANCE_FOLDER, 'user_cache.db')  # Arquivo usado pelo backend 'sqlite'
+    USER_CACHE_MAX_SIZE = 10000     # Número máximo de usuários em cache
+    USER_CACHE_TTL = 60             # Tempo de vida de cada registro (segundos)
     
+    # Instrumentação (service/metrics.py)
+    SLOW_REQUEST_THRESHOLD_MS = 500   # Requisições acima deste tempo são registradas no log
+
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')  # Nível do logging configurado em create_app()
+
     DEBUG = True
     FLASK_ENV = "development"  # Modo de ambiente do Flask
@@ -0,0 +1,13 @@
+"""
+Extensões da aplicação, criadas sem app e ligadas a ela em create_app() (app.py).
+
+Módulos de rotas e modelos importam `db` daqui em vez de importar o app.py, o
+que evita a importação circular e permite criar a aplicação sob demanda.
+"""
+from flask_sqlalchemy import SQLAlchemy
+from service.database import RoutingSession
+from service.token_cache import CachingJWTManager
+
+# Leituras e escritas são roteadas para engines separados (service/database.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+jwt = CachingJWTManager()
@@ -1,8 +1,10 @@
-from app import app, db
+from app import create_app
+from extensions import db
 from models.user import User
-from werkzeug.security import generate_password_hash
+from service.security import hash_password
 
 def create_admin():
+    app = create_app()
     with app.app_context():
         db.create_all()  # Garante que as tabelas sejam criadas
 
@@ -11,7 +13,7 @@ def create_admin():
             admin = User(
                 name='Admin', 
                 email='admin@email.com', 
-                password=generate_password_hash('admin123'), 
+                password=hash_password('admin123', app.config['PASSWORD_HASH_METHOD']), 
                 role='ADMIN'
             )
             db.session.add(admin)
@@ -5,7 +5,7 @@ from flask import current_app
 
 from alembic import context
 
-from app import app, db
+from extensions import db
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
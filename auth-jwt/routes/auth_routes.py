@@ -1,9 +1,14 @@
-from flask import Blueprint, request, jsonify
-from service.security import hash_password, check_password
-from flask_jwt_extended import create_access_token
-from app import app, db
+import json
+from functools import partial
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from service.security import hashing_executor
+from service.user_cache import user_cache
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from extensions import db
 from models.user import User
-from schemas.user_schema import UserSchema
+from schemas.user_schema import UserSchema, dump_user
 
 auth_bp = Blueprint('auth', __name__)  # Cria o Blueprint
 
@@ -15,18 +20,187 @@ def register():
     if errors:
         return jsonify(errors), 400
     
-    hashed_password = hash_password(data['password'])
+    hashed_password = hashing_executor.hash_password(data['password'])
     new_user = User(name=data['name'], email=data['email'], password=hashed_password, role=data.get('role', 'CLIENT'))
     db.session.add(new_user)
     db.session.commit()
-    return UserSchema.jsonify(new_user), 201
+    # O SQLite pode reaproveitar ids de usuários removidos
+    user_cache.invalidate(new_user.id)
+    return jsonify(dump_user(new_user)), 201
+
+def parse_bulk_rows(mimetype, lines, data):
+    """
+    Interpreta o corpo de /register/bulk (também usado pelo modo ASGI): NDJSON
+    (`lines`, uma linha por usuário) ou lista JSON (`data`, já decodificada).
+    Retorna a lista de linhas e os erros de parse por índice.
+    """
+    if mimetype == 'application/x-ndjson':
+        rows, errors = [], {}
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                errors[len(rows)] = {'_schema': ['Invalid JSON.']}
+                rows.append(None)
+        return rows, errors
+
+    if not isinstance(data, list):
+        return None, {'_schema': ['Expected a JSON array of users.']}
+    return data, {}
+
+def read_bulk_rows():
+    """
+    Lê o corpo de /register/bulk como lista JSON ou NDJSON (uma linha por usuário).
+    """
+    if request.mimetype == 'application/x-ndjson':
+        return parse_bulk_rows(request.mimetype, request.stream, None)
+    return parse_bulk_rows(request.mimetype, (), request.get_json(silent=True))
+
+def bulk_request_errors(rows, errors, max_rows):
+    """
+    Valida as linhas de /register/bulk. Os erros de cada linha são acrescentados
+    a `errors` ({índice: erros}); um erro do lote inteiro é retornado como
+    (corpo, status).
+    """
+    if len(rows) > max_rows:
+        return {'message': f'At most {max_rows} users per request'}, 413
+
+    # Valida o lote inteiro de uma vez; as linhas com erro são apenas separadas
+    parsed = {index: row for index, row in enumerate(rows) if index not in errors}
+    validation = UserSchema(many=True).validate(list(parsed.values()))
+    indexes = list(parsed)
+    for position, row_errors in validation.items():
+        if isinstance(position, int):
+            errors[indexes[position]] = row_errors
+        else:
+            return validation, 400
+    return None
+
+def pending_rows(rows, errors):
+    return [(index, row) for index, row in enumerate(rows) if index not in errors]
+
+def mark_taken_emails(rows, errors, existing):
+    """
+    Marca como erro as linhas cujo email já está cadastrado (`existing`) ou se
+    repete no próprio lote e retorna as (índice, linha) que restaram.
+    """
+    seen = set()
+    for index, row in pending_rows(rows, errors):
+        if row['email'] in existing or row['email'] in seen:
+            errors[index] = {'email': ['Email already registered.']}
+        seen.add(row['email'])
+    return pending_rows(rows, errors)
+
+def bulk_values(valid, hashes):
+    return [
+        (index, {'name': row['name'], 'email': row['email'], 'password': hashed,
+                 'role': row.get('role', 'CLIENT')})
+        for (index, row), hashed in zip(valid, hashes)
+    ]
+
+def bulk_summary(total, created, errors):
+    """
+    Corpo e status da resposta de /register/bulk: 201 se todos foram criados,
+    207 se alguma linha falhou.
+    """
+    for user_id in created.values():
+        user_cache.invalidate(user_id)
+    results = [
+        {'index': index, 'status': 'created', 'id': created[index]} if index in created
+        else {'index': index, 'status': 'error', 'errors': errors[index]}
+        for index in range(total)
+    ]
+    status = 201 if not errors else 207
+    return {'created': len(created), 'failed': len(errors), 'results': results}, status
+
+def insert_users(rows):
+    """
+    Insere um lote de usuários em uma única transação e retorna {índice: id}.
+    Se o lote violar alguma restrição, refaz linha a linha com savepoints para
+    isolar as linhas com erro, que voltam como {índice: mensagem}.
+    """
+    values = [row for _, row in rows]
+    try:
+        result = db.session.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True), values
+        )
+        ids = {index: user_id for (index, _), user_id in zip(rows, result.scalars())}
+        db.session.commit()
+        return ids, {}
+    except IntegrityError:
+        db.session.rollback()
+
+    ids, errors = {}, {}
+    for index, row in rows:
+        try:
+            with db.session.begin_nested():
+                ids[index] = db.session.execute(insert(User).returning(User.id), row).scalar_one()
+        except IntegrityError:
+            errors[index] = {'email': ['Email already registered.']}
+    db.session.commit()
+    return ids, errors
+
+@auth_bp.route('/register/bulk', methods=['POST'])
+@jwt_required()
+def register_bulk():
+    # Cria contas com qualquer role e ocupa o executor de hashing: só para ADMIN
+    identity = get_jwt_identity()
+    if identity['role'] != 'ADMIN':
+        return jsonify({'message': 'Unauthorized'}), 403
+
+    rows, errors = read_bulk_rows()
+    if rows is None:
+        return jsonify(errors), 400
+    error = bulk_request_errors(rows, errors, current_app.config['BULK_REGISTER_MAX_ROWS'])
+    if error:
+        return jsonify(error[0]), error[1]
+
+    # Emails repetidos no próprio lote ou já cadastrados
+    chunk_size = current_app.config['BULK_REGISTER_CHUNK_SIZE']
+    emails = [row['email'] for _, row in pending_rows(rows, errors)]
+    existing = set()
+    for start in range(0, len(emails), chunk_size):
+        existing.update(db.session.scalars(
+            select(User.email).where(User.email.in_(emails[start:start + chunk_size]))
+        ))
+    valid = mark_taken_emails(rows, errors, existing)
+
+    hashes = hashing_executor.hash_passwords([row['password'] for _, row in valid])
+    values = bulk_values(valid, hashes)
+
+    created = {}
+    for start in range(0, len(values), chunk_size):
+        ids, chunk_errors = insert_users(values[start:start + chunk_size])
+        created.update(ids)
+        errors.update(chunk_errors)
+
+    body, status = bulk_summary(len(rows), created, errors)
+    return jsonify(body), status
+
+def save_rehash(app, user_id, old_hash, new_hash):
+    """
+    Grava o novo hash de um usuário, desde que a senha não tenha mudado
+    enquanto o rehash era calculado. Roda fora da requisição, por isso recebe
+    a aplicação.
+    """
+    with app.app_context():
+        updated = User.query.filter_by(id=user_id, password=old_hash).update({'password': new_hash})
+        db.session.commit()
+        if updated:
+            user_cache.invalidate(user_id)
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     data = request.get_json()
     user = User.query.filter_by(email=data['email']).first()
     
-    if user and check_password(user.password, data['password']):
+    if user and hashing_executor.check_password(user.password, data['password']):
+        # Hashes com parâmetros antigos são refeitos em segundo plano
+        if hashing_executor.needs_rehash(user.password):
+            hashing_executor.rehash_async(data['password'], partial(save_rehash, current_app._get_current_object(), user.id, user.password))
         access_token = create_access_token(identity={'id': user.id, 'role': user.role})
         return jsonify(access_token=access_token), 200
     
@@ -1,9 +1,15 @@
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, current_app, request, jsonify, Response, stream_with_context, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import app, db
+from extensions import db
 from models.user import User
-from schemas.user_schema import UserSchema, users_schema
-from werkzeug.security import generate_password_hash
+from schemas.user_schema import UserSchema, dump_user, dump_users
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import make_transient_to_detached
+from service.security import hashing_executor
+from service.user_cache import user_cache
+from service.revocation import token_blocklist
+from service.metrics import metrics
 
 user_bp = Blueprint('user', __name__)  # Cria o Blueprint
 
@@ -12,12 +18,69 @@ def check_user_permission(user, identity, required_role):
         return jsonify({'message': 'Unauthorized'}), 403
     return None  
 
+def user_to_record(user):
+    """
+    Converte um User em um dicionário simples, que pode ser guardado no cache.
+    """
+    return {
+        'id': user.id,
+        'name': user.name,
+        'email': user.email,
+        'password': user.password,
+        'role': user.role,
+    }
+
+def get_user(user_id):
+    """
+    Busca um usuário pelo id passando pelo cache. Em um acerto, o registro é
+    anexado à sessão sem consultar o banco, então pode ser alterado ou removido
+    normalmente.
+    """
+    user = db.session.identity_map.get(db.session.identity_key(User, user_id))
+    if user is not None:
+        return user
+
+    record = user_cache.get(user_id)
+    if record is None:
+        user = db.session.get(User, user_id)
+        if user is not None:
+            user_cache.set(user_id, user_to_record(user))
+        return user
+
+    user = User(**record)
+    make_transient_to_detached(user)
+    db.session.add(user)
+    return user
+
+def stream_users(after, batch_size):
+    """
+    Gera a lista de usuários em JSON aos poucos, a partir de um cursor do lado
+    do servidor, para que a memória não cresça com o tamanho da tabela.
+    """
+    statement = (
+        select(User)
+        .where(User.id > after)
+        .order_by(User.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield '['
+    first = True
+    for user in db.session.execute(statement).scalars():
+        if not first:
+            yield ','
+        yield json.dumps(dump_user(user))
+        first = False
+    yield ']'
+
 @user_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
     identity = get_jwt_identity()
-    user = User.query.get(identity['id'])
-    return UserSchema.jsonify(user)
+    user = get_user(identity['id'])
+    if user is None:
+        return jsonify({'message': 'User not found'}), 404
+    with metrics.phase('serialization'):
+        return jsonify(dump_user(user))
 
 @user_bp.route('/users', methods=['GET'])
 @jwt_required()
@@ -26,33 +89,67 @@ def get_users():
     if identity['role'] != 'ADMIN':
         return jsonify({'message': 'Unauthorized'}), 403
     
-    users = User.query.all()
-    return users_schema.jsonify(users)
+    # Paginação por cursor (keyset) em User.id: ?limit=<n>&after=<último id>
+    after = request.args.get('after', 0, type=int)
+    limit = request.args.get('limit', current_app.config['USERS_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, current_app.config['USERS_MAX_PAGE_SIZE']))
+
+    # ?stream=true devolve todos os usuários após o cursor, em streaming
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        body = stream_users(after, current_app.config['USERS_STREAM_BATCH_SIZE'])
+        return Response(stream_with_context(body), mimetype='application/json')
+
+    users = User.query.filter(User.id > after).order_by(User.id).limit(limit).all()
+    with metrics.phase('serialization'):
+        response = jsonify(dump_users(users))
+
+    # O cursor da próxima página vai nos cabeçalhos para manter o corpo como lista
+    if len(users) == limit:
+        next_after = users[-1].id
+        next_url = url_for('user.get_users', after=next_after, limit=limit)
+        response.headers['X-Next-After'] = str(next_after)
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return response
 
 @user_bp.route('/users/<int:user_id>', methods=['PUT'])
 @jwt_required()
 def update_user(user_id):
     identity = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    permission_error = check_user_permission(user, identity, 'ADMIN')
-    if permission_error:
-        return permission_error
-    
+    # Mesma regra de check_user_permission, verificada pelo id antes do hashing
+    if identity['role'] != 'ADMIN' and identity['id'] != user_id:
+        return jsonify({'message': 'Unauthorized'}), 403
+
     data = request.get_json()
+    # O hash é calculado antes de a sessão usar o engine de escrita (uma única
+    # conexão), como no cadastro: a conexão não fica presa durante o hashing
+    if 'password' in data:
+        hashed_password = hashing_executor.hash_password(data['password'])
+
+    # A leitura precede uma escrita: vai ao engine de escrita, na mesma transação
+    db.session().use_writer()
+    user = get_user(user_id)
+    if user is None:
+        return jsonify({'message': 'User not found'}), 404
+
     user.name = data.get('name', user.name)
     user.email = data.get('email', user.email)
     if 'password' in data:
-        user.password = generate_password_hash(data['password'])
+        user.password = hashed_password
     
     db.session.commit()
-    return UserSchema.jsonify(user)
+    user_cache.invalidate(user_id)
+    # Trocar a senha invalida os tokens emitidos antes da troca
+    if 'password' in data:
+        token_blocklist.revoke_user(user_id)
+    return jsonify(dump_user(user))
 
 @user_bp.route('/users/<int:user_id>', methods=['DELETE'])
 @jwt_required()
 def delete_user(user_id):
     identity = get_jwt_identity()
-    user = User.query.get(user_id)
+    # A leitura precede uma escrita: vai ao engine de escrita, na mesma transação
+    db.session().use_writer()
+    user = get_user(user_id)
     
     permission_error = check_user_permission(user, identity, 'ADMIN')
     if permission_error:
@@ -60,4 +157,151 @@ def delete_user(user_id):
     
     db.session.delete(user)
     db.session.commit()
+    user_cache.invalidate(user_id)
+    token_blocklist.revoke_user(user_id)
     return jsonify({'message': 'User deleted'}), 200
+
+def batch_request_errors(data, max_ids, updating=False):
+    """
+    Valida o corpo de PATCH/DELETE /api/users (e do modo ASGI).
+
+    Returns:
+        tuple: (corpo do erro, status HTTP), ou None se o corpo for válido.
+    """
+    if not isinstance(data, dict) or ('ids' in data) == ('filter' in data):
+        return {'message': 'Provide either "ids" or "filter"'}, 400
+    if 'ids' in data:
+        # bool é subclasse de int: true/false do JSON não são ids
+        if not isinstance(data['ids'], list) or not all(type(i) is int for i in data['ids']):
+            return {'ids': ['Must be a list of integers.']}, 400
+        if len(data['ids']) > max_ids:
+            return {'message': f'At most {max_ids} ids per request'}, 413
+    else:
+        criteria = data['filter']
+        if not isinstance(criteria, dict) or not criteria or set(criteria) - {'role', 'email_domain'}:
+            return {'filter': ['Supported keys: role, email_domain.']}, 400
+        if 'role' in criteria:
+            errors = UserSchema(only=('role',), partial=True).validate({'role': criteria['role']})
+            if errors:
+                return {'filter': errors}, 400
+        if 'email_domain' in criteria and (not isinstance(criteria['email_domain'], str) or not criteria['email_domain']):
+            return {'filter': {'email_domain': ['Must be a non-empty string.']}}, 400
+    if updating:
+        values = data.get('set')
+        if not isinstance(values, dict) or not values or set(values) - {'name', 'role'}:
+            return {'set': ['Supported fields: name, role.']}, 400
+        errors = UserSchema(only=('name', 'role'), partial=True).validate(values)
+        if errors:
+            return {'set': errors}, 400
+    return None
+
+def batch_statements(data, statement, chunk_size):
+    """
+    Gera o UPDATE/DELETE `statement` restrito aos usuários selecionados por
+    lista de ids ({"ids": [...]}, um comando por bloco de `chunk_size`) ou por
+    filtro ({"filter": {"role": ..., "email_domain": ...}}), com RETURNING
+    dos ids afetados.
+    """
+    statement = statement.returning(User.id)
+    if 'ids' in data:
+        ids = list(dict.fromkeys(data['ids']))
+        for start in range(0, len(ids), chunk_size):
+            yield statement.where(User.id.in_(ids[start:start + chunk_size]))
+        return
+
+    criteria = data['filter']
+    if 'role' in criteria:
+        statement = statement.where(User.role == criteria['role'])
+    if 'email_domain' in criteria:
+        statement = statement.where(User.email.endswith('@' + criteria['email_domain']))
+    yield statement
+
+def split_batch_ids(data, affected):
+    """
+    Separa os ids afetados (vindos do RETURNING, então exatamente o que foi
+    alterado nesta transação) dos ids pedidos que não existem.
+
+    Returns:
+        tuple: (ids afetados, ids não encontrados)
+    """
+    if 'ids' in data:
+        ids = list(dict.fromkeys(data['ids']))
+        return [user_id for user_id in ids if user_id in affected], [user_id for user_id in ids if user_id not in affected]
+    return sorted(affected), []
+
+def finish_batch(ids, revoke):
+    """
+    Depois do commit: limpa o cache dos usuários afetados e, se `revoke`,
+    revoga os tokens deles.
+    """
+    for user_id in ids:
+        user_cache.invalidate(user_id)
+        if revoke:
+            token_blocklist.revoke_user(user_id)
+
+def batch_summary(status, ids, missing):
+    """
+    Corpo da resposta de uma operação em lote ('updated' ou 'deleted').
+    """
+    results = [{'id': user_id, 'status': status} for user_id in ids]
+    results += [{'id': user_id, 'status': 'not_found'} for user_id in missing]
+    return {status: len(ids), 'not_found': len(missing), 'results': results}
+
+def run_batch(data, statement):
+    """
+    Executa o lote na transação atual e retorna (ids afetados, ids não
+    encontrados), ou a resposta 413, já com a transação desfeita, se o filtro
+    afetou mais de BATCH_MAX_IDS usuários.
+    """
+    affected = set()
+    options = {'synchronize_session': False}
+    for chunk in batch_statements(data, statement, current_app.config['BATCH_CHUNK_SIZE']):
+        affected.update(db.session.scalars(chunk, execution_options=options))
+    if len(affected) > current_app.config['BATCH_MAX_IDS']:
+        db.session.rollback()
+        return None, (jsonify({'message': f"Filter matches more than {current_app.config['BATCH_MAX_IDS']} users"}), 413)
+    return split_batch_ids(data, affected), None
+
+@user_bp.route('/users', methods=['PATCH'])
+@jwt_required()
+def update_users():
+    identity = get_jwt_identity()
+    if identity['role'] != 'ADMIN':
+        return jsonify({'message': 'Unauthorized'}), 403
+
+    data = request.get_json(silent=True)
+    error = batch_request_errors(data, current_app.config['BATCH_MAX_IDS'], updating=True)
+    if error:
+        return jsonify(error[0]), error[1]
+
+    values = data['set']
+    result, error = run_batch(data, update(User).values(**values))
+    if error:
+        return error
+    db.session.commit()
+    ids, missing = result
+
+    # O papel vai dentro do token; tokens antigos não podem manter o papel anterior
+    finish_batch(ids, revoke='role' in values)
+    return jsonify(batch_summary('updated', ids, missing)), 200
+
+@user_bp.route('/users', methods=['DELETE'])
+@jwt_required()
+def delete_users():
+    identity = get_jwt_identity()
+    if identity['role'] != 'ADMIN':
+        return jsonify({'message': 'Unauthorized'}), 403
+
+    data = request.get_json(silent=True)
+    error = batch_request_errors(data, current_app.config['BATCH_MAX_IDS'])
+    if error:
+        return jsonify(error[0]), error[1]
+
+    result, error = run_batch(data, delete(User))
+    if error:
+        return error
+    db.session.commit()
+    ids, missing = result
+
+    finish_batch(ids, revoke=True)
+    return jsonify(batch_summary('deleted', ids, missing)), 200
@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, fields, validate, missing
 
 class UserSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -7,4 +7,57 @@ class UserSchema(Schema):
     password = fields.Str(required=True, load_only=True)
     role = fields.Str(validate=validate.OneOf(['ADMIN', 'CLIENT']))
 
-users_schema = UserSchema(many=True)
\ No newline at end of file
+users_schema = UserSchema(many=True)
+
+# Conversões equivalentes ao _serialize de cada tipo de campo suportado
+_FAST_CONVERTERS = {
+    fields.String: 'str',
+    fields.Email: 'str',
+    fields.Integer: 'int',
+}
+
+def compile_dump(schema):
+    """
+    Gera uma função especializada que faz o mesmo que `schema.dump(obj)` (ou
+    `schema.dump(objs)`, com `many=True`), lendo os atributos diretamente em
+    vez de percorrer os campos a cada chamada.
+
+    Só campos simples (Str, Email, Int) sem `dump_default` são suportados; para
+    qualquer outro schema (Nested, DateTime...) é devolvido o próprio
+    `schema.dump`. Objetos sem algum dos atributos (inclusive None) também
+    passam pelo `schema.dump`, que omite os campos ausentes.
+    """
+    lines, items = [], []
+    for position, (name, field) in enumerate(schema.dump_fields.items()):
+        converter = _FAST_CONVERTERS.get(type(field))
+        if converter is None or field.dump_default is not missing \
+                or getattr(field, 'as_string', False):
+            return schema.dump
+        lines.append(f'    v{position} = obj.{field.attribute or name}')
+        items.append(f'{field.data_key or name!r}: None if v{position} is None else {converter}(v{position})')
+
+    if schema.many:
+        # Um objeto sem algum atributo faz a lista inteira passar pelo schema.dump
+        source = (
+            'def dump_one(obj):\n' + '\n'.join(lines)
+            + '\n    return {' + ', '.join(items) + '}\n'
+            + 'def dump(objs):\n    try:\n        return [dump_one(obj) for obj in objs]'
+            + '\n    except AttributeError:\n        return schema_dump(objs)\n'
+        )
+    else:
+        source = (
+            'def dump(obj):\n    try:\n' + '\n'.join('    ' + line for line in lines)
+            + '\n    except AttributeError:\n        return schema_dump(obj)'
+            + '\n    return {' + ', '.join(items) + '}\n'
+        )
+    namespace = {'schema_dump': schema.dump}
+    exec(compile(source, f'<compiled dump of {type(schema).__name__}>', 'exec'), namespace)
+    return namespace['dump']
+
+dump_user = compile_dump(UserSchema())
+
+def dump_users(users):
+    """
+    Equivalente rápido de `users_schema.dump(users)`.
+    """
+    return [dump_user(user) for user in users]
@@ -0,0 +1,70 @@
+import sqlalchemy as sa
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Nome do bind (SQLALCHEMY_BINDS) usado para as consultas somente leitura
+READ_BIND_KEY = 'read'
+
+
+class RoutingSession(Session):
+    """
+    Sessão que envia as consultas somente leitura ao engine de leitura e as
+    escritas (flush, INSERT/UPDATE/DELETE) ao engine de escrita padrão.
+
+    Depois da primeira escrita, a sessão continua no engine de escrita até ser
+    fechada (ao fim da requisição): as leituras seguintes, inclusive as
+    recargas dos objetos expirados pelo commit, veem as próprias alterações
+    mesmo que o engine de leitura seja uma réplica atrasada. Rotas que leem
+    para depois escrever chamam `db.session().use_writer()` antes da leitura,
+    para que a escrita parta do estado atual do banco, na mesma transação.
+    """
+
+    def use_writer(self):
+        """
+        Envia todas as consultas seguintes da sessão ao engine de escrita.
+        """
+        self.info['use_writer'] = True
+
+    def close(self):
+        # Ao fim da requisição, a próxima sessão volta a ler do engine de leitura
+        self.info.pop('use_writer', None)
+        super().close()
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is not None:
+            return bind
+
+        read_engine = self._db.engines.get(READ_BIND_KEY)
+        if self._flushing or isinstance(clause, sa.UpdateBase):
+            self.info['use_writer'] = True
+        if read_engine is None or self.info.get('use_writer'):
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        return read_engine
+
+
+def apply_sqlite_pragmas(engine, pragmas, read_only=False):
+    """
+    Executa os PRAGMAs informados em cada nova conexão SQLite do engine.
+    Conexões do engine de leitura também recebem `query_only`.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        if read_only:
+            cursor.execute('PRAGMA query_only=ON')
+        cursor.close()
+
+
+def init_engines(app, db):
+    """
+    Aplica SQLITE_PRAGMAS aos engines de escrita e de leitura da aplicação.
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS', {})
+    with app.app_context():
+        for key, engine in db.engines.items():
+            apply_sqlite_pragmas(engine, pragmas, read_only=key == READ_BIND_KEY)
@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Limites (em segundos) dos buckets dos histogramas de tempo
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = ['{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in pairs]
+    return '{' + ','.join(escaped) + '}'
+
+
+class Histogram:
+    """
+    Histograma cumulativo no formato do Prometheus, com rótulos.
+    """
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # valores dos rótulos -> [contagens por bucket, soma, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    labels = _format_labels(self.label_names, label_values, ('le', bound))
+                    lines.append(f'{self.name}_bucket{labels} {bucket_count}')
+                labels = _format_labels(self.label_names, label_values, ('le', '+Inf'))
+                lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f'{self.name}_sum{labels} {total}')
+                lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Metrics:
+    """
+    Instrumentação por requisição: tempo total, tempo por fase (banco, hashing,
+    JWT e serialização) e número de consultas SQL, expostos em /metrics no
+    formato texto do Prometheus.
+
+    As fases são medidas com `metrics.phase('<nome>')`; as consultas SQL são
+    contadas pelos eventos de cursor do SQLAlchemy.
+    """
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'Duração total das requisições.',
+            ('method', 'endpoint', 'blueprint', 'status'),
+        )
+        self.phase_duration = Histogram(
+            'http_request_phase_seconds', 'Tempo gasto em cada fase da requisição.',
+            ('phase', 'endpoint'),
+        )
+        self.query_count = Histogram(
+            'http_request_db_queries', 'Consultas SQL executadas por requisição.',
+            ('endpoint',), QUERY_COUNT_BUCKETS,
+        )
+        self.slow_request_threshold = 0.5
+        self._listening = False
+
+    def init_app(self, app):
+        """
+        Registra os hooks de requisição, os eventos do SQLAlchemy e a rota /metrics.
+        """
+        self.slow_request_threshold = app.config.get('SLOW_REQUEST_THRESHOLD_MS', 500) / 1000
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self._metrics_view)
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._listening = True
+        app.extensions['metrics'] = self
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Soma o tempo do bloco à fase `name` da requisição atual.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase_time(name, time.perf_counter() - start)
+
+    def add_phase_time(self, name, seconds):
+        if has_request_context() and hasattr(g, '_metrics_phases'):
+            g._metrics_phases[name] = g._metrics_phases.get(name, 0.0) + seconds
+
+    def _before_request(self):
+        g._metrics_start = time.perf_counter()
+        g._metrics_phases = {}
+        g._metrics_queries = 0
+
+    def _after_request(self, response):
+        start = getattr(g, '_metrics_start', None)
+        if start is None:
+            return response
+        duration = time.perf_counter() - start
+        endpoint = request.endpoint or 'not_found'
+        blueprint = request.blueprint or ''
+
+        self.request_duration.observe(duration, request.method, endpoint, blueprint, response.status_code)
+        for name, seconds in g._metrics_phases.items():
+            self.phase_duration.observe(seconds, name, endpoint)
+        self.query_count.observe(g._metrics_queries, endpoint)
+
+        if duration >= self.slow_request_threshold:
+            phases = ' '.join(f'{name}={seconds * 1000:.1f}ms' for name, seconds in g._metrics_phases.items())
+            logger.warning(
+                'Slow request: %s %s route=%s blueprint=%s status=%s duration=%.1fms queries=%d %s',
+                request.method, request.path, endpoint, blueprint or '-',
+                response.status_code, duration * 1000, g._metrics_queries, phases,
+            )
+        return response
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['_metrics_query_start'] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop('_metrics_query_start', None)
+        if start is not None and has_request_context() and hasattr(g, '_metrics_queries'):
+            g._metrics_queries += 1
+            self.add_phase_time('db', time.perf_counter() - start)
+
+    def render(self, extensions=None):
+        """
+        Gera o texto do /metrics. Extensões com `stats()` (caches) viram gauges.
+        """
+        lines = []
+        for histogram in (self.request_duration, self.phase_duration, self.query_count):
+            lines.extend(histogram.render())
+        for name, extension in sorted((extensions or {}).items()):
+            stats = getattr(extension, 'stats', None)
+            if not callable(stats):
+                continue
+            for key, value in stats().items():
+                metric = f"{name.replace('-', '_')}_{key}"
+                lines.append(f'# TYPE {metric} gauge')
+                lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def _metrics_view(self):
+        return Response(self.render(current_app.extensions), mimetype='text/plain; version=0.0.4')
+
+
+# Instância compartilhada, configurada em app.py via init_app
+metrics = Metrics()
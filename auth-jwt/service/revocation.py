@@ -0,0 +1,154 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom simples sobre um bytearray.
+
+    Responde "com certeza não está" ou "talvez esteja"; a resposta negativa,
+    que é a de quase todas as requisições, custa apenas alguns acessos a bits.
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # Dupla dispersão (Kirsch-Mitzenmacher) a partir de um único digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        for position in self._positions(key):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class TokenBlocklist:
+    """
+    Lista de tokens revogados mantida em memória, consultada pelo
+    token_in_blocklist_loader do JWTManager sem acessar o banco.
+
+    Guarda duas chaves possíveis:
+    - `jti:<jti>`: revoga um token específico;
+    - `user:<id>`: revoga todos os tokens do usuário emitidos até o momento
+      da revogação (exclusão do usuário ou troca de senha).
+
+    O `iat` do JWT é truncado para o segundo, o que não distingue um token
+    emitido logo antes da revogação de um emitido logo depois (por exemplo, o
+    login após a troca de senha). Por isso os tokens levam também o claim
+    `iat_ms` (ver `issued_at_claims`), comparado com o momento exato da
+    revogação; tokens sem ele usam o `iat`, revogando na dúvida.
+
+    Cada entrada expira depois do tempo de vida dos tokens, quando nenhum token
+    afetado pode mais ser aceito. O filtro de Bloom é reconstruído ao remover as
+    entradas expiradas.
+    """
+
+    def __init__(self, ttl=timedelta(hours=1), capacity=100000, error_rate=0.001, prune_interval=60):
+        self.ttl = ttl.total_seconds() if isinstance(ttl, timedelta) else ttl
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.prune_interval = prune_interval
+        self._entries = {}  # chave -> (momento da revogação, expira em)
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._next_prune = time.time() + prune_interval
+
+    def init_app(self, app):
+        """
+        Usa JWT_ACCESS_TOKEN_EXPIRES como tempo de vida das revogações.
+        """
+        self.ttl = app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds()
+        self.capacity = app.config.get('TOKEN_BLOCKLIST_CAPACITY', self.capacity)
+        with self._lock:
+            self._entries.clear()
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+        app.extensions['token_blocklist'] = self
+
+    def _add(self, key, expires_at):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (now, expires_at)
+            self._bloom.add(key)
+
+    def revoke_token(self, jti, expires_at=None):
+        """
+        Revoga um único token pelo seu jti. `expires_at` é o `exp` do token.
+        """
+        self._add(f'jti:{jti}', expires_at or time.time() + self.ttl)
+
+    def revoke_user(self, user_id):
+        """
+        Revoga todos os tokens do usuário emitidos até agora.
+        """
+        self._add(f'user:{user_id}', time.time() + self.ttl)
+
+    def _is_listed(self, key, issued_at, resolution=1):
+        if key not in self._bloom:
+            return False
+        entry = self._entries.get(key)
+        if entry is None:
+            return False  # Falso positivo do filtro de Bloom
+        revoked_at, expires_at = entry
+        # `issued_at` é truncado para a resolução (1 = segundos, 1000 = ms):
+        # um token do mesmo instante da revogação continua revogado
+        return expires_at > time.time() and issued_at < math.ceil(revoked_at * resolution)
+
+    def is_revoked(self, jwt_payload):
+        """
+        Retorna True se o token (payload já decodificado) foi revogado.
+        """
+        if time.time() >= self._next_prune:
+            self.prune()
+
+        if self._is_listed(f"jti:{jwt_payload['jti']}", 0):
+            return True
+
+        identity = jwt_payload.get('sub')
+        user_id = identity.get('id') if isinstance(identity, dict) else identity
+        if 'iat_ms' in jwt_payload:
+            return self._is_listed(f'user:{user_id}', jwt_payload['iat_ms'], resolution=1000)
+        return self._is_listed(f'user:{user_id}', jwt_payload.get('iat', 0))
+
+    def prune(self):
+        """
+        Remove as entradas expiradas e reconstrói o filtro de Bloom.
+        """
+        now = time.time()
+        with self._lock:
+            self._next_prune = now + self.prune_interval
+            self._entries = {
+                key: entry for key, entry in self._entries.items() if entry[1] > now
+            }
+            bloom = BloomFilter(self.capacity, self.error_rate)
+            for key in self._entries:
+                bloom.add(key)
+            self._bloom = bloom
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def issued_at_claims(identity):
+    """
+    Claims adicionais de cada token (additional_claims_loader do JWTManager):
+    o momento de emissão em milissegundos, usado por TokenBlocklist.is_revoked.
+    """
+    return {'iat_ms': int(time.time() * 1000)}
+
+
+# Instância compartilhada, configurada em app.py via init_app
+token_blocklist = TokenBlocklist()
@@ -1,11 +1,26 @@
-from werkzeug.security import generate_password_hash, check_password_hash
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+from service.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Método padrão do generate_password_hash do werkzeug (scrypt), com os
+# parâmetros explícitos
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
 
 # Função para gerar o hash da senha
-def hash_password(password: str) -> str:
+def hash_password(password: str, method: str = DEFAULT_HASH_METHOD) -> str:
     """
-    Recebe uma senha e retorna o seu hash.
+    Recebe uma senha e retorna o seu hash, usando o método do werkzeug
+    informado (ex.: 'scrypt:32768:8:1' ou 'pbkdf2:sha256:600000').
     """
-    return generate_password_hash(password)
+    return generate_password_hash(password, method=method)
 
 # Função para verificar se a senha fornecida corresponde ao hash armazenado
 def check_password(stored_password: str, provided_password: str) -> bool:
@@ -14,3 +29,278 @@ def check_password(stored_password: str, provided_password: str) -> bool:
     Retorna True se as senhas corresponderem, caso contrário, False.
     """
     return check_password_hash(stored_password, provided_password)
+
+def normalize_hash_method(method: str) -> str:
+    """
+    Completa os parâmetros omitidos do método, como o werkzeug faz ao gravar o
+    hash (ex.: 'pbkdf2' vira 'pbkdf2:sha256:1000000').
+    """
+    name, *args = method.split(':')
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = args[1] if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    if name == 'scrypt' and not args:
+        return DEFAULT_HASH_METHOD
+    return method
+
+def needs_rehash(stored_password: str, method: str = DEFAULT_HASH_METHOD) -> bool:
+    """
+    Retorna True se o hash armazenado usa o mesmo algoritmo de `method` (pbkdf2
+    ou scrypt), mas com parâmetros diferentes. Hashes de outro algoritmo não
+    são convertidos: trocar de algoritmo é uma migração, não um ajuste de custo.
+    """
+    stored_method = stored_password.split('$', 1)[0]
+    method = normalize_hash_method(method)
+    return stored_method.split(':', 1)[0] == method.split(':', 1)[0] and stored_method != method
+
+def calibrate_hash_method(target_seconds: float, algorithm: str = 'scrypt',
+                          min_iterations: int = 600000) -> tuple:
+    """
+    Mede o custo do hashing nesta máquina e escolhe os parâmetros que mais se
+    aproximam de `target_seconds` por hash.
+
+    Para PBKDF2 o número de iterações é estimado a partir de uma medição e
+    nunca fica abaixo de `min_iterations`. Para scrypt o custo `n` parte do
+    padrão do werkzeug (32768) e é dobrado até atingir o alvo.
+
+    Returns:
+        tuple: (método no formato do werkzeug, segundos medidos por hash)
+    """
+    def measure(method, rounds=3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            generate_password_hash('calibracao', method=method)
+        return (time.perf_counter() - start) / rounds
+
+    if algorithm == 'pbkdf2':
+        sample = 100000
+        per_iteration = measure(f'pbkdf2:sha256:{sample}') / sample
+        iterations = max(min_iterations, int(target_seconds / per_iteration) // 10000 * 10000)
+        method = f'pbkdf2:sha256:{iterations}'
+    elif algorithm == 'scrypt':
+        n = 2 ** 15
+        while measure(f'scrypt:{n}:8:1', rounds=1) < target_seconds and n < 2 ** 20:
+            n *= 2
+        method = f'scrypt:{n}:8:1'
+    else:
+        raise ValueError(f'Unsupported algorithm: {algorithm}')
+    return method, measure(method)
+
+
+class HashingUnavailableError(Exception):
+    """
+    Erro base para quando o executor de hashing não consegue atender a chamada.
+    As rotas devem responder com 503 (Service Unavailable).
+    """
+
+
+class HashingOverloadedError(HashingUnavailableError):
+    """
+    A fila do executor está cheia e a chamada foi descartada imediatamente.
+    """
+
+
+class HashingTimeoutError(HashingUnavailableError):
+    """
+    A chamada não terminou dentro do tempo limite configurado.
+    """
+
+
+class HashingExecutor:
+    """
+    Executa o hashing de senhas em um pool de processos limitado, fora da
+    thread da requisição.
+
+    O número de chamadas em andamento (executando + aguardando na fila) é
+    limitado a `max_workers + max_queue`. Quando esse limite é atingido a
+    chamada falha na hora com HashingOverloadedError, em vez de ocupar mais
+    uma thread do servidor esperando.
+    """
+
+    def __init__(self, max_workers=None, max_queue=None, timeout=None, method=None):
+        self._pool = None
+        self._writer = None
+        self._lock = threading.Lock()
+        self._configure(max_workers, max_queue, timeout, method)
+
+    def _configure(self, max_workers, max_queue, timeout, method=None):
+        self.method = method or DEFAULT_HASH_METHOD
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue if max_queue is not None else self.max_workers * 4
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+
+    def init_app(self, app):
+        """
+        Lê a configuração do Flask (HASHING_* e PASSWORD_HASH_METHOD) e registra o executor na aplicação.
+        """
+        self.shutdown()
+        self._configure(
+            app.config.get('HASHING_MAX_WORKERS'),
+            app.config.get('HASHING_MAX_QUEUE'),
+            app.config.get('HASHING_TIMEOUT'),
+            app.config.get('PASSWORD_HASH_METHOD'),
+        )
+        app.extensions['hashing_executor'] = self
+
+    def _get_pool(self):
+        # O pool é criado sob demanda para não iniciar processos na importação.
+        # Os processos são iniciados com "spawn": um fork no meio de uma
+        # requisição herdaria os sockets abertos do servidor (e o cliente não
+        # receberia o fim da resposta) e os locks das outras threads.
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+                    )
+        return self._pool
+
+    def _release(self, _future):
+        self._slots.release()
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingOverloadedError('Hashing queue is full')
+
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # A vaga só é liberada quando o processo termina, mesmo após um timeout
+        future.add_done_callback(self._release)
+        return future
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HashingTimeoutError('Hashing timed out')
+
+    def submit(self, fn, *args):
+        """
+        Envia `fn(*args)` ao pool e aguarda o resultado.
+
+        Raises:
+            HashingOverloadedError: se a fila estiver cheia.
+            HashingTimeoutError: se o resultado não chegar dentro de `timeout`.
+        """
+        with metrics.phase('hashing'):
+            return self._result(self._submit(fn, *args))
+
+    def hash_password(self, password: str) -> str:
+        """
+        Versão de hash_password executada no pool de processos.
+        """
+        return self.submit(hash_password, password, self.method)
+
+    def check_password(self, stored_password: str, provided_password: str) -> bool:
+        """
+        Versão de check_password executada no pool de processos.
+        """
+        return self.submit(check_password, stored_password, provided_password)
+
+    def hash_passwords(self, passwords: list) -> list:
+        """
+        Gera os hashes de várias senhas em paralelo, em lotes do tamanho do pool,
+        para não ocupar sozinho a fila usada pelas demais requisições.
+        """
+        hashes = []
+        with metrics.phase('hashing'):
+            for start in range(0, len(passwords), self.max_workers):
+                futures = [self._submit(hash_password, password, self.method)
+                           for password in passwords[start:start + self.max_workers]]
+                hashes.extend(self._result(future) for future in futures)
+        return hashes
+
+    async def submit_async(self, fn, *args):
+        """
+        Versão assíncrona de `submit`, para o modo ASGI: aguarda o resultado sem
+        bloquear o event loop.
+        """
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise HashingTimeoutError('Hashing timed out')
+
+    async def hash_passwords_async(self, passwords: list) -> list:
+        """
+        Versão assíncrona de `hash_passwords`.
+        """
+        hashes = []
+        for start in range(0, len(passwords), self.max_workers):
+            hashes.extend(await asyncio.gather(*(
+                self.submit_async(hash_password, password, self.method)
+                for password in passwords[start:start + self.max_workers]
+            )))
+        return hashes
+
+    async def hash_password_async(self, password: str) -> str:
+        return await self.submit_async(hash_password, password, self.method)
+
+    async def check_password_async(self, stored_password: str, provided_password: str) -> bool:
+        return await self.submit_async(check_password, stored_password, provided_password)
+
+    def needs_rehash(self, stored_password: str) -> bool:
+        """
+        Retorna True se o hash armazenado usa o algoritmo configurado com outros parâmetros.
+        """
+        return needs_rehash(stored_password, self.method)
+
+    def rehash_async(self, password: str, on_done):
+        """
+        Gera um novo hash com o método configurado sem bloquear a requisição e
+        chama `on_done(novo_hash)` em uma thread separada quando terminar.
+
+        Se a fila estiver cheia o rehash é simplesmente ignorado; ele será
+        tentado de novo no próximo login.
+        """
+        try:
+            future = self._submit(hash_password, password, self.method)
+        except HashingOverloadedError:
+            return None
+
+        def finished(done):
+            if done.cancelled() or done.exception() is not None:
+                logger.warning('Password rehash failed: %s', done.exception() if not done.cancelled() else 'cancelled')
+                return
+            self._get_writer().submit(self._run_callback, on_done, done.result())
+
+        future.add_done_callback(finished)
+        return future
+
+    @staticmethod
+    def _run_callback(on_done, new_hash):
+        try:
+            on_done(new_hash)
+        except Exception:
+            logger.exception('Could not store rehashed password')
+
+    def _get_writer(self):
+        # Thread única para gravar os rehashes, fora das threads do pool
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rehash')
+        return self._writer
+
+    def shutdown(self, wait=True):
+        """
+        Encerra o pool de processos, se ele tiver sido criado.
+        """
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+            if self._writer is not None:
+                self._writer.shutdown(wait=wait)
+                self._writer = None
+
+
+# Instância compartilhada pelas rotas, configurada em app.py via init_app
+hashing_executor = HashingExecutor()
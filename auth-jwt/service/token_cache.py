@@ -0,0 +1,118 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask_jwt_extended import JWTManager
+from service.metrics import metrics
+
+
+class TokenDecodeCache:
+    """
+    Cache LRU de claims já verificados, indexado pelo digest SHA-256 do token.
+
+    Uma entrada nunca é servida depois do `exp` do token. Os contadores
+    permitem estimar o tempo de verificação economizado: cada acerto poupa,
+    em média, o tempo gasto por uma verificação real (`avg_verify_ms`).
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.verifications = 0
+        self.verify_seconds = 0.0
+
+    @staticmethod
+    def key(encoded_token):
+        return hashlib.sha256(encoded_token.encode()).digest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                claims, expires_at = entry
+                if expires_at is not None and expires_at <= time.time():
+                    del self._data[key]
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return dict(claims)
+            self.misses += 1
+            return None
+
+    def set(self, key, claims):
+        with self._lock:
+            self._data[key] = (dict(claims), claims.get('exp'))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def record_verification(self, seconds):
+        self.verifications += 1
+        self.verify_seconds += seconds
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Retorna os contadores do cache e o tempo de verificação economizado.
+        """
+        avg_verify = self.verify_seconds / self.verifications if self.verifications else 0.0
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'avg_verify_ms': round(avg_verify * 1000, 4),
+            'saved_verify_ms': round(avg_verify * self.hits * 1000, 2),
+        }
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager que reaproveita os claims de tokens já verificados quando
+    JWT_DECODE_CACHE_ENABLED está ligado.
+
+    Apenas a decodificação é cacheada; os callbacks que rodam depois dela
+    (como o token_in_blocklist_loader) continuam sendo chamados a cada
+    requisição.
+    """
+
+    def __init__(self, app=None, add_context_processor=False):
+        self.decode_cache = None
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor=False):
+        super().init_app(app, add_context_processor)
+        if app.config.get('JWT_DECODE_CACHE_ENABLED', False):
+            self.decode_cache = TokenDecodeCache(app.config.get('JWT_DECODE_CACHE_SIZE', 10000))
+            app.extensions['jwt_decode_cache'] = self.decode_cache
+        else:
+            self.decode_cache = None
+
+    def _encode_jwt_from_config(self, *args, **kwargs):
+        with metrics.phase('jwt'):
+            return super()._encode_jwt_from_config(*args, **kwargs)
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        with metrics.phase('jwt'):
+            return self._decode_with_cache(encoded_token, csrf_value, allow_expired)
+
+    def _decode_with_cache(self, encoded_token, csrf_value, allow_expired):
+        # Tokens com CSRF ou aceitando expirados seguem sempre o caminho completo
+        if self.decode_cache is None or csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = self.decode_cache.key(encoded_token)
+        claims = self.decode_cache.get(key)
+        if claims is not None:
+            return claims
+
+        start = time.perf_counter()
+        claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        self.decode_cache.record_verification(time.perf_counter() - start)
+        self.decode_cache.set(key, claims)
+        return claims
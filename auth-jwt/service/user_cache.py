@@ -0,0 +1,163 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryBackend:
+    """
+    Armazena os registros no próprio processo, com descarte LRU e expiração por TTL.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            record, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return record
+
+    def set(self, key, record, ttl):
+        with self._lock:
+            self._data[key] = (record, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """
+    Armazena os registros em um arquivo SQLite local, compartilhado entre os
+    workers da mesma máquina. Faz o papel de um cache externo (ex.: Redis) sem
+    exigir nenhum serviço adicional.
+    """
+
+    def __init__(self, path, max_size=10000):
+        self.path = path
+        self.max_size = max_size
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS user_cache ('
+                'key INTEGER PRIMARY KEY, record TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    def _connection(self):
+        # Uma conexão por thread; o SQLite não permite compartilhá-las
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT record FROM user_cache WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, record, ttl):
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO user_cache (key, record, expires_at) VALUES (?, ?, ?)',
+            (key, json.dumps(record), time.time() + ttl),
+        )
+        # Remove expirados e, se ainda passar do limite, os que expiram primeiro
+        conn.execute('DELETE FROM user_cache WHERE expires_at <= ?', (time.time(),))
+        conn.execute(
+            'DELETE FROM user_cache WHERE key IN ('
+            'SELECT key FROM user_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_size,),
+        )
+
+    def delete(self, key):
+        self._connection().execute('DELETE FROM user_cache WHERE key = ?', (key,))
+
+    def clear(self):
+        self._connection().execute('DELETE FROM user_cache')
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM user_cache').fetchone()[0]
+
+
+class UserCache:
+    """
+    Cache de registros de usuário por id, usado pelas rotas protegidas por JWT
+    para evitar uma consulta ao banco a cada requisição.
+
+    Os registros são dicionários simples com as colunas de User. As rotas que
+    alteram usuários devem chamar `invalidate` depois do commit.
+    """
+
+    def __init__(self, backend=None, ttl=60):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        """
+        Cria o backend a partir da configuração do Flask (USER_CACHE_*).
+        """
+        max_size = app.config.get('USER_CACHE_MAX_SIZE', 10000)
+        if app.config.get('USER_CACHE_BACKEND', 'memory') == 'sqlite':
+            path = app.config.get('USER_CACHE_PATH') or os.path.join(app.instance_path, 'user_cache.db')
+            self.backend = SQLiteBackend(path, max_size=max_size)
+        else:
+            self.backend = MemoryBackend(max_size=max_size)
+        self.ttl = app.config.get('USER_CACHE_TTL', 60)
+        self.hits = self.misses = 0
+        app.extensions['user_cache'] = self
+
+    def get(self, user_id):
+        """
+        Retorna o registro em cache ou None, contabilizando acertos e falhas.
+        """
+        record = self.backend.get(user_id)
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def set(self, user_id, record):
+        self.backend.set(user_id, record, self.ttl)
+
+    def invalidate(self, user_id):
+        self.backend.delete(user_id)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """
+        Retorna os contadores do cache.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.backend)}
+
+
+# Instância compartilhada pelas rotas, configurada em app.py via init_app
+user_cache = UserCache()
@@ -0,0 +1,114 @@
+import sqlite3
+
+# Índices da listagem paginada e filtrada (JogoDao.listar_pagina): nome e colunas.
+# São os mesmos declarados no CREATE TABLE do MySQL em prepara_banco.py.
+INDICES_JOGO = (
+    ('idx_jogo_categoria', 'categoria, id'),
+    ('idx_jogo_console', 'console, id'),
+    ('idx_jogo_categoria_console', 'categoria, console, id'),
+)
+
+# Esquema equivalente ao criado pelo prepara_banco.py no MySQL
+SQL_CRIA_TABELAS_SQLITE = (
+    '''
+    CREATE TABLE IF NOT EXISTS jogo (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome VARCHAR(50) NOT NULL,
+        categoria VARCHAR(40) NOT NULL,
+        console VARCHAR(20) NOT NULL
+    )
+    ''',
+    *(f'CREATE INDEX IF NOT EXISTS {nome} ON jogo ({colunas})' for nome, colunas in INDICES_JOGO),
+    '''
+    CREATE TABLE IF NOT EXISTS usuario (
+        id VARCHAR(8) NOT NULL PRIMARY KEY,
+        nome VARCHAR(20) NOT NULL,
+        senha VARCHAR(8) NOT NULL
+    )
+    ''',
+)
+
+
+class CursorSQLite:
+    def __init__(self, cursor):
+        """
+        Cursor do sqlite3 que aceita as consultas com parâmetros no estilo %s
+        do MySQLdb, para que os SQL_* do dao.py funcionem sem alteração.
+
+        Args:
+            cursor: Cursor do sqlite3.
+        """
+        self.__cursor = cursor
+        self.__primeiro_id = None
+
+    def execute(self, sql, parametros=()):
+        self.__cursor.execute(sql.replace('%s', '?'), parametros)
+        # Como no MySQLdb, o lastrowid de um INSERT de várias linhas é o ID
+        # da primeira (o sqlite3 devolve o da última)
+        self.__primeiro_id = None
+        if self.__cursor.rowcount > 1 and sql.lstrip()[:6].upper() == 'INSERT':
+            self.__primeiro_id = self.__cursor.lastrowid - self.__cursor.rowcount + 1
+        return self
+
+    @property
+    def lastrowid(self):
+        return self.__primeiro_id if self.__primeiro_id is not None else self.__cursor.lastrowid
+
+    def executemany(self, sql, parametros):
+        self.__cursor.executemany(sql.replace('%s', '?'), parametros)
+        return self
+
+    def __getattr__(self, nome):
+        # fetchone, fetchall, fetchmany, lastrowid, rowcount, close...
+        return getattr(self.__cursor, nome)
+
+    def __iter__(self):
+        return iter(self.__cursor)
+
+
+class ConexaoSQLite:
+    def __init__(self, caminho):
+        """
+        Conexão SQLite com a mesma interface usada da conexão do MySQLdb
+        (cursor, commit, rollback, ping e close). Serve de substituto do MySQL
+        para rodar a aplicação, os DAOs e os benchmarks sem servidor.
+
+        Args:
+            caminho (str): Arquivo do banco (ou ':memory:').
+        """
+        self.__conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.__conexao.execute('PRAGMA journal_mode=WAL')
+        self.__conexao.execute('PRAGMA synchronous=NORMAL')
+        self.__conexao.execute('PRAGMA busy_timeout=5000')
+
+    def cursor(self):
+        return CursorSQLite(self.__conexao.cursor())
+
+    def commit(self):
+        self.__conexao.commit()
+
+    def rollback(self):
+        self.__conexao.rollback()
+
+    def ping(self):
+        """
+        Equivalente ao ping() do MySQLdb: lança exceção se a conexão não responde.
+        """
+        self.__conexao.execute('SELECT 1').fetchone()
+
+    def close(self):
+        self.__conexao.close()
+
+
+def cria_tabelas(conexao):
+    """
+    Cria as tabelas jogo e usuario, caso ainda não existam.
+
+    Args:
+        conexao (ConexaoSQLite): Conexão com o banco.
+    """
+    cursor = conexao.cursor()
+    for sql in SQL_CRIA_TABELAS_SQLITE:
+        cursor.execute(sql)
+    cursor.close()
+    conexao.commit()
@@ -0,0 +1,103 @@
+"""
+Benchmark da busca (/busca): índice invertido em memória (busca.py) vs.
+LIKE '%termo%' no banco, sobre um catálogo sintético.
+
+Mostra o tempo de construção do índice e a latência das consultas (termo
+exato, prefixo, com erro de digitação, sem acento e com vários termos).
+
+Uso:
+    python benchmarks/bench_busca.py --jogos 200000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banco_sqlite import ConexaoSQLite, cria_tabelas  # noqa: E402
+from busca import IndiceDeBusca  # noqa: E402
+from models import Jogo  # noqa: E402
+
+PALAVRAS = ['Super', 'Mario', 'Kart', 'Legends', 'Dragon', 'Quest', 'Final', 'Fantasy', 'Street', 'Fighter',
+            'Zelda', 'Metroid', 'Sonic', 'Racing', 'Soccer', 'Ninja', 'Shadow', 'Kingdom', 'Hearts', 'Tactics',
+            'Chronicles', 'Odyssey', 'Galaxy', 'Warriors', 'Battle', 'Royale', 'Space', 'Invaders', 'Crash', 'Bandicoot']
+CATEGORIAS = ['Ação', 'Aventura', 'Corrida', 'Esporte', 'Estratégia', 'Indie', 'Luta', 'RPG', 'Simulação', 'Terror']
+CONSOLES = ['PS4', 'PS5', 'Xbox One', 'Xbox Series', 'Switch', 'PC', 'SNES', '3DS']
+CONSULTAS = {
+    'exato': 'zelda',
+    'prefixo': 'drag',
+    'erro de digitação': 'fantsy',
+    'sem acento': 'estrategia',
+    'vários termos': 'mario kart snes',
+}
+# Equivalente em LIKE de cada consulta (sem tolerância a erros ou acentos)
+CONSULTAS_LIKE = {
+    'exato': ['zelda'],
+    'prefixo': ['drag'],
+    'erro de digitação': ['fantsy'],
+    'sem acento': ['estratégia'],
+    'vários termos': ['mario', 'kart', 'snes'],
+}
+
+
+def gera_jogos(quantidade, rng):
+    for id in range(1, quantidade + 1):
+        nome = ' '.join(rng.sample(PALAVRAS, rng.randint(1, 3))) + f' {rng.randint(1, 9)}'
+        yield Jogo(nome, rng.choice(CATEGORIAS), rng.choice(CONSOLES), id=id)
+
+
+def mede(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return round(statistics.median(tempos) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--jogos', type=int, default=200000, help='Tamanho do catálogo')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por consulta (mediana)')
+    parser.add_argument('--limite', type=int, default=50, help='Resultados por consulta')
+    args = parser.parse_args()
+
+    jogos = list(gera_jogos(args.jogos, random.Random(42)))
+
+    inicio = time.perf_counter()
+    indice = IndiceDeBusca()
+    indice.carregar(jogos)
+    print({'jogos': args.jogos, 'construcao_do_indice_s': round(time.perf_counter() - inicio, 2)})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conexao = ConexaoSQLite(os.path.join(tmp, 'busca.db'))
+        cria_tabelas(conexao)
+        cursor = conexao.cursor()
+        cursor.executemany('INSERT INTO jogo (id, nome, categoria, console) VALUES (%s, %s, %s, %s)',
+                           ((j.id, j.nome, j.categoria, j.console) for j in jogos))
+        conexao.commit()
+
+        def busca_like(termos):
+            filtros = ' AND '.join(['(nome LIKE %s OR categoria LIKE %s OR console LIKE %s)'] * len(termos))
+            parametros = [f'%{t}%' for t in termos for _ in range(3)]
+            cursor.execute(f'SELECT id, nome, categoria, console FROM jogo WHERE {filtros} LIMIT {args.limite}',
+                           parametros)
+            return cursor.fetchall()
+
+        for rotulo, consulta in CONSULTAS.items():
+            print({
+                'consulta': rotulo,
+                'indice_ms': mede(lambda: indice.buscar(consulta, args.limite), args.repeticoes),
+                'resultados_indice': len(indice.buscar(consulta, args.limite)),
+                'like_ms': mede(lambda: busca_like(CONSULTAS_LIKE[rotulo]), args.repeticoes),
+                'resultados_like': len(busca_like(CONSULTAS_LIKE[rotulo])),
+            })
+        conexao.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark da busca de vários jogos: JogoDao.busca_por_id uma vez por ID vs.
+JogoDao.busca_por_ids (consultas IN em lotes), com o número de consultas ao
+banco contado pelo MapaDeIdentidade. Também mede a repetição da busca na
+mesma requisição, que deve sair inteira do mapa.
+
+Uso:
+    python benchmarks/bench_busca_por_ids.py --jogos 100000 --ids 2000
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+def mede(rotulo, mapa, funcao):
+    antes = mapa.consultas
+    inicio = time.perf_counter()
+    encontrados = funcao()
+    print({
+        'modo': rotulo,
+        'encontrados': encontrados,
+        'consultas': mapa.consultas - antes,
+        'ms': round((time.perf_counter() - inicio) * 1000, 1),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--jogos', type=int, default=100000, help='Tamanho do catálogo')
+    parser.add_argument('--ids', type=int, default=2000, help='IDs buscados')
+    parser.add_argument('--lote', type=int, default=500, help='IDs por consulta IN')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from banco_sqlite import ConexaoSQLite, cria_tabelas
+        from dao import JogoDao, MapaDeIdentidade
+        from pool import PoolDeConexoes, conecta_sqlite
+        logging.getLogger('dao').setLevel(logging.WARNING)
+
+        caminho = os.path.join(tmp, 'ids.db')
+        conexao = ConexaoSQLite(caminho)
+        cria_tabelas(conexao)
+        conexao.cursor().executemany(
+            'INSERT INTO jogo (nome, categoria, console) VALUES (%s, %s, %s)',
+            ((f'Jogo {i}', 'RPG', 'PC') for i in range(args.jogos)),
+        )
+        conexao.commit()
+        conexao.close()
+
+        ids = random.Random(42).sample(range(1, args.jogos + 1), args.ids)
+        db = PoolDeConexoes(conecta_sqlite(caminho))
+
+        # Um mapa novo por modo, como em requisições separadas
+        mapa = MapaDeIdentidade()
+        jogo_dao = JogoDao(db, lambda: mapa)
+        mede('busca_por_id em laço', mapa, lambda: sum(jogo_dao.busca_por_id(id) is not None for id in ids))
+
+        mapa = MapaDeIdentidade()
+        mede(f'busca_por_ids (lote={args.lote})', mapa, lambda: len(jogo_dao.busca_por_ids(ids, args.lote)))
+        mede('busca_por_ids repetida na requisição', mapa, lambda: len(jogo_dao.busca_por_ids(ids, args.lote)))
+        db.fechar()
+
+
+if __name__ == '__main__':
+    main()
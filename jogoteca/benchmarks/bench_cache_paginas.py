@@ -0,0 +1,100 @@
+"""
+Benchmark do cache de páginas renderizadas (cache_de_paginas.py) na
+listagem (/): página sem cache vs. acerto no cache (200 com o HTML guardado)
+vs. revalidação com If-None-Match (304 Not Modified), e o custo da primeira
+requisição depois de uma escrita no catálogo.
+
+Também confere que acertos e 304 não consultam o banco (JogoDao.listar_pagina).
+
+Uso:
+    python benchmarks/bench_cache_paginas.py --jogos 100000
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+CATEGORIAS = ['Ação', 'Aventura', 'Corrida', 'Esporte', 'Estratégia', 'Indie', 'Luta', 'RPG', 'Simulação', 'Terror']
+CONSOLES = ['PS4', 'PS5', 'Xbox One', 'Xbox Series', 'Switch', 'PC', 'SNES', '3DS']
+
+
+def mede(requisicao, repeticoes, status):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resposta = requisicao()
+        tempos.append(time.perf_counter() - inicio)
+        assert resposta.status_code == status, resposta.status_code
+    return round(statistics.median(tempos) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--jogos', type=int, default=100000, help='Tamanho do catálogo')
+    parser.add_argument('--repeticoes', type=int, default=200, help='Requisições por medição (mediana)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['JOGOTECA_DB_BACKEND'] = 'sqlite'
+        os.environ['JOGOTECA_SQLITE_PATH'] = os.path.join(tmp, 'cache.db')
+        from banco_sqlite import ConexaoSQLite, cria_tabelas
+        conexao = ConexaoSQLite(os.environ['JOGOTECA_SQLITE_PATH'])
+        cria_tabelas(conexao)
+        rng = random.Random(42)
+        conexao.cursor().executemany(
+            'INSERT INTO jogo (nome, categoria, console) VALUES (%s, %s, %s)',
+            ((f'Jogo {i}', rng.choice(CATEGORIAS), rng.choice(CONSOLES)) for i in range(args.jogos)),
+        )
+        conexao.commit()
+        conexao.close()
+
+        from jogoteca import app
+        import views
+        logging.getLogger('dao').setLevel(logging.WARNING)
+
+        # Mesma view, sem o decorador do cache
+        app.add_url_rule('/_sem_cache', 'sem_cache', views.index.__wrapped__)
+
+        consultas = []
+        listar_pagina = views.jogo_dao.listar_pagina
+
+        def listar_pagina_contando(*args, **kwargs):
+            consultas.append(1)
+            return listar_pagina(*args, **kwargs)
+        views.jogo_dao.listar_pagina = listar_pagina_contando
+
+        cliente = app.test_client()
+        url = '/?categoria=RPG&console=SNES'
+        etag = cliente.get(url).headers['ETag']
+        consultas.clear()
+        resultado = {
+            'jogos': args.jogos,
+            'sem_cache_ms': mede(lambda: cliente.get('/_sem_cache?categoria=RPG&console=SNES'), args.repeticoes, 200),
+        }
+        consultas.clear()
+        resultado['acerto_200_ms'] = mede(lambda: cliente.get(url), args.repeticoes, 200)
+        resultado['revalidacao_304_ms'] = mede(
+            lambda: cliente.get(url, headers={'If-None-Match': etag}), args.repeticoes, 304)
+        resultado['consultas_ao_banco_nos_acertos'] = len(consultas)
+
+        # Renomeia o primeiro jogo da página, para o HTML (e a ETag) mudar de fato
+        primeiro = listar_pagina(0, 1, 'RPG', 'SNES')[0][0]
+
+        def escreve_e_pede():
+            primeiro.nome = f'Jogo renomeado {time.perf_counter()}'
+            views.jogo_dao.salvar(primeiro)
+            return cliente.get(url, headers={'If-None-Match': etag})
+        resultado['escrita_e_nova_renderizacao_ms'] = mede(escreve_e_pede, max(1, args.repeticoes // 10), 200)
+        resultado['cache'] = views.cache_de_paginas.estatisticas()
+        print(resultado)
+
+
+if __name__ == '__main__':
+    main()
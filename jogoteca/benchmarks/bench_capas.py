@@ -0,0 +1,101 @@
+"""
+Benchmark das capas (capas.py): tempo do POST /criar (só grava o upload e
+enfileira) vs. tempo até as variantes ficarem prontas, bytes servidos pela
+capa original vs. pelas variantes, espaço em disco quando vários jogos usam
+a mesma capa e custo de descobrir a capa de um jogo (manifesto em memória
+vs. os.path.exists, como as views faziam).
+
+Precisa do Pillow. Usa o substituto SQLite e uma pasta de uploads temporária.
+
+Uso:
+    python benchmarks/bench_capas.py --capas 20 --largura 2400 --altura 3200
+"""
+import argparse
+import io
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+def gera_jpeg(largura, altura):
+    from PIL import Image
+
+    # Ruído em vez de cor lisa, para o JPEG ter um tamanho realista
+    imagem = Image.frombytes('RGB', (largura, altura), os.urandom(largura * altura * 3))
+    conteudo = io.BytesIO()
+    imagem.save(conteudo, 'JPEG', quality=90)
+    return conteudo.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--capas', type=int, default=20, help='Capas enviadas')
+    parser.add_argument('--largura', type=int, default=2400, help='Largura da capa original')
+    parser.add_argument('--altura', type=int, default=3200, help='Altura da capa original')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['JOGOTECA_DB_BACKEND'] = 'sqlite'
+        os.environ['JOGOTECA_SQLITE_PATH'] = os.path.join(tmp, 'capas.db')
+        from jogoteca import app
+        import views
+        from capas import ArmazemDeCapas
+        logging.getLogger('dao').setLevel(logging.WARNING)
+
+        # Pasta de uploads temporária, para não sujar a do projeto
+        uploads = os.path.join(tmp, 'uploads')
+        os.makedirs(uploads)
+        armazem = views.armazem_de_capas = ArmazemDeCapas(
+            uploads, os.path.join(tmp, 'capas.jsonl'), app.config['CAPAS_VARIANTES'],
+            app.config['CAPAS_TRABALHADORES'])
+        armazem.carregar()
+        dados = gera_jpeg(args.largura, args.altura)
+
+        cliente = app.test_client()
+        with cliente.session_transaction() as sessao:
+            sessao['usuario_logado'] = 'bench'
+        requisicoes = []
+        inicio = time.perf_counter()
+        for i in range(args.capas):
+            t = time.perf_counter()
+            resposta = cliente.post('/criar', data={
+                'nome': f'Jogo {i}', 'categoria': 'RPG', 'console': 'PC', 'arquivo': (io.BytesIO(dados), 'capa.jpg'),
+            }, content_type='multipart/form-data')
+            requisicoes.append(time.perf_counter() - t)
+            assert resposta.status_code == 302, resposta.status_code
+        armazem.encerrar()
+        total = time.perf_counter() - inicio
+
+        tamanhos = {'original': len(dados)}
+        for variante in app.config['CAPAS_VARIANTES']:
+            tamanhos[variante] = os.path.getsize(os.path.join(uploads, armazem.variante(1, variante)))
+        em_disco = sum(os.path.getsize(os.path.join(uploads, nome)) for nome in os.listdir(uploads))
+        consultas = 100000
+        t = time.perf_counter()
+        for i in range(consultas):
+            armazem.capa(i % args.capas + 1, 'detalhe')
+        manifesto_us = (time.perf_counter() - t) / consultas * 1e6
+        t = time.perf_counter()
+        for i in range(consultas):
+            os.path.exists(os.path.join(uploads, f'capa{i % args.capas + 1}.jpg'))
+        exists_us = (time.perf_counter() - t) / consultas * 1e6
+        print({
+            'capas': args.capas,
+            'criar_ms_mediana': round(statistics.median(requisicoes) * 1000, 1),
+            'ate_variantes_prontas_ms_por_capa': round(total / args.capas * 1000, 1),
+            'bytes': tamanhos,
+            'bytes_em_disco': em_disco,
+            'bytes_sem_deduplicar': args.capas * sum(tamanhos.values()),
+            'consulta_manifesto_us': round(manifesto_us, 3),
+            'consulta_os_path_exists_us': round(exists_us, 3),
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark da importação e exportação do catálogo (importacao.py): exporta um
+catálogo grande em CSV e NDJSON e o importa em um banco vazio, medindo
+linhas por segundo e, com --memoria, o pico de memória (tracemalloc, que
+deixa tudo mais lento) de cada etapa.
+
+A importação é comparada com o caminho dos formulários (JogoDao.salvar, uma
+transação por jogo) em uma amostra menor.
+
+Uso:
+    python benchmarks/bench_importacao.py --jogos 1000000
+    python benchmarks/bench_importacao.py --jogos 200000 --memoria
+"""
+import argparse
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+CATEGORIAS = ['Ação', 'Aventura', 'Corrida', 'Esporte', 'Estratégia', 'Indie', 'Luta', 'RPG', 'Simulação', 'Terror']
+CONSOLES = ['PS4', 'PS5', 'Xbox One', 'Xbox Series', 'Switch', 'PC', 'SNES', '3DS']
+
+
+def novo_dao(caminho):
+    from banco_sqlite import ConexaoSQLite, cria_tabelas
+    from dao import JogoDao
+    from pool import PoolDeConexoes, conecta_sqlite
+
+    conexao = ConexaoSQLite(caminho)
+    cria_tabelas(conexao)
+    conexao.close()
+    return JogoDao(PoolDeConexoes(conecta_sqlite(caminho)))
+
+
+def mede(rotulo, linhas, funcao, memoria):
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    segundos = time.perf_counter() - inicio
+    medida = {'etapa': rotulo, 'linhas': linhas, 'segundos': round(segundos, 2), 'linhas_por_s': round(linhas / segundos)}
+    if memoria:
+        medida['pico_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        tracemalloc.stop()
+    print(medida)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--jogos', type=int, default=1000000, help='Tamanho do catálogo')
+    parser.add_argument('--lote', type=int, default=1000, help='Jogos por transação / por pedaço exportado')
+    parser.add_argument('--amostra-por-linha', type=int, default=2000,
+                        help='Jogos salvos um a um (JogoDao.salvar), para comparação')
+    parser.add_argument('--memoria', action='store_true', help='Mede o pico de memória com tracemalloc')
+    args = parser.parse_args()
+    logging.getLogger('dao').setLevel(logging.WARNING)
+    logging.getLogger('importacao').setLevel(logging.WARNING)
+
+    from importacao import exportar, importar
+    from models import Jogo
+
+    with tempfile.TemporaryDirectory() as tmp:
+        origem = novo_dao(os.path.join(tmp, 'origem.db'))
+        rng = random.Random(42)
+        jogos = [Jogo(f'Jogo {i}', rng.choice(CATEGORIAS), rng.choice(CONSOLES)) for i in range(args.jogos)]
+        for inicio in range(0, len(jogos), 50000):
+            origem.salvar_varios(jogos[inicio:inicio + 50000])
+        del jogos
+
+        arquivos = {}
+        for formato in ('csv', 'ndjson'):
+            caminho = os.path.join(tmp, f'jogos.{formato}')
+            arquivos[formato] = caminho
+
+            def exporta():
+                with open(caminho, 'w', encoding='utf-8') as destino:
+                    for pedaco in exportar(origem, formato, args.lote):
+                        destino.write(pedaco)
+            mede(f'exportar {formato}', args.jogos, exporta, args.memoria)
+
+        for formato, caminho in arquivos.items():
+            destino = novo_dao(os.path.join(tmp, f'destino-{formato}.db'))
+            with open(caminho, 'rb') as arquivo:
+                relatorio = mede(f'importar {formato}', args.jogos,
+                                 lambda: importar(destino, arquivo, formato, args.lote), args.memoria)
+            assert relatorio['inseridos'] == args.jogos and not relatorio['total_de_erros'], relatorio
+
+        # Caminho dos formulários: um JogoDao.salvar (e um commit) por jogo
+        destino = novo_dao(os.path.join(tmp, 'por-linha.db'))
+        csv_ = io.BytesIO(b'id,nome,categoria,console\n' + b''.join(
+            f',Jogo {i},RPG,PC\n'.encode() for i in range(args.amostra_por_linha)))
+        mede('salvar por linha (amostra)', args.amostra_por_linha,
+             lambda: [destino.salvar(Jogo(f'Jogo {i}', 'RPG', 'PC')) for i in range(args.amostra_por_linha)],
+             args.memoria)
+        destino = novo_dao(os.path.join(tmp, 'importar-amostra.db'))
+        mede('importar sem id (amostra)', args.amostra_por_linha, lambda: importar(destino, csv_, 'csv', args.lote),
+             args.memoria)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark da página inicial (/) conforme o catálogo cresce: listagem completa
+antiga (JogoDao.listar + lista.html com todos os jogos) vs. listagem paginada
+por chave, com e sem filtros de categoria e console.
+
+Usa o substituto SQLite (banco_sqlite.py) com os índices do prepara_banco.py.
+O catálogo é preenchido em etapas (--tamanhos) e, em cada etapa, a página é
+medida no início, no fim do catálogo e com filtros. O cache de páginas é
+esvaziado antes de cada requisição, para que toda medição chegue ao banco.
+
+Uso:
+    python benchmarks/bench_listagem.py --tamanhos 10000 100000 1000000
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+CATEGORIAS = ['Ação', 'Aventura', 'Corrida', 'Esporte', 'Estratégia', 'Indie', 'Luta', 'RPG', 'Simulação', 'Terror']
+CONSOLES = ['PS4', 'PS5', 'Xbox One', 'Xbox Series', 'Switch', 'PC', 'SNES', '3DS']
+
+
+def preenche(conexao, de, ate, rng):
+    cursor = conexao.cursor()
+    cursor.executemany(
+        'INSERT INTO jogo (nome, categoria, console) VALUES (%s, %s, %s)',
+        ((f'Jogo {i}', rng.choice(CATEGORIAS), rng.choice(CONSOLES)) for i in range(de, ate)),
+    )
+    conexao.commit()
+
+
+def mede(cliente, url, repeticoes, cache_de_paginas):
+    tempos = []
+    for _ in range(repeticoes):
+        cache_de_paginas.limpar()
+        inicio = time.perf_counter()
+        resposta = cliente.get(url)
+        tempos.append(time.perf_counter() - inicio)
+        assert resposta.status_code == 200, (url, resposta.status_code)
+    return round(statistics.median(tempos) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='Tamanhos do catálogo')
+    parser.add_argument('--repeticoes', type=int, default=20, help='Requisições por medição (mediana)')
+    parser.add_argument('--maximo-da-listagem-completa', type=int, default=100000,
+                        help='Maior catálogo em que a listagem completa antiga é medida')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['JOGOTECA_DB_BACKEND'] = 'sqlite'
+        os.environ['JOGOTECA_SQLITE_PATH'] = os.path.join(tmp, 'listagem.db')
+        from flask import render_template
+        from jogoteca import app
+        from views import cache_de_paginas, jogo_dao
+        logging.getLogger('dao').setLevel(logging.WARNING)
+
+        # Rota com o comportamento anterior, para comparação
+        @app.route('/_listagem_completa')
+        def listagem_completa():
+            return render_template('lista.html', titulo='Jogos', jogos=jogo_dao.listar(), proxima=None,
+                                   categoria='', console='', miniaturas={})
+
+        from banco_sqlite import ConexaoSQLite, cria_tabelas
+        conexao = ConexaoSQLite(os.environ['JOGOTECA_SQLITE_PATH'])
+        cria_tabelas(conexao)
+        cliente = app.test_client()
+        rng = random.Random(42)
+        atual = 0
+        for tamanho in sorted(args.tamanhos):
+            preenche(conexao, atual, tamanho, rng)
+            atual = tamanho
+            resultado = {
+                'jogos': tamanho,
+                'primeira_pagina_ms': mede(cliente, '/', args.repeticoes, cache_de_paginas),
+                'ultima_pagina_ms': mede(cliente, f'/?apos={tamanho - 60}', args.repeticoes, cache_de_paginas),
+                'filtro_categoria_ms': mede(cliente, '/?categoria=RPG', args.repeticoes, cache_de_paginas),
+                'filtro_categoria_console_ms': mede(
+                    cliente, f'/?categoria=RPG&console=SNES&apos={tamanho // 2}', args.repeticoes, cache_de_paginas),
+            }
+            if tamanho <= args.maximo_da_listagem_completa:
+                resultado['listagem_completa_ms'] = mede(
+                    cliente, '/_listagem_completa', max(1, args.repeticoes // 10), cache_de_paginas)
+            print(resultado)
+        conexao.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark de memória do JogoDao.listar com um catálogo grande: caminho antigo
+(fetchall + objetos Jogo com __dict__) vs. listar() com Jogo em __slots__ vs.
+listar(gerador=True), que lê em lotes com fetchmany.
+
+O pico de memória é medido com tracemalloc, percorrendo todos os jogos em
+cada modo. Usa o substituto SQLite (banco_sqlite.py).
+
+Uso:
+    python benchmarks/bench_memoria.py --jogos 1000000
+"""
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+CATEGORIAS = ['Ação', 'Aventura', 'Corrida', 'Esporte', 'Estratégia', 'Indie', 'Luta', 'RPG', 'Simulação', 'Terror']
+CONSOLES = ['PS4', 'PS5', 'Xbox One', 'Xbox Series', 'Switch', 'PC', 'SNES', '3DS']
+
+
+class JogoComDict:
+    # Jogo como era antes dos __slots__, para comparação
+    def __init__(self, nome, categoria, console, id=None):
+        self.id = id
+        self.nome = nome
+        self.categoria = categoria
+        self.console = console
+
+
+def mede(rotulo, percorre):
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    quantidade = percorre()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print({'modo': rotulo, 'jogos': quantidade, 'pico_mb': round(pico / 2 ** 20, 1), 'segundos': round(segundos, 2)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--jogos', type=int, default=1000000, help='Tamanho do catálogo')
+    parser.add_argument('--lote', type=int, default=1000, help='Linhas por fetchmany no modo gerador')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from banco_sqlite import ConexaoSQLite, cria_tabelas
+        from dao import JogoDao
+        from models import Jogo
+        from pool import PoolDeConexoes, conecta_sqlite
+        logging.getLogger('dao').setLevel(logging.WARNING)
+
+        caminho = os.path.join(tmp, 'memoria.db')
+        conexao = ConexaoSQLite(caminho)
+        cria_tabelas(conexao)
+        rng = random.Random(42)
+        conexao.cursor().executemany(
+            'INSERT INTO jogo (nome, categoria, console) VALUES (%s, %s, %s)',
+            ((f'Jogo {i}', rng.choice(CATEGORIAS), rng.choice(CONSOLES)) for i in range(args.jogos)),
+        )
+        conexao.commit()
+        conexao.close()
+
+        db = PoolDeConexoes(conecta_sqlite(caminho))
+        jogo_dao = JogoDao(db)
+
+        def antigo():
+            with db.cursor() as cursor:
+                cursor.execute('SELECT id, nome, categoria, console FROM jogo')
+                jogos = list(map(lambda t: JogoComDict(t[1], t[2], t[3], id=t[0]), cursor.fetchall()))
+            return len(jogos)
+
+        mede('fetchall + __dict__ (antigo)', antigo)
+        mede('listar() + __slots__', lambda: len(jogo_dao.listar()))
+        mede(f'listar(gerador=True, lote={args.lote})', lambda: sum(1 for _ in jogo_dao.listar(gerador=True, lote=args.lote)))
+        print({
+            'bytes_por_objeto_com_dict': sys.getsizeof(JogoComDict('a', 'b', 'c', 1))
+            + sys.getsizeof(JogoComDict('a', 'b', 'c', 1).__dict__),
+            'bytes_por_objeto_com_slots': sys.getsizeof(Jogo('a', 'b', 'c', 1)),
+        })
+        db.fechar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark dos DAOs com o pool de conexões (pool.py) vs. uma conexão nova por
+operação, usando o substituto SQLite (banco_sqlite.py), sem servidor MySQL.
+
+Threads simulam requisições concorrentes: cada uma faz busca_por_id e, a cada
+--escrita-a-cada operações, um salvar.
+
+Uso:
+    python benchmarks/bench_pool.py --threads 16 --operacoes 20000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging  # noqa: E402
+from dao import JogoDao  # noqa: E402
+from models import Jogo  # noqa: E402
+from pool import PoolDeConexoes, conecta_sqlite  # noqa: E402
+
+logging.getLogger('dao').setLevel(logging.WARNING)
+
+
+class SemPool:
+    """
+    Mesma interface do pool, mas abrindo e fechando uma conexão a cada uso.
+    """
+
+    def __init__(self, conecta):
+        self.__conecta = conecta
+        self.abertas = 0
+        self.__lock = threading.Lock()
+
+    @contextmanager
+    def conexao(self):
+        conexao = self.__conecta()
+        with self.__lock:
+            self.abertas += 1
+        try:
+            yield conexao
+        finally:
+            conexao.close()
+
+    @contextmanager
+    def cursor(self):
+        with self.conexao() as conexao:
+            yield conexao.cursor()
+
+    @contextmanager
+    def transacao(self):
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            yield cursor
+            conexao.commit()
+
+
+def percentil(valores, pct):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(pct / 100 * (len(ordenados) - 1))))]
+
+
+def executa(rotulo, db, args, total_jogos):
+    dao = JogoDao(db)
+    latencias = []
+
+    def operacao(i):
+        rng = random.Random(i)
+        inicio = time.perf_counter()
+        if args.escrita_a_cada and i % args.escrita_a_cada == 0:
+            dao.salvar(Jogo('Jogo do benchmark', 'Ação', 'PS4', id=rng.randint(1, total_jogos)))
+        else:
+            dao.busca_por_id(rng.randint(1, total_jogos))
+        latencias.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(operacao, range(args.operacoes)))
+    segundos = time.perf_counter() - inicio
+    return {
+        'modo': rotulo,
+        'operacoes_por_s': round(args.operacoes / segundos, 1),
+        'p50_ms': round(percentil(latencias, 50) * 1000, 3),
+        'p99_ms': round(percentil(latencias, 99) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--threads', type=int, default=16, help='Requisições simultâneas')
+    parser.add_argument('--operacoes', type=int, default=20000, help='Total de operações')
+    parser.add_argument('--escrita-a-cada', type=int, default=10,
+                        help='Uma escrita a cada N operações (0 = só leituras)')
+    parser.add_argument('--maximo', type=int, default=10, help='Conexões no pool (POOL_MAXIMO)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conecta = conecta_sqlite(os.path.join(tmp, 'bench.db'))
+        total_jogos = 1000
+        conexao = conecta()
+        conexao.cursor().executemany(
+            'INSERT INTO jogo (nome, categoria, console) VALUES (%s, %s, %s)',
+            [(f'Jogo {i}', 'Ação', 'PS4') for i in range(total_jogos)],
+        )
+        conexao.commit()
+        conexao.close()
+
+        sem_pool = SemPool(conecta)
+        print({**executa('conexão por operação', sem_pool, args, total_jogos), 'conexoes_abertas': sem_pool.abertas})
+
+        pool = PoolDeConexoes(conecta, minimo=1, maximo=args.maximo)
+        print({**executa('pool', pool, args, total_jogos), **pool.estatisticas()})
+        pool.fechar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark das escritas no catálogo: JogoDao.salvar e JogoDao.deletar (um
+commit por jogo) vs. JogoDao.unidade_de_trabalho (tudo agrupado em uma
+transação). Cada modo insere, atualiza e deleta a mesma quantidade de jogos
+e confere que os IDs gerados foram preenchidos.
+
+Com --sincrono FULL o SQLite faz fsync a cada commit, como o InnoDB com
+innodb_flush_log_at_trx_commit=1.
+
+Uso:
+    python benchmarks/bench_unidade_de_trabalho.py --jogos 2000 --sincrono FULL
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+def mede(rotulo, quantidade, funcao):
+    inicio = time.perf_counter()
+    ids = funcao()
+    segundos = time.perf_counter() - inicio
+    assert all(ids) and len(set(ids)) == quantidade, 'IDs gerados não preenchidos'
+    print({
+        'modo': rotulo,
+        'escritas': quantidade * 3,
+        'ms': round(segundos * 1000, 1),
+        'escritas_por_s': round(quantidade * 3 / segundos),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--jogos', type=int, default=2000, help='Jogos inseridos, atualizados e deletados por modo')
+    parser.add_argument('--sincrono', default='NORMAL', choices=['OFF', 'NORMAL', 'FULL'],
+                        help='PRAGMA synchronous das conexões')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        from banco_sqlite import ConexaoSQLite, cria_tabelas
+        from dao import JogoDao
+        from models import Jogo
+        from pool import PoolDeConexoes
+        logging.getLogger('dao').setLevel(logging.WARNING)
+
+        caminho = os.path.join(tmp, 'escritas.db')
+
+        def conecta():
+            conexao = ConexaoSQLite(caminho)
+            cria_tabelas(conexao)
+            conexao.cursor().execute(f'PRAGMA synchronous={args.sincrono}')
+            return conexao
+
+        db = PoolDeConexoes(conecta)
+        jogo_dao = JogoDao(db)
+
+        def por_jogo():
+            jogos = [jogo_dao.salvar(Jogo(f'Jogo {i}', 'RPG', 'PC')) for i in range(args.jogos)]
+            for jogo in jogos:
+                jogo.nome += ' HD'
+                jogo_dao.salvar(jogo)
+            for jogo in jogos:
+                jogo_dao.deletar(jogo.id)
+            return [jogo.id for jogo in jogos]
+
+        def em_unidade():
+            with jogo_dao.unidade_de_trabalho() as unidade:
+                jogos = [unidade.salvar(Jogo(f'Jogo {i}', 'RPG', 'PC')) for i in range(args.jogos)]
+            with jogo_dao.unidade_de_trabalho() as unidade:
+                for jogo in jogos:
+                    jogo.nome += ' HD'
+                    unidade.salvar(jogo)
+            with jogo_dao.unidade_de_trabalho() as unidade:
+                for jogo in jogos:
+                    unidade.deletar(jogo.id)
+            return [jogo.id for jogo in jogos]
+
+        mede(f'commit por jogo (synchronous={args.sincrono})', args.jogos, por_jogo)
+        mede(f'unidade de trabalho (synchronous={args.sincrono})', args.jogos, em_unidade)
+        assert not jogo_dao.listar(), 'jogos não deletados'
+        db.fechar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+import heapq
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from models import Jogo
+
+# Peso de cada campo no ranking
+PESOS = {'nome': 3.0, 'categoria': 1.0, 'console': 1.0}
+# Similaridade mínima (trigramas) para um termo casar com uma palavra do índice
+SIMILARIDADE_MINIMA = 0.3
+
+_PALAVRA = re.compile(r'\w+')
+
+
+def normaliza(texto):
+    """
+    Remove acentos e deixa o texto em minúsculas ("Ação" -> "acao").
+
+    Args:
+        texto (str): Texto original.
+
+    Returns:
+        str: Texto normalizado.
+    """
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+def palavras(texto):
+    """
+    Separa o texto normalizado em palavras.
+    """
+    return _PALAVRA.findall(normaliza(texto))
+
+
+def trigramas(palavra):
+    """
+    Trigramas da palavra com espaços nas bordas, como no pg_trgm
+    ("rpg" -> "  r", " rp", "rpg", "pg ").
+    """
+    texto = f'  {palavra} '
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceDeBusca:
+    def __init__(self, fonte=None):
+        """
+        Índice invertido em memória sobre nome, categoria e console dos jogos.
+
+        Cada palavra (sem acentos) aponta para os jogos em que aparece, com o
+        peso dos campos. Um segundo índice, de trigramas para palavras, permite
+        achar palavras por prefixo ou com erros de digitação sem varrer o
+        vocabulário inteiro.
+
+        O índice é carregado com `carregar` e mantido em dia pelo JogoDao, do
+        qual é ouvinte (jogo_salvo e jogo_deletado).
+
+        Args:
+            fonte (callable): Função que devolve os jogos a indexar (por
+                exemplo, JogoDao.listar). Com ela, o índice só é carregado na
+                primeira busca, e não ao ser criado; até lá, as notificações do
+                JogoDao são ignoradas, pois a carga já lê o catálogo atual.
+        """
+        self.__fonte = fonte
+        self.__carregado = fonte is None
+        self.__jogos = {}                        # id -> (nome, categoria, console)
+        self.__postings = defaultdict(dict)      # palavra -> {id: peso}
+        self.__palavras_por_trigrama = defaultdict(set)
+        self.__lock = threading.RLock()
+
+    def carregar(self, jogos):
+        """
+        Indexa os jogos informados (por exemplo, o resultado de JogoDao.listar).
+
+        Args:
+            jogos (iterable): Objetos Jogo.
+        """
+        with self.__lock:
+            for jogo in jogos:
+                self.__adiciona(jogo)
+            self.__carregado = True
+
+    def __len__(self):
+        return len(self.__jogos)
+
+    def __adiciona(self, jogo):
+        id = int(jogo.id)
+        if id in self.__jogos:
+            self.__remove(id)
+        self.__jogos[id] = (jogo.nome, jogo.categoria, jogo.console)
+        pesos = defaultdict(float)
+        for campo, peso in PESOS.items():
+            for palavra in palavras(getattr(jogo, campo)):
+                pesos[palavra] += peso
+        for palavra, peso in pesos.items():
+            if palavra not in self.__postings:
+                for trigrama in trigramas(palavra):
+                    self.__palavras_por_trigrama[trigrama].add(palavra)
+            self.__postings[palavra][id] = peso
+
+    def __remove(self, id):
+        nome, categoria, console = self.__jogos.pop(id)
+        for palavra in set(palavras(f'{nome} {categoria} {console}')):
+            postings = self.__postings[palavra]
+            postings.pop(id, None)
+            if not postings:
+                del self.__postings[palavra]
+                for trigrama in trigramas(palavra):
+                    self.__palavras_por_trigrama[trigrama].discard(palavra)
+
+    def jogo_salvo(self, jogo):
+        with self.__lock:
+            if self.__carregado:
+                self.__adiciona(jogo)
+
+    def jogo_deletado(self, id):
+        with self.__lock:
+            if self.__carregado and int(id) in self.__jogos:
+                self.__remove(int(id))
+
+    def __expande(self, termo):
+        """
+        Palavras do índice que casam com o termo, com a similaridade de cada uma:
+        1 para a palavra exata, pelo menos 0.8 para prefixos e a similaridade
+        de trigramas para as demais.
+        """
+        if termo in self.__postings and len(termo) < 3:
+            return {termo: 1.0}
+        alvo = trigramas(termo)
+        comuns = defaultdict(int)
+        for trigrama in alvo:
+            for palavra in self.__palavras_por_trigrama.get(trigrama, ()):
+                comuns[palavra] += 1
+        expansoes = {}
+        for palavra, quantidade in comuns.items():
+            similaridade = quantidade / (len(alvo) + len(trigramas(palavra)) - quantidade)
+            if palavra == termo:
+                similaridade = 1.0
+            elif palavra.startswith(termo):
+                similaridade = max(similaridade, 0.8)
+            if similaridade >= SIMILARIDADE_MINIMA:
+                expansoes[palavra] = similaridade
+        return expansoes
+
+    def buscar(self, consulta, limite=20):
+        """
+        Busca jogos que casam com todos os termos da consulta, ordenados por
+        relevância (peso do campo x similaridade do termo).
+
+        Args:
+            consulta (str): Texto digitado pelo usuário.
+            limite (int): Número máximo de resultados.
+
+        Returns:
+            list: Objetos Jogo, do mais para o menos relevante.
+        """
+        termos = palavras(consulta)
+        if not termos:
+            return []
+        with self.__lock:
+            if not self.__carregado:
+                self.carregar(self.__fonte())
+            pontuacoes_por_termo = []
+            for termo in termos:
+                pontuacoes = {}
+                for palavra, similaridade in self.__expande(termo).items():
+                    for id, peso in self.__postings[palavra].items():
+                        pontuacao = peso * similaridade
+                        if pontuacao > pontuacoes.get(id, 0.0):
+                            pontuacoes[id] = pontuacao
+                if not pontuacoes:
+                    return []
+                pontuacoes_por_termo.append(pontuacoes)
+
+            # Interseção a partir do termo mais raro
+            pontuacoes_por_termo.sort(key=len)
+            total = dict(pontuacoes_por_termo[0])
+            for pontuacoes in pontuacoes_por_termo[1:]:
+                total = {id: pontos + pontuacoes[id] for id, pontos in total.items() if id in pontuacoes}
+
+            melhores = heapq.nsmallest(limite, total.items(), key=lambda item: (-item[1], item[0]))
+            return [Jogo(*self.__jogos[id], id=id) for id, _ in melhores]
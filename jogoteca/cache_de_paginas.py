@@ -0,0 +1,118 @@
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import make_response, request, session
+
+
+class CacheDePaginas:
+    def __init__(self, versao, maximo=1024, validade=30):
+        """
+        Cache das páginas renderizadas que dependem só do catálogo de jogos
+        (listagem e busca), com ETag forte para revalidação pelo navegador.
+
+        A chave de cada página é a versão do catálogo, o usuário logado e o
+        caminho com a query string (página e filtros). Como o JogoDao
+        incrementa a versão a cada escrita, páginas antigas deixam de ser
+        encontradas assim que o catálogo muda, sem invalidação explícita.
+
+        A versão, porém, é contada em cada processo: com vários workers, um
+        worker não fica sabendo das escritas feitas pelos outros. Por isso
+        cada página vale no máximo `validade` segundos, depois dos quais é
+        renderizada de novo a partir do banco.
+
+        Numa página em cache, um If-None-Match com a ETag atual recebe
+        304 Not Modified sem consultar o banco nem renderizar o template.
+
+        Args:
+            versao (callable): Função que devolve a versão atual do catálogo
+                (JogoDao.versao_do_catalogo).
+            maximo (int): Número máximo de páginas guardadas (as menos usadas
+                recentemente saem primeiro).
+            validade (float): Idade máxima de uma página, em segundos (0 desativa).
+        """
+        self.__versao = versao
+        self.maximo = maximo
+        self.validade = validade
+        self.__paginas = OrderedDict()  # chave -> (etag, corpo, mimetype, guardada_em)
+        self.__versao_em_cache = None
+        self.__lock = threading.Lock()
+        self.__contadores = {'acertos': 0, 'falhas': 0, 'nao_modificadas': 0, 'ignoradas': 0}
+
+    def __conta(self, contador):
+        with self.__lock:
+            self.__contadores[contador] += 1
+
+    def __busca(self, chave):
+        with self.__lock:
+            pagina = self.__paginas.get(chave)
+            if pagina is None:
+                return None
+            if self.validade and time.monotonic() - pagina[3] > self.validade:
+                del self.__paginas[chave]
+                return None
+            self.__paginas.move_to_end(chave)
+            return pagina[:3]
+
+    def __guarda(self, chave, pagina):
+        with self.__lock:
+            # Páginas de versões anteriores não serão mais pedidas
+            if chave[0] != self.__versao_em_cache:
+                self.__paginas.clear()
+                self.__versao_em_cache = chave[0]
+            self.__paginas[chave] = pagina
+            if len(self.__paginas) > self.maximo:
+                self.__paginas.popitem(last=False)
+
+    def __responde(self, etag, corpo, mimetype):
+        if request.if_none_match.contains_weak(etag):
+            self.__conta('nao_modificadas')
+            resposta = make_response('', 304)
+        else:
+            resposta = make_response(corpo)
+            resposta.mimetype = mimetype
+        resposta.set_etag(etag)
+        # A página depende da sessão: só o navegador guarda, e sempre revalida
+        resposta.headers['Cache-Control'] = 'private, no-cache'
+        return resposta
+
+    def em_cache(self, view):
+        """
+        Decorador para views GET cujo HTML depende apenas do catálogo, da
+        query string e do usuário logado.
+        """
+        @functools.wraps(view)
+        def view_em_cache(*args, **kwargs):
+            # Mensagens flash são consumidas na renderização: a página sai
+            # diferente e não pode ser reaproveitada
+            if '_flashes' in session:
+                self.__conta('ignoradas')
+                return view(*args, **kwargs)
+
+            chave = (self.__versao(), session.get('usuario_logado'), request.full_path)
+            pagina = self.__busca(chave)
+            if pagina is not None:
+                self.__conta('acertos')
+                return self.__responde(*pagina)
+
+            self.__conta('falhas')
+            resposta = make_response(view(*args, **kwargs))
+            if resposta.status_code != 200 or resposta.direct_passthrough:
+                return resposta
+            corpo = resposta.get_data()
+            etag = hashlib.sha256(corpo).hexdigest()[:32]
+            self.__guarda(chave, (etag, corpo, resposta.mimetype, time.monotonic()))
+            return self.__responde(etag, corpo, resposta.mimetype)
+        return view_em_cache
+
+    def limpar(self):
+        """
+        Descarta todas as páginas guardadas (os contadores são mantidos).
+        """
+        with self.__lock:
+            self.__paginas.clear()
+
+    def estatisticas(self):
+        with self.__lock:
+            return {**self.__contadores, 'paginas': len(self.__paginas)}
@@ -0,0 +1,353 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow é opcional: sem ele as páginas usam a capa original
+    Image = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# {hash do conteúdo}.jpg e {hash}-{variante}-{largura}x{altura}.jpg
+_NOME_ENDERECADO = re.compile(r'^[0-9a-f]{32}(-\w+-\d+x\d+)?\.jpg$')
+# Capas gravadas antes do armazenamento por conteúdo
+_NOME_ANTIGO = re.compile(r'^capa(\d+)\.jpg$')
+_VARIANTE_ANTIGA = re.compile(r'^capa\d+-\w+-[0-9a-f]{16}\.jpg$')
+
+_BLOCO = 64 * 1024
+
+
+class ArmazemEmUsoError(Exception):
+    """Outro processo já usa o manifesto de capas (e a pasta de uploads)."""
+
+
+def _trava_exclusiva(arquivo):
+    # Trava sem esperar; falha com OSError se outro processo já a tem
+    if fcntl is not None:
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+def eh_imutavel(nome_arquivo):
+    """
+    Indica se o arquivo é endereçado pelo conteúdo (original ou variante):
+    o nome muda junto com o conteúdo, então pode ficar em cache indefinidamente.
+    """
+    return _NOME_ENDERECADO.match(nome_arquivo) is not None
+
+
+class ArmazemDeCapas:
+    def __init__(self, pasta, manifesto, variantes, trabalhadores=2, qualidade=85):
+        """
+        Armazena as capas pelo hash do conteúdo e gera, em segundo plano,
+        versões redimensionadas de cada uma.
+
+        Cada arquivo é gravado uma única vez em `{hash}.jpg`, mesmo que a
+        mesma imagem seja enviada para vários jogos. Um manifesto em memória
+        guarda o hash da capa de cada jogo e quantos jogos usam cada hash; o
+        arquivo só é apagado quando o último deles deixa de usá-lo. As
+        consultas (`capa` e `variante`) nunca acessam o disco.
+
+        O manifesto é persistido como um diário (uma linha JSON acrescentada
+        por alteração) e compactado ao ser recarregado em `carregar`, chamado
+        no primeiro uso do armazém.
+
+        As contagens de referências ficam na memória do processo, então só um
+        processo pode usar o manifesto: `carregar` trava `{manifesto}.lock` e
+        lança ArmazemEmUsoError se outro processo já o tiver carregado. Com
+        vários workers, eles apagariam arquivos ainda usados pelos outros e
+        perderiam alterações do diário. Sirva a aplicação com um único
+        processo (e várias threads).
+
+        As variantes (por exemplo, miniatura e detalhe) são geradas por um
+        pool de threads com o nome `{hash}-{variante}-{largura}x{altura}.jpg`.
+        Enquanto não ficam prontas (ou sem o Pillow instalado), `capa`
+        devolve a capa original.
+
+        Args:
+            pasta (str): Pasta de uploads (UPLOAD_PATH).
+            manifesto (str): Arquivo do manifesto.
+            variantes (dict): Nome da variante -> (largura, altura) máximas.
+            trabalhadores (int): Threads do pool de processamento.
+            qualidade (int): Qualidade JPEG das variantes.
+        """
+        self.pasta = pasta
+        self.manifesto = manifesto
+        self.variantes = variantes
+        self.qualidade = qualidade
+        self.__executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='capas')
+        self.__capas = {}               # id do jogo -> hash
+        self.__referencias = Counter()  # hash -> jogos que o usam
+        self.__geradas = {}             # hash -> {variante: nome do arquivo}
+        self.__diario = None
+        self.__trava = None
+        self.__versao = 0
+        self.__lock = threading.Lock()
+        self.__carga = threading.Lock()
+        self.__carregado = False
+        if Image is None:
+            logger.warning("Pillow não instalado: as capas serão servidas sem redimensionar.")
+
+    def carregar(self):
+        """
+        Recarrega o manifesto, reescrevendo-o compactado, e enfileira as capas
+        que ainda não têm todas as variantes. Sem manifesto, importa as capas
+        no formato antigo (capa{id}.jpg) que estiverem na pasta.
+
+        Uma última linha incompleta (queda do processo no meio de uma
+        gravação) é descartada: a alteração dela não chegou a ser confirmada.
+
+        Chamado automaticamente no primeiro uso; chamadas seguintes não fazem nada.
+
+        Raises:
+            ArmazemEmUsoError: Outro processo já carregou o manifesto.
+        """
+        with self.__carga:
+            if not self.__carregado:
+                self.__trava_manifesto()
+                self.__carrega()
+                self.__carregado = True
+
+    def __garante_carregado(self):
+        if not self.__carregado:
+            self.carregar()
+
+    def __trava_manifesto(self):
+        trava = open(f'{self.manifesto}.lock', 'a')
+        try:
+            _trava_exclusiva(trava)
+        except OSError:
+            trava.close()
+            raise ArmazemEmUsoError(
+                f'O manifesto {self.manifesto} já está em uso por outro processo; '
+                'as capas só podem ser servidas por um processo')
+        self.__trava = trava
+
+    def __carrega(self):
+        try:
+            with open(self.manifesto, encoding='utf-8') as arquivo:
+                for numero, linha in enumerate(arquivo, 1):
+                    try:
+                        registro = json.loads(linha) if linha.endswith('\n') else None
+                    except ValueError:
+                        registro = None
+                    if not isinstance(registro, dict):
+                        logger.warning("Linha %d do manifesto de capas incompleta ou inválida; ignorada.", numero)
+                        continue
+                    self.__aplica(registro)
+            antigos = []
+        except FileNotFoundError:
+            antigos = os.listdir(self.pasta)
+        self.__compacta()
+        for nome in antigos:
+            antigo = _NOME_ANTIGO.match(nome)
+            if antigo:
+                with open(os.path.join(self.pasta, nome), 'rb') as arquivo:
+                    self.__guarda(int(antigo.group(1)), arquivo)
+                os.remove(os.path.join(self.pasta, nome))
+            elif _VARIANTE_ANTIGA.match(nome):
+                os.remove(os.path.join(self.pasta, nome))
+        # Inclui as capas com variantes de tamanhos que saíram do config
+        for hash in list(self.__referencias):
+            if sorted(self.__geradas.get(hash, {}).values()) != sorted(self.__nomes_das_variantes(hash)):
+                self.__enfileira(hash)
+
+    def __aplica(self, registro):
+        # Reproduz no manifesto em memória uma linha do diário
+        if 'variantes' in registro:
+            self.__geradas[registro['hash']] = registro['variantes']
+            return
+        id, hash = registro['id'], registro['hash']
+        if self.__capas.get(id) == hash:
+            return
+        anterior = self.__capas.pop(id, None)
+        if anterior is not None:
+            self.__referencias[anterior] -= 1
+            if not self.__referencias[anterior]:
+                del self.__referencias[anterior]
+                self.__geradas.pop(anterior, None)
+        if hash is not None:
+            self.__capas[id] = hash
+            self.__referencias[hash] += 1
+
+    def __compacta(self):
+        temporario = f'{self.manifesto}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            for id, hash in self.__capas.items():
+                arquivo.write(json.dumps({'id': id, 'hash': hash}) + '\n')
+            for hash, geradas in self.__geradas.items():
+                arquivo.write(json.dumps({'hash': hash, 'variantes': geradas}) + '\n')
+        os.replace(temporario, self.manifesto)
+        self.__diario = open(self.manifesto, 'a', encoding='utf-8')
+
+    def __registra(self, registro):
+        # Chamado com o lock: aplica em memória e acrescenta ao diário
+        self.__aplica(registro)
+        self.__diario.write(json.dumps(registro) + '\n')
+        self.__diario.flush()
+        self.__versao += 1
+
+    def versao(self):
+        """
+        Contador incrementado sempre que capas mudam ou variantes ficam prontas
+        (páginas que mostram capas dependem dele).
+        """
+        self.__garante_carregado()
+        return self.__versao
+
+    def receber(self, id, arquivo):
+        """
+        Grava a capa enviada, se o conteúdo ainda não estiver armazenado, e
+        enfileira a geração das variantes.
+
+        Args:
+            id (int): ID do jogo.
+            arquivo (FileStorage): Arquivo enviado no formulário.
+
+        Returns:
+            str: Hash do conteúdo da capa.
+        """
+        self.__garante_carregado()
+        return self.__guarda(int(id), arquivo.stream)
+
+    def __guarda(self, id, origem):
+        # Copia em blocos, calculando o hash, sem carregar o arquivo em memória
+        temporario = os.path.join(self.pasta, f'.upload-{os.getpid()}-{threading.get_ident()}.tmp')
+        soma = hashlib.sha256()
+        with open(temporario, 'wb') as destino:
+            for bloco in iter(lambda: origem.read(_BLOCO), b''):
+                soma.update(bloco)
+                destino.write(bloco)
+        hash = soma.hexdigest()[:32]
+        with self.__lock:
+            if self.__capas.get(id) == hash:
+                # Mesma capa enviada de novo para o jogo: nada muda
+                os.remove(temporario)
+                return hash
+            novo = hash not in self.__referencias
+            if novo:
+                os.replace(temporario, os.path.join(self.pasta, f'{hash}.jpg'))
+            else:
+                os.remove(temporario)
+            self.__libera(self.__capas.get(id), {'id': id, 'hash': hash})
+        if novo:
+            self.__enfileira(hash)
+        return hash
+
+    def __libera(self, hash, registro):
+        # Chamado com o lock: registra a alteração e, se o hash anterior ficou
+        # sem uso, apaga os arquivos dele antes que outro envio o recrie
+        geradas = list(self.__geradas.get(hash, {}).values())
+        self.__registra(registro)
+        if hash is not None and hash not in self.__referencias:
+            self.__apaga([f'{hash}.jpg', *geradas])
+
+    def __nomes_das_variantes(self, hash):
+        return [f'{hash}-{nome}-{largura}x{altura}.jpg' for nome, (largura, altura) in self.variantes.items()]
+
+    def __enfileira(self, hash):
+        if Image is None:
+            return None
+        return self.__executor.submit(self.__processa, hash)
+
+    def __processa(self, hash):
+        try:
+            with Image.open(os.path.join(self.pasta, f'{hash}.jpg')) as imagem:
+                imagem.load()
+                geradas = {nome: self.__gera(hash, imagem, nome, tamanho) for nome, tamanho in self.variantes.items()}
+        except Exception as e:
+            logger.error("Erro ao processar a capa %s: %s", hash, e)
+            return None
+        with self.__lock:
+            # A capa pode ter deixado de ser usada durante o processamento
+            if hash in self.__referencias:
+                anteriores = self.__geradas.get(hash, {}).values()
+                self.__registra({'hash': hash, 'variantes': geradas})
+                self.__apaga(set(anteriores) - set(geradas.values()))
+            else:
+                self.__apaga(geradas.values())
+        return geradas
+
+    def __gera(self, hash, imagem, variante, tamanho):
+        copia = imagem.convert('RGB')
+        copia.thumbnail(tamanho)
+        conteudo = io.BytesIO()
+        copia.save(conteudo, 'JPEG', quality=self.qualidade, optimize=True)
+        nome = f'{hash}-{variante}-{tamanho[0]}x{tamanho[1]}.jpg'
+        caminho = os.path.join(self.pasta, nome)
+        with open(f'{caminho}.tmp', 'wb') as destino:
+            destino.write(conteudo.getvalue())
+        os.replace(f'{caminho}.tmp', caminho)
+        return nome
+
+    def __apaga(self, nomes):
+        for nome in nomes:
+            try:
+                os.remove(os.path.join(self.pasta, nome))
+            except FileNotFoundError:
+                pass
+
+    def variante(self, id, variante):
+        """
+        Nome do arquivo da variante da capa, ou None se ainda não foi gerada.
+        """
+        self.__garante_carregado()
+        hash = self.__capas.get(int(id))
+        return self.__geradas.get(hash, {}).get(variante) if hash else None
+
+    def capa(self, id, variante):
+        """
+        Nome do arquivo a exibir: a variante, se pronta, ou a capa original.
+
+        Returns:
+            str: Nome do arquivo em UPLOAD_PATH, ou None se o jogo não tem capa.
+        """
+        self.__garante_carregado()
+        hash = self.__capas.get(int(id))
+        if hash is None:
+            return None
+        return self.__geradas.get(hash, {}).get(variante) or f'{hash}.jpg'
+
+    def remover(self, id):
+        """
+        Desassocia a capa do jogo. Os arquivos só são apagados quando nenhum
+        outro jogo usa o mesmo conteúdo.
+        """
+        self.__garante_carregado()
+        with self.__lock:
+            hash = self.__capas.get(int(id))
+            if hash is not None:
+                self.__libera(hash, {'id': int(id), 'hash': None})
+
+    def estatisticas(self):
+        with self.__lock:
+            return {'jogos_com_capa': len(self.__capas), 'arquivos': len(self.__referencias)}
+
+    def encerrar(self):
+        """
+        Aguarda os processamentos em andamento, encerra o pool, fecha o
+        manifesto e libera a trava dele.
+        """
+        self.__executor.shutdown(wait=True)
+        with self.__lock:
+            if self.__diario:
+                self.__diario.close()
+                self.__diario = None
+            if self.__trava:
+                self.__trava.close()
+                self.__trava = None
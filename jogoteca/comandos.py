@@ -0,0 +1,32 @@
+import json
+import click
+from jogoteca import app
+from importacao import FORMATOS, exportar, formato_do_arquivo, importar
+# O módulo, não o jogo_dao: ao rodar `python jogoteca.py`, views ainda está
+# sendo importado quando chega aqui
+import views
+
+
+@app.cli.command('exportar-jogos')
+@click.argument('destino', type=click.File('w', encoding='utf-8'), default='-')
+@click.option('--formato', type=click.Choice(list(FORMATOS)), help='Padrão: pela extensão do destino (ou csv).')
+def exportar_jogos(destino, formato):
+    """
+    Exporta o catálogo de jogos para DESTINO (ou para a saída padrão).
+    """
+    formato = formato or formato_do_arquivo(destino.name)
+    for pedaco in exportar(views.jogo_dao, formato, app.config['IMPORTACAO_LOTE']):
+        destino.write(pedaco)
+
+
+@app.cli.command('importar-jogos')
+@click.argument('origem', type=click.File('rb'))
+@click.option('--formato', type=click.Choice(list(FORMATOS)), help='Padrão: pela extensão da origem (ou csv).')
+@click.option('--lote', type=int, help='Jogos por transação (padrão: IMPORTACAO_LOTE).')
+def importar_jogos(origem, formato, lote):
+    """
+    Importa jogos de ORIGEM (CSV ou NDJSON; '-' lê da entrada padrão).
+    """
+    formato = formato or formato_do_arquivo(origem.name)
+    relatorio = importar(views.jogo_dao, origem, formato, lote or app.config['IMPORTACAO_LOTE'])
+    click.echo(json.dumps(relatorio, ensure_ascii=False, indent=2))
@@ -6,4 +6,27 @@ MYSQL_USER = "root"
 MYSQL_PASSWORD = "admin" 
 MYSQL_DB = "jogoteca" 
 MYSQL_PORT = 3306
-UPLOAD_PATH = os.path.dirname(os.path.abspath(__file__)) + '/uploads'
\ No newline at end of file
+UPLOAD_PATH = os.path.dirname(os.path.abspath(__file__)) + '/uploads'
+JOGOS_POR_PAGINA = 50     # Jogos por página na listagem
+RESULTADOS_DA_BUSCA = 50  # Resultados exibidos em /busca
+PAGINAS_EM_CACHE = 1024   # Páginas renderizadas guardadas (cache_de_paginas.py)
+PAGINAS_VALIDADE = 30     # Idade máxima (s) de uma página em cache: limita o atraso entre workers
+IMPORTACAO_LOTE = 1000    # Jogos por transação na importação e por pedaço na exportação
+
+# Capas (capas.py): manifesto jogo -> hash do arquivo e variantes geradas após o upload
+CAPAS_MANIFESTO = os.path.dirname(os.path.abspath(__file__)) + '/capas.jsonl'
+# Nome da variante -> (largura, altura) máximas
+CAPAS_VARIANTES = {'miniatura': (80, 110), 'detalhe': (400, 550)}
+CAPAS_TRABALHADORES = 2     # Threads que redimensionam as capas
+CAPAS_MAX_AGE = 31536000    # Cache das variantes no navegador (1 ano; os nomes mudam com o conteúdo)
+
+# Banco usado pelos DAOs: 'mysql' ou 'sqlite' (substituto local, sem servidor)
+DB_BACKEND = os.getenv('JOGOTECA_DB_BACKEND', 'mysql')
+SQLITE_PATH = os.getenv('JOGOTECA_SQLITE_PATH', os.path.dirname(os.path.abspath(__file__)) + '/jogoteca.db')
+
+# Pool de conexões (pool.py)
+POOL_MINIMO = 1       # Conexões abertas na inicialização
+POOL_MAXIMO = 10      # Conexões abertas ao mesmo tempo
+POOL_RECICLAR = 1800  # Idade máxima de uma conexão (segundos)
+POOL_PRE_PING = True  # Testa a conexão antes de entregá-la ao DAO
+POOL_TIMEOUT = 30     # Espera máxima por uma conexão livre (segundos)
@@ -1,5 +1,7 @@
 from models import Jogo, Usuario
+from contextlib import contextmanager
 import logging
+import threading
 
 # Configuração de logs
 logging.basicConfig(level=logging.INFO)
@@ -7,22 +9,125 @@ logger = logging.getLogger(__name__)
 
 # SQL Queries
 SQL_DELETA_JOGO = 'DELETE FROM jogo WHERE id = %s'
+SQL_DELETA_JOGOS = 'DELETE FROM jogo WHERE id IN ({marcadores})'
 SQL_JOGO_POR_ID = 'SELECT id, nome, categoria, console FROM jogo WHERE id = %s'
+SQL_JOGOS_POR_IDS = 'SELECT id, nome, categoria, console FROM jogo WHERE id IN ({marcadores})'
 SQL_USUARIO_POR_ID = 'SELECT id, nome, senha FROM usuario WHERE id = %s'
 SQL_ATUALIZA_JOGO = 'UPDATE jogo SET nome = %s, categoria = %s, console = %s WHERE id = %s'
 SQL_BUSCA_JOGOS = 'SELECT id, nome, categoria, console FROM jogo'
+# Página da listagem (paginação por chave: id > último id da página anterior).
+# Os filtros usam os índices (categoria, id), (console, id) e (categoria, console, id).
+SQL_BUSCA_JOGOS_PAGINA = 'SELECT id, nome, categoria, console FROM jogo WHERE id > %s{filtros} ORDER BY id LIMIT %s'
 SQL_CRIA_JOGO = 'INSERT INTO jogo (nome, categoria, console) VALUES (%s, %s, %s)'
+SQL_CRIA_JOGO_COM_ID = 'INSERT INTO jogo (id, nome, categoria, console) VALUES (%s, %s, %s, %s)'
+# INSERT de várias linhas; {valores} é '(%s, %s, %s)' repetido uma vez por jogo
+SQL_CRIA_JOGOS = 'INSERT INTO jogo (nome, categoria, console) VALUES {valores}'
+# Jogos por INSERT de várias linhas (e IDs por DELETE ... IN) na gravação em lote
+LINHAS_POR_INSERT = 500
+SQL_IDS_EXISTENTES = 'SELECT id FROM jogo WHERE id IN ({marcadores})'
+
+# Marca, no mapa de identidade, um ID que já foi buscado e não existe
+_AUSENTE = object()
+
+
+class UnidadeDeTrabalho:
+    def __init__(self):
+        """
+        Escritas no catálogo acumuladas por JogoDao.unidade_de_trabalho e
+        gravadas juntas, em uma só transação, ao final do bloco.
+        """
+        self.novos = []       # Jogos sem ID, na ordem em que foram salvos
+        self.alterados = {}   # id -> Jogo (vale a última versão salva)
+        self.removidos = {}   # ids a deletar (dict para manter a ordem)
+
+    def salvar(self, jogo):
+        """
+        Enfileira a inserção (jogo sem ID) ou a atualização do jogo.
+        """
+        if jogo.id:
+            self.removidos.pop(int(jogo.id), None)
+            self.alterados[int(jogo.id)] = jogo
+        else:
+            self.novos.append(jogo)
+        return jogo
+
+    def deletar(self, id):
+        """
+        Enfileira a remoção do jogo (e descarta uma atualização pendente dele).
+        """
+        self.alterados.pop(int(id), None)
+        self.removidos[int(id)] = None
+
+    def __len__(self):
+        return len(self.novos) + len(self.alterados) + len(self.removidos)
+
+
+class MapaDeIdentidade:
+    def __init__(self):
+        """
+        Registros já lidos durante uma requisição, para que cada linha seja
+        buscada no banco no máximo uma vez por requisição.
+
+        Os DAOs consultam o mapa antes de ir ao banco, guardam nele o que
+        leem ou escrevem e contam em `consultas` as idas ao banco, o que
+        permite verificar quantas consultas uma página faz.
+        """
+        self.jogos = {}     # id -> Jogo (ou _AUSENTE)
+        self.usuarios = {}  # id -> Usuario (ou _AUSENTE)
+        self.consultas = 0
+
+
+def _sem_mapa():
+    return None
 
 
 class JogoDao:
-    def __init__(self, db):
+    def __init__(self, db, mapa_de_identidade=_sem_mapa):
         """
         Classe para gerenciar operações no banco de dados relacionadas a jogos.
 
         Args:
-            db: Objeto de conexão ao banco de dados.
+            db (PoolDeConexoes): Pool de conexões ao banco de dados.
+            mapa_de_identidade (callable): Devolve o MapaDeIdentidade da
+                requisição atual, ou None fora de uma requisição.
         """
         self.__db = db
+        self.__mapa = mapa_de_identidade
+        self.__ouvintes = []
+        self.__versao = 0
+        self.__lock_versao = threading.Lock()
+
+    def versao_do_catalogo(self):
+        """
+        Contador incrementado a cada escrita confirmada no catálogo (salvar e
+        deletar). Serve de chave para caches do que depende dos jogos, como o
+        cache de páginas renderizadas.
+
+        Returns:
+            int: Versão atual do catálogo neste processo.
+        """
+        return self.__versao
+
+    def __nova_versao(self):
+        with self.__lock_versao:
+            self.__versao += 1
+
+    def __consulta(self):
+        # Conta uma ida ao banco e devolve o mapa da requisição (ou None)
+        mapa = self.__mapa()
+        if mapa is not None:
+            mapa.consultas += 1
+        return mapa
+
+    def registrar_ouvinte(self, ouvinte):
+        """
+        Registra um objeto avisado depois de cada escrita confirmada no
+        catálogo (por exemplo, o índice de busca).
+
+        Args:
+            ouvinte: Objeto com os métodos jogo_salvo(jogo) e jogo_deletado(id).
+        """
+        self.__ouvintes.append(ouvinte)
 
     def salvar(self, jogo):
         """
@@ -35,37 +140,204 @@ class JogoDao:
             Jogo: O objeto Jogo salvo, com o ID atualizado (se aplicável).
         """
         try:
-            cursor = self.__db.connection.cursor()
-            if jogo.id:
-                logger.info("Atualizando jogo com ID: %s", jogo.id)
-                cursor.execute(SQL_ATUALIZA_JOGO, (jogo.nome, jogo.categoria, jogo.console, jogo.id))
-            else:
-                logger.info("Inserindo novo jogo.")
-                cursor.execute(SQL_CRIA_JOGO, (jogo.nome, jogo.categoria, jogo.console))
-                jogo.id = cursor.lastrowid
-            self.__db.connection.commit()
+            mapa = self.__consulta()
+            with self.__db.transacao() as cursor:
+                if jogo.id:
+                    logger.info("Atualizando jogo com ID: %s", jogo.id)
+                    cursor.execute(SQL_ATUALIZA_JOGO, (jogo.nome, jogo.categoria, jogo.console, jogo.id))
+                else:
+                    logger.info("Inserindo novo jogo.")
+                    cursor.execute(SQL_CRIA_JOGO, (jogo.nome, jogo.categoria, jogo.console))
+                    jogo.id = cursor.lastrowid
+            if mapa is not None:
+                mapa.jogos[int(jogo.id)] = jogo
+            self.__nova_versao()
+            for ouvinte in self.__ouvintes:
+                ouvinte.jogo_salvo(jogo)
             return jogo
         except Exception as e:
             logger.error("Erro ao salvar jogo: %s", e)
-            self.__db.connection.rollback()
             raise
 
-    def listar(self):
+    def salvar_varios(self, jogos):
+        """
+        Salva vários jogos em uma única transação: os que têm ID são
+        atualizados se existirem e inseridos com esse ID se não existirem; os
+        sem ID são inseridos e recebem o ID gerado. Se qualquer um falhar,
+        nenhum é salvo.
+
+        Args:
+            jogos (list): Objetos Jogo.
+
+        Returns:
+            dict: Quantidade de jogos inseridos e atualizados.
+        """
+        com_id = [jogo for jogo in jogos if jogo.id]
+        sem_id = [jogo for jogo in jogos if not jogo.id]
+        try:
+            logger.info("Salvando %d jogos em lote.", len(jogos))
+            mapa = self.__consulta()
+            passo = self.__db.passo_dos_ids()
+            with self.__db.transacao() as cursor:
+                existentes = set()
+                if com_id:
+                    cursor.execute(SQL_IDS_EXISTENTES.format(marcadores=', '.join(['%s'] * len(com_id))),
+                                   [int(jogo.id) for jogo in com_id])
+                    existentes = {linha[0] for linha in cursor.fetchall()}
+                atualizar = [jogo for jogo in com_id if int(jogo.id) in existentes]
+                cursor.executemany(SQL_ATUALIZA_JOGO, [(j.nome, j.categoria, j.console, j.id) for j in atualizar])
+                cursor.executemany(SQL_CRIA_JOGO_COM_ID, [
+                    (j.id, j.nome, j.categoria, j.console) for j in com_id if int(j.id) not in existentes])
+                insere_em_lote(cursor, sem_id, passo)
+            if mapa is not None:
+                mapa.jogos.update((int(jogo.id), jogo) for jogo in jogos)
+            self.__nova_versao()
+            for jogo in jogos:
+                for ouvinte in self.__ouvintes:
+                    ouvinte.jogo_salvo(jogo)
+            return {'inseridos': len(jogos) - len(atualizar), 'atualizados': len(atualizar)}
+        except Exception as e:
+            # Desfeita a transação, os IDs gerados nela não valem mais
+            for jogo in sem_id:
+                jogo.id = None
+            logger.error("Erro ao salvar jogos em lote: %s", e)
+            raise
+
+    @contextmanager
+    def unidade_de_trabalho(self):
+        """
+        Acumula inserções, atualizações e remoções de jogos e as grava ao
+        final do bloco, agrupadas (executemany e INSERTs de várias linhas) em
+        uma única transação, em vez de um commit por jogo:
+
+            with jogo_dao.unidade_de_trabalho() as unidade:
+                unidade.salvar(Jogo('Celeste', 'Indie', 'Switch'))
+                unidade.deletar(3)
+
+        Os jogos inseridos recebem os IDs gerados. Se o bloco lançar uma
+        exceção, nada é gravado; se a gravação falhar, a transação é desfeita
+        por inteiro.
+
+        Yields:
+            UnidadeDeTrabalho: Onde as escritas são enfileiradas.
+        """
+        unidade = UnidadeDeTrabalho()
+        yield unidade
+        if unidade:
+            self.__grava(unidade)
+
+    def __grava(self, unidade):
+        novos = unidade.novos
+        atualizar = list(unidade.alterados.values())
+        deletar = list(unidade.removidos)
+        try:
+            logger.info("Gravando unidade de trabalho: %d inserções, %d atualizações, %d remoções.",
+                        len(novos), len(atualizar), len(deletar))
+            mapa = self.__consulta()
+            passo = self.__db.passo_dos_ids()
+            with self.__db.transacao() as cursor:
+                for inicio in range(0, len(deletar), LINHAS_POR_INSERT):
+                    ids = deletar[inicio:inicio + LINHAS_POR_INSERT]
+                    cursor.execute(SQL_DELETA_JOGOS.format(marcadores=', '.join(['%s'] * len(ids))), ids)
+                cursor.executemany(SQL_ATUALIZA_JOGO, [(j.nome, j.categoria, j.console, j.id) for j in atualizar])
+                insere_em_lote(cursor, novos, passo)
+        except Exception as e:
+            for jogo in novos:
+                jogo.id = None
+            logger.error("Erro ao gravar unidade de trabalho: %s", e)
+            raise
+        if mapa is not None:
+            mapa.jogos.update((id, _AUSENTE) for id in deletar)
+            mapa.jogos.update((int(jogo.id), jogo) for jogo in atualizar + novos)
+        self.__nova_versao()
+        for ouvinte in self.__ouvintes:
+            for id in deletar:
+                ouvinte.jogo_deletado(id)
+            for jogo in atualizar + novos:
+                ouvinte.jogo_salvo(jogo)
+
+    def listar(self, gerador=False, lote=1000):
         """
         Lista todos os jogos do banco de dados.
 
+        No modo gerador, os jogos são lidos com um cursor sem buffer, em lotes
+        de `lote` linhas (fetchmany), e entregues um a um: a memória usada não
+        depende do tamanho do catálogo. A conexão fica presa ao gerador até ele
+        ser consumido por completo ou fechado.
+
+        Args:
+            gerador (bool): Devolve um gerador em vez de uma lista.
+            lote (int): Linhas lidas do banco por vez no modo gerador.
+
         Returns:
-            list: Lista de objetos Jogo.
+            list: Lista de objetos Jogo (ou gerador de objetos Jogo).
         """
+        if gerador:
+            return self.__itera_jogos(lote)
         try:
-            cursor = self.__db.connection.cursor()
-            cursor.execute(SQL_BUSCA_JOGOS)
-            jogos = traduz_jogos(cursor.fetchall())
+            self.__consulta()
+            with self.__db.cursor() as cursor:
+                cursor.execute(SQL_BUSCA_JOGOS)
+                jogos = traduz_jogos(cursor.fetchall())
             return jogos
         except Exception as e:
             logger.error("Erro ao listar jogos: %s", e)
             raise
 
+    def __itera_jogos(self, lote):
+        try:
+            self.__consulta()
+            with self.__db.cursor(sem_buffer=True) as cursor:
+                cursor.execute(SQL_BUSCA_JOGOS)
+                linhas = cursor.fetchmany(lote)
+                while linhas:
+                    yield from traduz_jogos(linhas)
+                    linhas = cursor.fetchmany(lote)
+        except Exception as e:
+            logger.error("Erro ao listar jogos: %s", e)
+            raise
+
+    def listar_pagina(self, apos=0, limite=50, categoria=None, console=None):
+        """
+        Lista uma página de jogos em ordem de ID, a partir do ID `apos`.
+
+        A consulta usa paginação por chave em vez de OFFSET, então o custo de
+        cada página não depende do tamanho do catálogo nem da página pedida.
+
+        Args:
+            apos (int): ID do último jogo da página anterior (0 para a primeira).
+            limite (int): Quantidade máxima de jogos na página.
+            categoria (str): Filtra pela categoria exata, se informada.
+            console (str): Filtra pelo console exato, se informado.
+
+        Returns:
+            tuple: Lista de objetos Jogo e o valor de `apos` da próxima página
+            (None se esta for a última).
+        """
+        filtros, parametros = '', [apos]
+        if categoria:
+            filtros += ' AND categoria = %s'
+            parametros.append(categoria)
+        if console:
+            filtros += ' AND console = %s'
+            parametros.append(console)
+        # Busca um jogo a mais só para saber se existe próxima página
+        parametros.append(limite + 1)
+        try:
+            mapa = self.__consulta()
+            with self.__db.cursor() as cursor:
+                cursor.execute(SQL_BUSCA_JOGOS_PAGINA.format(filtros=filtros), parametros)
+                jogos = traduz_jogos(cursor.fetchall())
+            if mapa is not None:
+                mapa.jogos.update((jogo.id, jogo) for jogo in jogos)
+            if len(jogos) > limite:
+                jogos = jogos[:limite]
+                return jogos, jogos[-1].id
+            return jogos, None
+        except Exception as e:
+            logger.error("Erro ao listar página de jogos: %s", e)
+            raise
+
     def busca_por_id(self, id):
         """
         Busca um jogo pelo ID.
@@ -76,17 +348,61 @@ class JogoDao:
         Returns:
             Jogo: Objeto Jogo correspondente ao ID, ou None se não encontrado.
         """
+        mapa = self.__mapa()
+        if mapa is not None and int(id) in mapa.jogos:
+            jogo = mapa.jogos[int(id)]
+            return None if jogo is _AUSENTE else jogo
         try:
-            cursor = self.__db.connection.cursor()
-            cursor.execute(SQL_JOGO_POR_ID, (id,))
-            tupla = cursor.fetchone()
-            if tupla:
-                return Jogo(tupla[1], tupla[2], tupla[3], id=tupla[0])
-            return None
+            self.__consulta()
+            with self.__db.cursor() as cursor:
+                cursor.execute(SQL_JOGO_POR_ID, (id,))
+                tupla = cursor.fetchone()
+            jogo = Jogo(tupla[1], tupla[2], tupla[3], id=tupla[0]) if tupla else None
+            if mapa is not None:
+                mapa.jogos[int(id)] = _AUSENTE if jogo is None else jogo
+            return jogo
         except Exception as e:
             logger.error("Erro ao buscar jogo por ID: %s", e)
             raise
 
+    def busca_por_ids(self, ids, lote=500):
+        """
+        Busca vários jogos de uma vez, com uma consulta `IN (...)` a cada
+        `lote` IDs em vez de uma por ID. IDs já lidos na requisição vêm do
+        mapa de identidade, sem ir ao banco.
+
+        Args:
+            ids (iterable): IDs dos jogos.
+            lote (int): Máximo de IDs por consulta.
+
+        Returns:
+            dict: ID -> objeto Jogo, só com os IDs encontrados.
+        """
+        mapa = self.__mapa()
+        encontrados, faltantes = {}, []
+        for id in dict.fromkeys(int(id) for id in ids):
+            jogo = mapa.jogos.get(id) if mapa is not None else None
+            if jogo is None:
+                faltantes.append(id)
+            elif jogo is not _AUSENTE:
+                encontrados[id] = jogo
+        if not faltantes:
+            return encontrados
+        try:
+            with self.__db.cursor() as cursor:
+                for inicio in range(0, len(faltantes), lote):
+                    pedidos = faltantes[inicio:inicio + lote]
+                    self.__consulta()
+                    cursor.execute(SQL_JOGOS_POR_IDS.format(marcadores=', '.join(['%s'] * len(pedidos))), pedidos)
+                    for jogo in traduz_jogos(cursor.fetchall()):
+                        encontrados[jogo.id] = jogo
+        except Exception as e:
+            logger.error("Erro ao buscar jogos por IDs: %s", e)
+            raise
+        if mapa is not None:
+            mapa.jogos.update((id, encontrados.get(id, _AUSENTE)) for id in faltantes)
+        return encontrados
+
     def deletar(self, id):
         """
         Deleta um jogo pelo ID.
@@ -96,23 +412,31 @@ class JogoDao:
         """
         try:
             logger.info("Deletando jogo com ID: %s", id)
-            self.__db.connection.cursor().execute(SQL_DELETA_JOGO, (id,))
-            self.__db.connection.commit()
+            mapa = self.__consulta()
+            with self.__db.transacao() as cursor:
+                cursor.execute(SQL_DELETA_JOGO, (id,))
+            if mapa is not None:
+                mapa.jogos[int(id)] = _AUSENTE
+            self.__nova_versao()
+            for ouvinte in self.__ouvintes:
+                ouvinte.jogo_deletado(id)
         except Exception as e:
             logger.error("Erro ao deletar jogo: %s", e)
-            self.__db.connection.rollback()
             raise
 
 
 class UsuarioDao:
-    def __init__(self, db):
+    def __init__(self, db, mapa_de_identidade=_sem_mapa):
         """
         Classe para gerenciar operações no banco de dados relacionadas a usuários.
 
         Args:
-            db: Objeto de conexão ao banco de dados.
+            db (PoolDeConexoes): Pool de conexões ao banco de dados.
+            mapa_de_identidade (callable): Devolve o MapaDeIdentidade da
+                requisição atual, ou None fora de uma requisição.
         """
         self.__db = db
+        self.__mapa = mapa_de_identidade
 
     def buscar_por_id(self, id):
         """
@@ -124,16 +448,50 @@ class UsuarioDao:
         Returns:
             Usuario: Objeto Usuario correspondente ao ID, ou None se não encontrado.
         """
+        mapa = self.__mapa()
+        if mapa is not None and id in mapa.usuarios:
+            usuario = mapa.usuarios[id]
+            return None if usuario is _AUSENTE else usuario
         try:
-            cursor = self.__db.connection.cursor()
-            cursor.execute(SQL_USUARIO_POR_ID, (id,))
-            dados = cursor.fetchone()
-            return traduz_usuario(dados) if dados else None
+            if mapa is not None:
+                mapa.consultas += 1
+            with self.__db.cursor() as cursor:
+                cursor.execute(SQL_USUARIO_POR_ID, (id,))
+                dados = cursor.fetchone()
+            usuario = traduz_usuario(dados) if dados else None
+            if mapa is not None:
+                mapa.usuarios[id] = _AUSENTE if usuario is None else usuario
+            return usuario
         except Exception as e:
             logger.error("Erro ao buscar usuário por ID: %s", e)
             raise
 
 
+def insere_em_lote(cursor, jogos, passo=1):
+    """
+    Insere jogos sem ID com INSERTs de até LINHAS_POR_INSERT linhas e
+    preenche os IDs gerados.
+
+    Num INSERT simples de várias linhas, os IDs gerados são consecutivos
+    (o InnoDB reserva o bloco inteiro de uma vez; no SQLite só há um escritor)
+    e o lastrowid é o da primeira linha, como no MySQLdb. Consecutivos no
+    passo do banco: no MySQL, de auto_increment_increment em
+    auto_increment_increment.
+
+    Args:
+        cursor: Cursor de uma transação aberta.
+        jogos (list): Objetos Jogo sem ID.
+        passo (int): Intervalo entre IDs gerados seguidos
+            (PoolDeConexoes.passo_dos_ids).
+    """
+    for inicio in range(0, len(jogos), LINHAS_POR_INSERT):
+        parte = jogos[inicio:inicio + LINHAS_POR_INSERT]
+        cursor.execute(SQL_CRIA_JOGOS.format(valores=', '.join(['(%s, %s, %s)'] * len(parte))),
+                       [valor for jogo in parte for valor in (jogo.nome, jogo.categoria, jogo.console)])
+        for deslocamento, jogo in enumerate(parte):
+            jogo.id = cursor.lastrowid + deslocamento * passo
+
+
 def traduz_jogos(jogos):
     """
     Converte uma lista de tuplas do banco de dados em objetos Jogo.
@@ -144,10 +502,7 @@ def traduz_jogos(jogos):
     Returns:
         list: Lista de objetos Jogo.
     """
-    def cria_jogo_com_tupla(tupla):
-        return Jogo(tupla[1], tupla[2], tupla[3], id=tupla[0])
-
-    return list(map(cria_jogo_com_tupla, jogos))
+    return [Jogo(nome, categoria, console, id) for id, nome, categoria, console in jogos]
 
 
 def traduz_usuario(tupla):
@@ -0,0 +1,211 @@
+import csv
+import io
+import json
+import logging
+import re
+from models import Jogo
+
+logger = logging.getLogger(__name__)
+
+CAMPOS = ('id', 'nome', 'categoria', 'console')
+# Tamanho máximo de cada campo, como nas colunas da tabela jogo
+TAMANHOS = {'nome': 50, 'categoria': 40, 'console': 20}
+FORMATOS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+# Bytes que não são UTF-8 válido, lidos com errors='surrogateescape'
+_BYTES_INVALIDOS = re.compile('[\udc80-\udcff]')
+ERRO_DE_CODIFICACAO = 'texto que não está em UTF-8'
+
+
+def formato_do_arquivo(nome_arquivo, padrao='csv'):
+    """
+    Formato (csv ou ndjson) pela extensão do arquivo.
+    """
+    extensao = nome_arquivo.rsplit('.', 1)[-1].lower() if '.' in nome_arquivo else ''
+    if extensao in ('ndjson', 'jsonl'):
+        return 'ndjson'
+    return 'csv' if extensao == 'csv' else padrao
+
+
+def le_registros(arquivo, formato):
+    """
+    Lê o arquivo aos poucos, um registro por vez, sem carregá-lo inteiro.
+
+    Linhas com bytes que não são UTF-8 ou que o módulo csv não consegue ler
+    são devolvidas como erro, e a leitura continua na linha seguinte.
+
+    Args:
+        arquivo: Arquivo binário (por exemplo, o stream de um upload).
+        formato (str): 'csv' (com cabeçalho) ou 'ndjson' (um objeto por linha).
+
+    Yields:
+        tuple: Número da linha, e o registro (dict) ou a mensagem de erro (str).
+    """
+    texto = io.TextIOWrapper(arquivo, encoding='utf-8-sig', errors='surrogateescape', newline='')
+    if formato == 'csv':
+        # Linhas entregues ao leitor: depois de um csv.Error, o line_num do
+        # próprio leitor ainda não conta a linha com erro
+        lidas = 0
+
+        def conta_linhas():
+            nonlocal lidas
+            for linha in texto:
+                lidas += 1
+                yield linha
+
+        leitor = csv.DictReader(conta_linhas())
+        while True:
+            try:
+                registro = next(leitor)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield lidas, f'CSV inválido: {e}'
+                continue
+            if None in registro:
+                yield lidas, 'colunas a mais que o cabeçalho'
+            elif any(_BYTES_INVALIDOS.search(valor or '') for valor in [*registro, *registro.values()]):
+                yield lidas, ERRO_DE_CODIFICACAO
+            else:
+                yield lidas, registro
+    for numero, linha in enumerate(texto, 1):
+        if not linha.strip():
+            continue
+        if _BYTES_INVALIDOS.search(linha):
+            yield numero, ERRO_DE_CODIFICACAO
+            continue
+        try:
+            registro = json.loads(linha)
+        except ValueError as e:
+            yield numero, f'JSON inválido: {e}'
+            continue
+        yield numero, registro if isinstance(registro, dict) else 'a linha não é um objeto JSON'
+
+
+def valida(registro):
+    """
+    Converte um registro lido em Jogo.
+
+    Raises:
+        ValueError: Com a mensagem do problema encontrado.
+    """
+    valores = {}
+    for campo, tamanho in TAMANHOS.items():
+        valor = registro.get(campo)
+        valor = '' if valor is None else str(valor).strip()
+        if not valor:
+            raise ValueError(f'campo "{campo}" vazio')
+        if len(valor) > tamanho:
+            raise ValueError(f'campo "{campo}" com mais de {tamanho} caracteres')
+        valores[campo] = valor
+    id = registro.get('id')
+    if id in (None, ''):
+        id = None
+    elif isinstance(id, bool):
+        raise ValueError(f'id inválido: {id!r}')
+    else:
+        try:
+            id = int(id)
+        except (TypeError, ValueError):
+            raise ValueError(f'id inválido: {id!r}')
+        if id <= 0:
+            raise ValueError(f'id inválido: {id!r}')
+    return Jogo(valores['nome'], valores['categoria'], valores['console'], id=id)
+
+
+def importar(jogo_dao, arquivo, formato, lote=1000, maximo_de_erros=1000):
+    """
+    Importa jogos de um arquivo CSV ou NDJSON, inserindo os novos e
+    atualizando os que já existem (pelo id), uma transação a cada `lote`
+    jogos válidos.
+
+    Linhas inválidas não interrompem a importação: entram no relatório com o
+    número da linha e o motivo. Se um lote falhar no banco, os jogos dele
+    são salvos um a um, para apontar quais linhas falharam.
+
+    Args:
+        jogo_dao (JogoDao): DAO usado para salvar.
+        arquivo: Arquivo binário a importar.
+        formato (str): 'csv' ou 'ndjson'.
+        lote (int): Jogos por transação.
+        maximo_de_erros (int): Erros detalhados no relatório (os demais só
+            são contados).
+
+    Returns:
+        dict: Linhas lidas, jogos inseridos e atualizados, total de erros e
+        a lista de erros ({'linha', 'erro'}).
+    """
+    relatorio = {'linhas': 0, 'inseridos': 0, 'atualizados': 0, 'total_de_erros': 0, 'erros': []}
+
+    def erro(numero, mensagem):
+        relatorio['total_de_erros'] += 1
+        if len(relatorio['erros']) < maximo_de_erros:
+            relatorio['erros'].append({'linha': numero, 'erro': mensagem})
+
+    def salva(pendentes):
+        try:
+            contagem = jogo_dao.salvar_varios([jogo for _, jogo in pendentes])
+        except Exception:
+            contagem = {'inseridos': 0, 'atualizados': 0}
+            for numero, jogo in pendentes:
+                try:
+                    parcial = jogo_dao.salvar_varios([jogo])
+                except Exception as e:
+                    erro(numero, f'erro ao salvar: {e}')
+                    continue
+                contagem['inseridos'] += parcial['inseridos']
+                contagem['atualizados'] += parcial['atualizados']
+        relatorio['inseridos'] += contagem['inseridos']
+        relatorio['atualizados'] += contagem['atualizados']
+
+    pendentes = []
+    for numero, registro in le_registros(arquivo, formato):
+        relatorio['linhas'] += 1
+        if isinstance(registro, str):
+            erro(numero, registro)
+            continue
+        try:
+            pendentes.append((numero, valida(registro)))
+        except ValueError as e:
+            erro(numero, str(e))
+            continue
+        if len(pendentes) >= lote:
+            salva(pendentes)
+            pendentes = []
+    if pendentes:
+        salva(pendentes)
+    logger.info("Importação: %d linhas, %d inseridos, %d atualizados, %d erros", relatorio['linhas'],
+                relatorio['inseridos'], relatorio['atualizados'], relatorio['total_de_erros'])
+    return relatorio
+
+
+def exportar(jogo_dao, formato, lote=1000):
+    """
+    Gera o catálogo inteiro em CSV ou NDJSON, em pedaços de `lote` jogos: a
+    memória usada não depende do tamanho do catálogo.
+
+    Cada pedaço é uma página do JogoDao.listar_pagina (paginação por ID), lida
+    em uma consulta curta. Nenhuma conexão do pool fica presa enquanto o
+    cliente recebe o arquivo, por mais lento que ele seja; em troca, o
+    arquivo não é um retrato de um único instante (jogos alterados durante a
+    exportação podem sair com a versão de antes ou de depois da alteração).
+
+    Yields:
+        str: Pedaços do arquivo exportado.
+    """
+    buffer = io.StringIO()
+    if formato == 'csv':
+        escritor = csv.writer(buffer, lineterminator='\n')
+        escritor.writerow(CAMPOS)
+        escreve = lambda jogo: escritor.writerow((jogo.id, jogo.nome, jogo.categoria, jogo.console))
+    else:
+        escreve = lambda jogo: buffer.write(json.dumps(
+            {'id': jogo.id, 'nome': jogo.nome, 'categoria': jogo.categoria, 'console': jogo.console},
+            ensure_ascii=False) + '\n')
+    apos = 0
+    while apos is not None:
+        jogos, apos = jogo_dao.listar_pagina(apos, lote)
+        for jogo in jogos:
+            escreve(jogo)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
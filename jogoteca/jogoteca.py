@@ -1,12 +1,36 @@
+import os
+import sys
+import click
 from flask import Flask
-from flask_mysqldb import MySQL
+from pool import criar_pool
 
 app = Flask(__name__)
 app.config.from_pyfile('config.py')
 
-db = MySQL(app)
+# Pool de conexões compartilhado pelos DAOs
+db = criar_pool(app.config)
 
 from views import *
+import comandos
+
+
+def importado_por_servidor_wsgi():
+    """
+    Indica se o módulo foi importado por um servidor WSGI (gunicorn, uwsgi...),
+    e não por um comando "flask" (inclusive "flask run") ou por
+    "python jogoteca.py", em que o processo do reloader também o importa sem
+    servir requisições.
+    """
+    principal = getattr(sys.modules['__main__'], '__file__', None)
+    executado_como_script = principal is not None and os.path.abspath(principal) == os.path.abspath(__file__)
+    return click.get_current_context(silent=True) is None and not executado_como_script
+
+
+# Trava o manifesto de capas já na inicialização: um segundo processo (ex.:
+# gunicorn -w 2) falha ao subir com ArmazemEmUsoError, em vez de responder 500
+# em toda página. Nos demais casos o manifesto é carregado no primeiro uso
+if importado_por_servidor_wsgi():
+    armazem_de_capas.carregar()
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
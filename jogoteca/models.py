@@ -1,4 +1,7 @@
 class Jogo:
+    # Sem __dict__ por instância: listagens grandes ocupam bem menos memória
+    __slots__ = ('id', 'nome', 'categoria', 'console')
+
     def __init__(self, nome, categoria, console, id=None):
         self.id = id
         self.nome = nome
@@ -29,6 +32,8 @@ class Jogo:
 
 
 class Usuario:
+    __slots__ = ('id', 'nome', 'senha')
+
     def __init__(self, id, nome, senha):
         self.id = id
         self.nome = nome
@@ -0,0 +1,262 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PoolEsgotadoError(Exception):
+    """Nenhuma conexão ficou livre dentro do tempo de espera do pool."""
+
+
+class PoolDeConexoes:
+    def __init__(self, conecta, minimo=1, maximo=10, reciclar=1800, pre_ping=True, timeout=30,
+                 cursor_sem_buffer=None, passo_dos_ids=None):
+        """
+        Pool de conexões usado pelos DAOs no lugar da conexão por requisição
+        do flask_mysqldb.
+
+        As conexões livres são reaproveitadas (a mais recente primeiro). Ao
+        serem retiradas, as que passaram de `reciclar` segundos são trocadas
+        por novas e, com `pre_ping`, as que não respondem são descartadas.
+
+        Args:
+            conecta (callable): Função sem argumentos que abre uma nova conexão.
+            minimo (int): Conexões abertas já na criação do pool.
+            maximo (int): Limite de conexões abertas ao mesmo tempo.
+            reciclar (int): Idade máxima de uma conexão, em segundos (0 desativa).
+            pre_ping (bool): Testa a conexão com ping() antes de entregá-la.
+            timeout (float): Espera máxima por uma conexão livre, em segundos.
+            cursor_sem_buffer (callable): Recebe uma conexão e abre um cursor
+                que lê as linhas do servidor sob demanda (padrão: cursor()).
+            passo_dos_ids (callable): Recebe uma conexão e devolve o intervalo
+                entre IDs gerados seguidos pelo banco (padrão: 1).
+        """
+        self.__conecta = conecta
+        self.__cursor_sem_buffer = cursor_sem_buffer or (lambda conexao: conexao.cursor())
+        self.__le_passo_dos_ids = passo_dos_ids or (lambda conexao: 1)
+        self.__passo_dos_ids = None
+        self.maximo = maximo
+        self.reciclar = reciclar
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+        self.__livres = deque()  # (conexao, criada_em)
+        self.__vagas = threading.BoundedSemaphore(maximo)
+        self.__lock = threading.Lock()
+        self.__fechado = False
+        self.__contadores = {'criadas': 0, 'recicladas': 0, 'descartadas': 0, 'em_uso': 0}
+        for _ in range(minimo):
+            self.__livres.append(self.__nova())
+
+    def __nova(self):
+        conexao = self.__conecta()
+        with self.__lock:
+            self.__contadores['criadas'] += 1
+        return conexao, time.monotonic()
+
+    def __descarta(self, conexao, motivo):
+        with self.__lock:
+            self.__contadores[motivo] += 1
+        try:
+            conexao.close()
+        except Exception as e:
+            logger.warning("Erro ao fechar conexão do pool: %s", e)
+
+    def __responde(self, conexao):
+        try:
+            conexao.ping()
+            return True
+        except Exception as e:
+            logger.warning("Conexão do pool não respondeu ao ping: %s", e)
+            return False
+
+    def __retira(self):
+        if not self.__vagas.acquire(timeout=self.timeout):
+            raise PoolEsgotadoError(f'Nenhuma das {self.maximo} conexões ficou livre em {self.timeout}s')
+        try:
+            while True:
+                with self.__lock:
+                    item = self.__livres.pop() if self.__livres else None
+                if item is None:
+                    item = self.__nova()
+                    break
+                conexao, criada_em = item
+                if self.reciclar and time.monotonic() - criada_em > self.reciclar:
+                    self.__descarta(conexao, 'recicladas')
+                elif self.pre_ping and not self.__responde(conexao):
+                    self.__descarta(conexao, 'descartadas')
+                else:
+                    break
+        except Exception:
+            self.__vagas.release()
+            raise
+        with self.__lock:
+            self.__contadores['em_uso'] += 1
+        return item
+
+    def __devolve(self, item):
+        conexao = item[0]
+        try:
+            # Encerra a transação aberta por leituras, para a próxima retirada
+            # não enxergar um snapshot antigo
+            conexao.rollback()
+            with self.__lock:
+                fechado = self.__fechado
+                if not fechado:
+                    self.__livres.append(item)
+            if fechado:
+                conexao.close()
+        except Exception as e:
+            logger.warning("Conexão descartada na devolução ao pool: %s", e)
+            self.__descarta(conexao, 'descartadas')
+        finally:
+            with self.__lock:
+                self.__contadores['em_uso'] -= 1
+            self.__vagas.release()
+
+    @contextmanager
+    def conexao(self):
+        """
+        Retira uma conexão do pool e a devolve ao final do bloco.
+        """
+        item = self.__retira()
+        try:
+            yield item[0]
+        finally:
+            self.__devolve(item)
+
+    @contextmanager
+    def cursor(self, sem_buffer=False):
+        """
+        Cursor para leituras; o cursor é fechado e a conexão devolvida ao final.
+
+        Com `sem_buffer`, o resultado não é trazido inteiro para a memória na
+        execução: as linhas são lidas do servidor conforme o fetchmany/fetchone.
+        """
+        with self.conexao() as conexao:
+            cursor = self.__cursor_sem_buffer(conexao) if sem_buffer else conexao.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transacao(self):
+        """
+        Cursor para escritas: faz commit ao final do bloco ou rollback se
+        houver exceção.
+        """
+        with self.conexao() as conexao:
+            cursor = conexao.cursor()
+            try:
+                yield cursor
+                conexao.commit()
+            except Exception:
+                conexao.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def passo_dos_ids(self):
+        """
+        Intervalo entre IDs gerados seguidos pelo banco, lido na primeira
+        chamada e guardado para as seguintes. Retira uma conexão do pool na
+        primeira chamada: não deve ser chamado dentro de uma transação.
+        """
+        if self.__passo_dos_ids is None:
+            with self.conexao() as conexao:
+                self.__passo_dos_ids = self.__le_passo_dos_ids(conexao)
+        return self.__passo_dos_ids
+
+    def estatisticas(self):
+        with self.__lock:
+            return {**self.__contadores, 'livres': len(self.__livres)}
+
+    def fechar(self):
+        """
+        Fecha as conexões livres. As que estão em uso (e as retiradas depois
+        disto) são fechadas na devolução, em vez de voltarem ao pool.
+        """
+        with self.__lock:
+            self.__fechado = True
+            livres, self.__livres = list(self.__livres), deque()
+        for conexao, _ in livres:
+            conexao.close()
+
+
+def conecta_mysql(config):
+    """
+    Devolve a função que abre conexões MySQL com os parâmetros do config.py.
+    """
+    def conecta():
+        import MySQLdb
+        return MySQLdb.connect(
+            host=config['MYSQL_HOST'], user=config['MYSQL_USER'], passwd=config['MYSQL_PASSWORD'],
+            db=config['MYSQL_DB'], port=config['MYSQL_PORT'], charset='utf8',
+        )
+    return conecta
+
+
+def cursor_sem_buffer_mysql(conexao):
+    """
+    SSCursor do MySQLdb: o resultado fica no servidor e é lido sob demanda.
+    """
+    from MySQLdb.cursors import SSCursor
+    return conexao.cursor(SSCursor)
+
+
+def passo_dos_ids_mysql(conexao):
+    """
+    auto_increment_increment do servidor: com replicação multi-master (ou
+    Galera) os IDs gerados andam de N em N, não de 1 em 1.
+    """
+    cursor = conexao.cursor()
+    try:
+        cursor.execute('SELECT @@auto_increment_increment')
+        return int(cursor.fetchone()[0])
+    finally:
+        cursor.close()
+
+
+def conecta_sqlite(caminho):
+    """
+    Devolve a função que abre conexões com o substituto SQLite (banco_sqlite.py),
+    criando as tabelas se necessário.
+    """
+    from banco_sqlite import ConexaoSQLite, cria_tabelas
+
+    def conecta():
+        conexao = ConexaoSQLite(caminho)
+        cria_tabelas(conexao)
+        return conexao
+    return conecta
+
+
+def criar_pool(config):
+    """
+    Cria o pool de conexões a partir do config.py (DB_BACKEND e POOL_*).
+
+    Args:
+        config (dict): Configuração da aplicação.
+
+    Returns:
+        PoolDeConexoes: Pool usado pelos DAOs.
+    """
+    if config['DB_BACKEND'] == 'sqlite':
+        # Os cursores do sqlite3 já leem as linhas sob demanda e os IDs
+        # gerados andam sempre de 1 em 1
+        conecta, cursor_sem_buffer, passo_dos_ids = conecta_sqlite(config['SQLITE_PATH']), None, None
+    else:
+        conecta, cursor_sem_buffer, passo_dos_ids = conecta_mysql(config), cursor_sem_buffer_mysql, passo_dos_ids_mysql
+    return PoolDeConexoes(
+        conecta,
+        minimo=config['POOL_MINIMO'],
+        maximo=config['POOL_MAXIMO'],
+        reciclar=config['POOL_RECICLAR'],
+        pre_ping=config['POOL_PRE_PING'],
+        timeout=config['POOL_TIMEOUT'],
+        cursor_sem_buffer=cursor_sem_buffer,
+        passo_dos_ids=passo_dos_ids,
+    )
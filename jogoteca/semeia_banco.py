@@ -0,0 +1,176 @@
+"""
+Gera um catálogo sintético grande (jogos e usuários) para testes de carga e
+perfilamento, sobre o banco recriado pelo prepara_banco.py.
+
+Os dados saem de uma semente fixa: a mesma semente e as mesmas quantidades
+geram sempre as mesmas linhas, com qualquer número de workers. Os workers
+produzem os lotes de linhas em paralelo e o processo principal grava cada
+lote com INSERTs de várias linhas, uma transação por lote. Os índices
+secundários da tabela jogo só são criados depois da carga.
+
+Uso:
+    python semeia_banco.py --jogos 2000000 --usuarios 100000 --sqlite jogoteca.db
+"""
+import argparse
+import multiprocessing
+import random
+import string
+import time
+
+from banco_sqlite import INDICES_JOGO
+from prepara_banco import conecta_mysql, conecta_sqlite, jogos, usuarios
+
+# Vocabulário dos nomes gerados
+PREFIXOS = ['Super', 'Mega', 'Ultra', 'Final', 'Legend of', 'Rise of', 'Return to', 'Shadow of', 'Age of',
+            'Tales of', 'Dawn of', 'World of', 'Call of', 'Crash', 'Grand', 'Little', 'Dark', 'Red', 'Star']
+NUCLEOS = ['Mario', 'Dragon', 'Fantasy', 'Kingdom', 'Knight', 'Racer', 'Soccer', 'Warrior', 'Galaxy',
+           'Ninja', 'Empire', 'Hero', 'Quest', 'Legends', 'Souls', 'Odyssey', 'Frontier', 'Island', 'Tactics']
+SUFIXOS = ['', '', '', ' II', ' III', ' 4', ' HD', ' Deluxe', ' Remastered', ' Origins', ' Chronicles', ' Online']
+NOMES = ['Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela', 'João',
+         'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael', 'Sofia', 'Thiago', 'Vitória', 'Yuri']
+SOBRENOMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Rodrigues', 'Almeida',
+              'Nascimento', 'Araújo', 'Ribeiro', 'Carvalho', 'Gomes', 'Martins', 'Rocha', 'Barbosa']
+# Categorias e consoles com pesos, para os filtros terem seletividades diferentes
+CATEGORIAS = {'Ação': 20, 'Aventura': 15, 'RPG': 14, 'Esporte': 10, 'Corrida': 9, 'Estratégia': 8,
+              'Indie': 8, 'Luta': 6, 'Simulação': 6, 'Terror': 4}
+CONSOLES = {'PC': 25, 'PS4': 15, 'PS5': 14, 'Switch': 14, 'Xbox One': 10, 'Xbox Series': 10,
+            '3DS': 5, 'SNES': 4, 'Mega Drive': 3}
+CARACTERES_DA_SENHA = string.ascii_letters + string.digits
+
+
+def gera_lote_de_jogos(pedido):
+    """
+    Gera o lote `numero` de jogos. Cada lote tem seu próprio gerador
+    aleatório, derivado da semente, para o resultado não depender da ordem
+    em que os workers terminam.
+    """
+    semente, numero, quantidade = pedido
+    rng = random.Random(f'{semente}-jogo-{numero}')
+    categorias = rng.choices(list(CATEGORIAS), weights=list(CATEGORIAS.values()), k=quantidade)
+    consoles = rng.choices(list(CONSOLES), weights=list(CONSOLES.values()), k=quantidade)
+    return [
+        (f'{rng.choice(PREFIXOS)} {rng.choice(NUCLEOS)}{rng.choice(SUFIXOS)}'[:50], categoria, console)
+        for categoria, console in zip(categorias, consoles)
+    ]
+
+
+def gera_lote_de_usuarios(pedido):
+    """
+    Gera o lote `numero` de usuários, com IDs únicos de 8 caracteres
+    ('u' + o número do usuário em hexadecimal).
+    """
+    semente, numero, quantidade, primeiro = pedido
+    rng = random.Random(f'{semente}-usuario-{numero}')
+    return [
+        (f'u{primeiro + i:07x}', f'{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}'[:20],
+         ''.join(rng.choices(CARACTERES_DA_SENHA, k=8)))
+        for i in range(quantidade)
+    ]
+
+
+def insere(cursor, tabela, colunas, linhas, linhas_por_insert):
+    """
+    Grava as linhas com INSERTs de até `linhas_por_insert` linhas cada.
+    """
+    valores = '(' + ', '.join(['%s'] * len(colunas)) + ')'
+    sql_cheio = f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES " + ', '.join([valores] * linhas_por_insert)
+    for inicio in range(0, len(linhas), linhas_por_insert):
+        parte = linhas[inicio:inicio + linhas_por_insert]
+        sql = sql_cheio if len(parte) == linhas_por_insert else \
+            f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES " + ', '.join([valores] * len(parte))
+        cursor.execute(sql, [valor for linha in parte for valor in linha])
+
+
+def remove_indices(cursor, mysql):
+    for nome, _ in INDICES_JOGO:
+        cursor.execute(f'DROP INDEX {nome} ON jogo' if mysql else f'DROP INDEX {nome}')
+
+
+def cria_indices(cursor):
+    for nome, colunas in INDICES_JOGO:
+        cursor.execute(f'CREATE INDEX {nome} ON jogo ({colunas})')
+
+
+def carrega(conn, cursor, tabela, colunas, gerador, pedidos, workers, linhas_por_insert):
+    """
+    Produz os lotes com `workers` processos (ou no próprio processo, com 1)
+    e grava cada um em uma transação.
+
+    Returns:
+        tuple: Linhas gravadas e segundos gastos.
+    """
+    inicio = time.perf_counter()
+    total = 0
+    if workers > 1:
+        pool = multiprocessing.get_context('spawn').Pool(workers)
+        # imap mantém a ordem dos lotes: os IDs saem iguais a cada execução
+        lotes = pool.imap(gerador, pedidos)
+    else:
+        pool, lotes = None, map(gerador, pedidos)
+    try:
+        for linhas in lotes:
+            insere(cursor, tabela, colunas, linhas, linhas_por_insert)
+            conn.commit()
+            total += len(linhas)
+    finally:
+        if pool:
+            pool.terminate()
+    return total, time.perf_counter() - inicio
+
+
+def pedidos_em_lotes(semente, quantidade, lote, com_primeiro=False):
+    for numero, inicio in enumerate(range(0, quantidade, lote)):
+        tamanho = min(lote, quantidade - inicio)
+        yield (semente, numero, tamanho, inicio) if com_primeiro else (semente, numero, tamanho)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--jogos', type=int, default=1000000, help='Jogos gerados')
+    parser.add_argument('--usuarios', type=int, default=100000, help='Usuários gerados')
+    parser.add_argument('--semente', type=int, default=42, help='Semente dos dados gerados')
+    parser.add_argument('--sqlite', metavar='CAMINHO', help='Grava no banco SQLite substituto em vez do MySQL')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='Processos que geram as linhas')
+    parser.add_argument('--lote', type=int, default=50000, help='Linhas por lote (uma transação por lote)')
+    parser.add_argument('--linhas-por-insert', type=int, default=500, help='Linhas em cada INSERT')
+    args = parser.parse_args()
+
+    conn, cursor = conecta_sqlite(args.sqlite) if args.sqlite else conecta_mysql()
+    if args.sqlite:
+        # A carga pode ser refeita do zero em caso de falha: dispensa o fsync
+        cursor.execute('PRAGMA synchronous=OFF')
+
+    # Dados iniciais do prepara_banco.py (usuários de login e jogos de exemplo)
+    cursor.executemany("INSERT INTO usuario (id, nome, senha) VALUES (%s, %s, %s)", usuarios)
+    cursor.executemany("INSERT INTO jogo (nome, categoria, console) VALUES (%s, %s, %s)", jogos)
+    conn.commit()
+
+    remove_indices(cursor, mysql=not args.sqlite)
+    resultado = {'semente': args.semente, 'workers': args.workers}
+
+    total, segundos = carrega(
+        conn, cursor, 'jogo', ('nome', 'categoria', 'console'), gera_lote_de_jogos,
+        pedidos_em_lotes(args.semente, args.jogos, args.lote), args.workers, args.linhas_por_insert)
+    resultado['jogos'] = {'linhas': total, 'segundos': round(segundos, 2), 'linhas_por_s': round(total / segundos)}
+
+    if args.usuarios:
+        total, segundos = carrega(
+            conn, cursor, 'usuario', ('id', 'nome', 'senha'), gera_lote_de_usuarios,
+            pedidos_em_lotes(args.semente, args.usuarios, args.lote, com_primeiro=True),
+            args.workers, args.linhas_por_insert)
+        resultado['usuarios'] = {'linhas': total, 'segundos': round(segundos, 2),
+                                 'linhas_por_s': round(total / segundos)}
+
+    inicio = time.perf_counter()
+    cria_indices(cursor)
+    conn.commit()
+    resultado['indices_segundos'] = round(time.perf_counter() - inicio, 2)
+    print(resultado)
+
+    cursor.close()
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,79 @@
-from flask import render_template, request, redirect, session, flash, url_for, send_from_directory
-from dao import JogoDao, UsuarioDao
+from flask import render_template, request, redirect, session, flash, url_for, send_from_directory, g, has_request_context, \
+    Response
+from dao import JogoDao, UsuarioDao, MapaDeIdentidade
+from busca import IndiceDeBusca
+from cache_de_paginas import CacheDePaginas
+from capas import ArmazemDeCapas, eh_imutavel
+from importacao import FORMATOS, exportar, formato_do_arquivo, importar
 from models import Jogo
-import os
 from jogoteca import db, app
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def mapa_de_identidade():
+    """
+    Mapa de identidade da requisição atual (None fora de requisições, como
+    no carregamento do índice de busca).
+    """
+    return g.get('mapa_de_identidade') if has_request_context() else None
+
+
+jogo_dao = JogoDao(db, mapa_de_identidade)
+usuario_dao = UsuarioDao(db, mapa_de_identidade)
+
+# Índice de busca em memória: carregado na primeira busca (e não na importação
+# do módulo, que também acontece nos comandos "flask") e atualizado pelo JogoDao
+indice_de_busca = IndiceDeBusca(lambda: jogo_dao.listar(gerador=True))
+jogo_dao.registrar_ouvinte(indice_de_busca)
+
+# Capas armazenadas pelo hash do conteúdo, com variantes redimensionadas
+# geradas em segundo plano após o upload. O manifesto é carregado (e travado
+# para este processo) por jogoteca.py sob um servidor WSGI, ou no primeiro uso
+armazem_de_capas = ArmazemDeCapas(app.config['UPLOAD_PATH'], app.config['CAPAS_MANIFESTO'],
+                                  app.config['CAPAS_VARIANTES'], app.config['CAPAS_TRABALHADORES'])
+
+# Páginas renderizadas da listagem e da busca, válidas até a próxima escrita
+# no catálogo ou a próxima alteração de capas (as miniaturas aparecem na lista)
+cache_de_paginas = CacheDePaginas(
+    lambda: (jogo_dao.versao_do_catalogo(), armazem_de_capas.versao()), app.config['PAGINAS_EM_CACHE'],
+    app.config['PAGINAS_VALIDADE'])
+
+@app.before_request
+def abre_mapa_de_identidade():
+    g.mapa_de_identidade = MapaDeIdentidade()
+
+
+@app.after_request
+def registra_consultas(resposta):
+    mapa = mapa_de_identidade()
+    if mapa is not None:
+        logger.debug("%s %s: %d consulta(s) ao banco", request.method, request.path, mapa.consultas)
+    return resposta
 
-jogo_dao = JogoDao(db)
-usuario_dao = UsuarioDao(db)
 
 @app.route('/')
+@cache_de_paginas.em_cache
 def index():
-    lista = jogo_dao.listar()
-    return render_template('lista.html', titulo='Jogos', jogos=lista)
+    apos = request.args.get('apos', 0, type=int)
+    categoria = request.args.get('categoria', '').strip()
+    console = request.args.get('console', '').strip()
+    lista, proxima = jogo_dao.listar_pagina(apos, app.config['JOGOS_POR_PAGINA'], categoria, console)
+    return render_template('lista.html', titulo='Jogos', jogos=lista, proxima=proxima,
+                           categoria=categoria, console=console, miniaturas=miniaturas(lista))
+
+
+@app.route('/busca')
+@cache_de_paginas.em_cache
+def busca():
+    consulta = request.args.get('q', '').strip()
+    lista = indice_de_busca.buscar(consulta, app.config['RESULTADOS_DA_BUSCA'])
+    return render_template('lista.html', titulo='Busca', jogos=lista, busca=consulta, miniaturas=miniaturas(lista))
+
+
+def miniaturas(jogos):
+    return {jogo.id: armazem_de_capas.variante(jogo.id, 'miniatura') for jogo in jogos}
 
 
 @app.route('/novo')
@@ -28,8 +91,7 @@ def criar():
     jogo = Jogo(nome, categoria, console)
     jogo = jogo_dao.salvar(jogo)
     arquivo = request.files['arquivo']
-    upload_path = app.config['UPLOAD_PATH']
-    arquivo.save(f'{upload_path}/capa{jogo.id}.jpg')
+    armazem_de_capas.receber(jogo.id, arquivo)
     return redirect(url_for('index'))
 
 
@@ -38,10 +100,7 @@ def editar(id):
     if 'usuario_logado' not in session or session['usuario_logado'] == None:
         return redirect(url_for('login', proxima=url_for('editar')))
     jogo = jogo_dao.busca_por_id(id)
-    capa_jogo = f'capa{id}.jpg'
-    caminho_imagem = os.path.join(app.config['UPLOAD_PATH'], capa_jogo)
-    if not os.path.exists(caminho_imagem):  
-        capa_jogo = 'capa_padrao.jpg'  
+    capa_jogo = armazem_de_capas.capa(id, 'detalhe') or 'capa_padrao.jpg'
     return render_template('editar.html', titulo='Editar Jogo', jogo=jogo, capa_jogo=capa_jogo)
 
 
@@ -52,19 +111,50 @@ def atualizar():
     console = request.form['console']
     jogo = Jogo(nome, categoria, console, id=request.form['id'])
     jogo_dao.salvar(jogo)
+    arquivo = request.files.get('arquivo')
+    if arquivo and arquivo.filename:
+        armazem_de_capas.receber(jogo.id, arquivo)
     return redirect(url_for('index'))
 
 
 @app.route('/deletar/<int:id>')
 def deletar(id):
     jogo_dao.deletar(id)
-    imagem_jogo = os.path.join(app.config['UPLOAD_PATH'], f'capa{id}.jpg')
-    if os.path.exists(imagem_jogo):
-        os.remove(imagem_jogo)
+    armazem_de_capas.remover(id)
     flash('O jogo foi removido com sucesso!')
     return redirect(url_for('index'))
 
 
+@app.route('/importar', methods=['GET', 'POST'])
+def importar_jogos():
+    if 'usuario_logado' not in session or session['usuario_logado'] == None:
+        return redirect(url_for('login', proxima=url_for('importar_jogos')))
+    if request.method == 'GET':
+        return render_template('importar.html', titulo='Importar Jogos')
+    arquivo = request.files.get('arquivo')
+    if not arquivo or not arquivo.filename:
+        flash('Selecione um arquivo CSV ou NDJSON.')
+        return redirect(url_for('importar_jogos'))
+    formato = formato_do_arquivo(arquivo.filename)
+    relatorio = importar(jogo_dao, arquivo.stream, formato, app.config['IMPORTACAO_LOTE'])
+    return render_template('importar.html', titulo='Importar Jogos', relatorio=relatorio)
+
+
+@app.route('/exportar')
+def exportar_jogos():
+    if 'usuario_logado' not in session or session['usuario_logado'] == None:
+        return redirect(url_for('login', proxima=url_for('exportar_jogos')))
+    formato = request.args.get('formato', 'csv')
+    if formato not in FORMATOS:
+        formato = 'csv'
+    # O arquivo é gerado enquanto é enviado, sem ficar inteiro em memória. Sem
+    # stream_with_context: fora da requisição, as páginas lidas não se
+    # acumulam no mapa de identidade dela
+    return Response(exportar(jogo_dao, formato, app.config['IMPORTACAO_LOTE']),
+                    mimetype=FORMATOS[formato],
+                    headers={'Content-Disposition': f'attachment; filename=jogos.{formato}'})
+
+
 @app.route('/login')
 def login():
     proxima = request.args.get('proxima')
@@ -94,4 +184,10 @@ def logout():
 
 @app.route('/uploads/<nome_arquivo>')
 def imagem(nome_arquivo):
-    return send_from_directory('uploads', nome_arquivo)
+    if not eh_imutavel(nome_arquivo):
+        return send_from_directory('uploads', nome_arquivo)
+    # O nome inclui o hash do conteúdo: o arquivo nunca muda
+    resposta = send_from_directory('uploads', nome_arquivo, max_age=app.config['CAPAS_MAX_AGE'])
+    resposta.cache_control.public = True
+    resposta.cache_control.immutable = True
+    return resposta